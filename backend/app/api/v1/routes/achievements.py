@@ -1,10 +1,17 @@
 from fastapi import APIRouter, Depends, HTTPException
+from sqlalchemy import select
 from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 from typing import List
 from app import models, schemas
 from app.schemas import certificates, awards, work_experience
-from app.dependencies.auth_user import get_db, get_current_user
+from app.dependencies.auth_user import get_db, CurrentPrincipal, get_current_principal
+from app.database import get_async_db
 from app.utils.security import validate_csrf
+from app.crud.portfolio import commit_portfolio_change
+from app.crud.batch import apply_batch
+from app.crud.writes import insert_returning, update_returning
+from app.schemas.batch import BatchRequest, BatchResult
 
 router = APIRouter(prefix="/achievements", tags=["Achievements"])
 
@@ -13,45 +20,42 @@ router = APIRouter(prefix="/achievements", tags=["Achievements"])
 def create_work_experience(
     data: work_experience.WorkExperienceCreate,
     db: Session = Depends(get_db),
-    current_user: models.User = Depends(get_current_user)
+    current_user: CurrentPrincipal = Depends(get_current_principal)
 ):
-    new_exp = models.WorkExperience(user_id=current_user.id, **data.dict())
-    db.add(new_exp)
-    db.commit()
-    db.refresh(new_exp)
+    new_exp = insert_returning(db, models.WorkExperience, {**data.dict(), "user_id": current_user.id})
+    commit_portfolio_change(db, current_user)
     return new_exp
 
 @router.get("/work-experience", response_model=List[work_experience.WorkExperienceOut])
-def get_work_experiences(
-    db: Session = Depends(get_db),
-    current_user: models.User = Depends(get_current_user)
+async def get_work_experiences(
+    db: AsyncSession = Depends(get_async_db),
+    current_user: CurrentPrincipal = Depends(get_current_principal)
 ):
-    return db.query(models.WorkExperience).filter(models.WorkExperience.user_id == current_user.id).all()
+    result = await db.execute(select(models.WorkExperience).where(models.WorkExperience.user_id == current_user.id))
+    return result.scalars().all()
 
 @router.put("/work-experience/{id}", response_model=work_experience.WorkExperienceOut, dependencies=[Depends(validate_csrf)])
 def update_work_experience(
     id: int,
     data: work_experience.WorkExperienceUpdate,
     db: Session = Depends(get_db),
-    current_user: models.User = Depends(get_current_user)
+    current_user: CurrentPrincipal = Depends(get_current_principal)
 ):
-    exp = db.query(models.WorkExperience).filter(
-        models.WorkExperience.id == id,
-        models.WorkExperience.user_id == current_user.id
-    ).first()
+    exp = update_returning(
+        db, models.WorkExperience,
+        (models.WorkExperience.id == id, models.WorkExperience.user_id == current_user.id),
+        data.dict(exclude_unset=True),
+    )
     if not exp:
         raise HTTPException(status_code=404, detail="Work experience not found")
-    for key, value in data.dict(exclude_unset=True).items():
-        setattr(exp, key, value)
-    db.commit()
-    db.refresh(exp)
+    commit_portfolio_change(db, current_user)
     return exp
 
 @router.delete("/work-experience/{id}", dependencies=[Depends(validate_csrf)])
 def delete_work_experience(
     id: int,
     db: Session = Depends(get_db),
-    current_user: models.User = Depends(get_current_user)
+    current_user: CurrentPrincipal = Depends(get_current_principal)
 ):
     exp = db.query(models.WorkExperience).filter(
         models.WorkExperience.id == id,
@@ -60,54 +64,63 @@ def delete_work_experience(
     if not exp:
         raise HTTPException(status_code=404, detail="Work experience not found")
     db.delete(exp)
-    db.commit()
+    commit_portfolio_change(db, current_user)
     return {"message": "Deleted successfully"}
 
 
+@router.post("/work-experience/batch", response_model=BatchResult[work_experience.WorkExperienceOut], dependencies=[Depends(validate_csrf)])
+def batch_work_experience(
+    batch: BatchRequest,
+    db: Session = Depends(get_db),
+    current_user: CurrentPrincipal = Depends(get_current_principal)
+):
+    return apply_batch(
+        db, current_user, models.WorkExperience, models.WorkExperience.user_id,
+        work_experience.WorkExperienceCreate, work_experience.WorkExperienceUpdate, work_experience.WorkExperienceOut,
+        batch,
+    )
+
 # ---------- CERTIFICATES ----------
 @router.post("/certificates", response_model=certificates.CertificateOut, dependencies=[Depends(validate_csrf)])
 def create_certificate(
     data: certificates.CertificateCreate,
     db: Session = Depends(get_db),
-    current_user: models.User = Depends(get_current_user)
+    current_user: CurrentPrincipal = Depends(get_current_principal)
 ):
-    new_cert = models.Certificate(user_id=current_user.id, **data.dict())
-    db.add(new_cert)
-    db.commit()
-    db.refresh(new_cert)
+    new_cert = insert_returning(db, models.Certificate, {**data.dict(), "user_id": current_user.id})
+    commit_portfolio_change(db, current_user)
     return new_cert
 
 @router.get("/certificates", response_model=List[certificates.CertificateOut])
-def get_certificates(
-    db: Session = Depends(get_db),
-    current_user: models.User = Depends(get_current_user)
+async def get_certificates(
+    db: AsyncSession = Depends(get_async_db),
+    current_user: CurrentPrincipal = Depends(get_current_principal)
 ):
-    return db.query(models.Certificate).filter(models.Certificate.user_id == current_user.id).all()
+    result = await db.execute(select(models.Certificate).where(models.Certificate.user_id == current_user.id))
+    return result.scalars().all()
 
 @router.put("/certificates/{id}", response_model=certificates.CertificateOut, dependencies=[Depends(validate_csrf)])
 def update_certificate(
     id: int,
     data: certificates.CertificateUpdate,
     db: Session = Depends(get_db),
-    current_user: models.User = Depends(get_current_user)
+    current_user: CurrentPrincipal = Depends(get_current_principal)
 ):
-    cert = db.query(models.Certificate).filter(
-        models.Certificate.id == id,
-        models.Certificate.user_id == current_user.id
-    ).first()
+    cert = update_returning(
+        db, models.Certificate,
+        (models.Certificate.id == id, models.Certificate.user_id == current_user.id),
+        data.dict(exclude_unset=True),
+    )
     if not cert:
         raise HTTPException(status_code=404, detail="Certificate not found")
-    for key, value in data.dict(exclude_unset=True).items():
-        setattr(cert, key, value)
-    db.commit()
-    db.refresh(cert)
+    commit_portfolio_change(db, current_user)
     return cert
 
 @router.delete("/certificates/{id}", dependencies=[Depends(validate_csrf)])
 def delete_certificate(
     id: int,
     db: Session = Depends(get_db),
-    current_user: models.User = Depends(get_current_user)
+    current_user: CurrentPrincipal = Depends(get_current_principal)
 ):
     cert = db.query(models.Certificate).filter(
         models.Certificate.id == id,
@@ -116,54 +129,63 @@ def delete_certificate(
     if not cert:
         raise HTTPException(status_code=404, detail="Certificate not found")
     db.delete(cert)
-    db.commit()
+    commit_portfolio_change(db, current_user)
     return {"message": "Deleted successfully"}
 
 
+@router.post("/certificates/batch", response_model=BatchResult[certificates.CertificateOut], dependencies=[Depends(validate_csrf)])
+def batch_certificates(
+    batch: BatchRequest,
+    db: Session = Depends(get_db),
+    current_user: CurrentPrincipal = Depends(get_current_principal)
+):
+    return apply_batch(
+        db, current_user, models.Certificate, models.Certificate.user_id,
+        certificates.CertificateCreate, certificates.CertificateUpdate, certificates.CertificateOut,
+        batch,
+    )
+
 # ---------- AWARDS ----------
 @router.post("/awards", response_model=awards.AwardOut, dependencies=[Depends(validate_csrf)])
 def create_award(
     data: awards.AwardCreate,
     db: Session = Depends(get_db),
-    current_user: models.User = Depends(get_current_user)
+    current_user: CurrentPrincipal = Depends(get_current_principal)
 ):
-    new_award = models.Award(user_id=current_user.id, **data.dict())
-    db.add(new_award)
-    db.commit()
-    db.refresh(new_award)
+    new_award = insert_returning(db, models.Award, {**data.dict(), "user_id": current_user.id})
+    commit_portfolio_change(db, current_user)
     return new_award
 
 @router.get("/awards", response_model=List[awards.AwardOut])
-def get_awards(
-    db: Session = Depends(get_db),
-    current_user: models.User = Depends(get_current_user)
+async def get_awards(
+    db: AsyncSession = Depends(get_async_db),
+    current_user: CurrentPrincipal = Depends(get_current_principal)
 ):
-    return db.query(models.Award).filter(models.Award.user_id == current_user.id).all()
+    result = await db.execute(select(models.Award).where(models.Award.user_id == current_user.id))
+    return result.scalars().all()
 
 @router.put("/awards/{id}", response_model=awards.AwardOut, dependencies=[Depends(validate_csrf)])
 def update_award(
     id: int,
     data: awards.AwardUpdate,
     db: Session = Depends(get_db),
-    current_user: models.User = Depends(get_current_user)
+    current_user: CurrentPrincipal = Depends(get_current_principal)
 ):
-    award = db.query(models.Award).filter(
-        models.Award.id == id,
-        models.Award.user_id == current_user.id
-    ).first()
+    award = update_returning(
+        db, models.Award,
+        (models.Award.id == id, models.Award.user_id == current_user.id),
+        data.dict(exclude_unset=True),
+    )
     if not award:
         raise HTTPException(status_code=404, detail="Award not found")
-    for key, value in data.dict(exclude_unset=True).items():
-        setattr(award, key, value)
-    db.commit()
-    db.refresh(award)
+    commit_portfolio_change(db, current_user)
     return award
 
 @router.delete("/awards/{id}", dependencies=[Depends(validate_csrf)])
 def delete_award(
     id: int,
     db: Session = Depends(get_db),
-    current_user: models.User = Depends(get_current_user)
+    current_user: CurrentPrincipal = Depends(get_current_principal)
 ):
     award = db.query(models.Award).filter(
         models.Award.id == id,
@@ -172,5 +194,17 @@ def delete_award(
     if not award:
         raise HTTPException(status_code=404, detail="Award not found")
     db.delete(award)
-    db.commit()
+    commit_portfolio_change(db, current_user)
     return {"message": "Deleted successfully"}
+
+@router.post("/awards/batch", response_model=BatchResult[awards.AwardOut], dependencies=[Depends(validate_csrf)])
+def batch_awards(
+    batch: BatchRequest,
+    db: Session = Depends(get_db),
+    current_user: CurrentPrincipal = Depends(get_current_principal)
+):
+    return apply_batch(
+        db, current_user, models.Award, models.Award.user_id,
+        awards.AwardCreate, awards.AwardUpdate, awards.AwardOut,
+        batch,
+    )
@@ -3,16 +3,21 @@ from fastapi.responses import JSONResponse, RedirectResponse
 import httpx
 import os
 from sqlalchemy.orm import Session
-from sqlalchemy import func
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import func, select
 from app.schemas.user import UserCreate, UserLogin, UserResponse
-from app.models.user import User
-from app.utils.auth import hash_password, verify_password, create_access_token
-from app.database import get_db
+from app.models.user import User, username_key
+from app.utils.auth import create_access_token, access_token_claims
+from app.utils.password_hasher import hash_password_async, verify_password_async
+from app.database import get_db, get_async_db
 from app.models.profile import Profile
 from app.schemas.auth import SignupResponse
 from app.utils.limiter import limiter
 from fastapi_csrf_protect import CsrfProtect
 from app.utils.security import sanitize_html
+from app.crud.portfolio import commit_portfolio_change
+from app.utils.user_cache import invalidate_user
+from app.utils.http_clients import http_client
 
 import secrets
 import random
@@ -49,6 +54,7 @@ async def password_reset_request(request: Request, reset_data: PasswordResetRequ
     user.reset_token = token
     user.reset_token_expires = datetime.utcnow() + timedelta(hours=1)
     db.commit()
+    invalidate_user(user.id)
     
     await send_reset_email(user.email, token)
     
@@ -71,59 +77,59 @@ def validate_reset_token(token: str, db: Session = Depends(get_db)):
 
 @router.post("/password-reset-confirm")
 @limiter.limit("3/hour")
-def password_reset_confirm(request: Request, confirm_data: PasswordResetConfirm, db: Session = Depends(get_db)):
+async def password_reset_confirm(request: Request, confirm_data: PasswordResetConfirm, db: AsyncSession = Depends(get_async_db)):
     """
     Reset the user's password using a valid token.
     """
-    user = db.query(User).filter(
+    result = await db.execute(select(User).where(
         User.reset_token == confirm_data.token,
         User.reset_token_expires > datetime.utcnow()
-    ).first()
+    ))
+    user = result.scalars().first()
     
     if not user:
         raise HTTPException(status_code=400, detail="Invalid or expired reset token")
     
     # Update password and clear token
-    user.hashed_password = hash_password(confirm_data.new_password)
+    user.hashed_password = await hash_password_async(confirm_data.new_password)
     user.reset_token = None
     user.reset_token_expires = None
-    db.commit()
+    await db.commit()
+    invalidate_user(user.id)
     
     return {"message": "Password reset successful. You can now log in with your new password."}
 
 @router.post("/signup", response_model=SignupResponse)
 @limiter.limit("3/hour")
-async def signup(request: Request, response: Response, user: UserCreate, db: Session = Depends(get_db)):
+async def signup(request: Request, response: Response, user: UserCreate, db: AsyncSession = Depends(get_async_db)):
     # Check if user already exists
-    existing_user = db.query(User).filter(User.email == user.email).first()
+    existing_user = (await db.execute(select(User.id).where(User.email == user.email))).first()
     if existing_user:
         raise HTTPException(status_code=400, detail="Email is already registered.")
 
     # Check if username already exists
-    if db.query(User).filter(User.username == user.username.lower()).first():
+    if (await db.execute(select(User.id).where(username_key(user.username)))).first():
         raise HTTPException(status_code=409, detail="Username is already taken.")
 
     # Store lowercase username
     username_lower = user.username.lower()
 
-    # Create User (DB MODEL)
-    hashed_pw = hash_password(user.password)
+    # Generate OTP
+    otp = str(random.randint(100000, 999999))
+
+    # Create User (DB MODEL); bcrypt runs off the event loop
+    hashed_pw = await hash_password_async(user.password)
     new_user = User(
         email=user.email,
         username=username_lower,
         full_name=user.full_name,
         hashed_password=hashed_pw,
+        otp_code=otp,
+        otp_expires=datetime.utcnow() + timedelta(minutes=10),
     )
 
     db.add(new_user)
-    db.commit()
-    db.refresh(new_user)
-
-    # Generate OTP
-    otp = str(random.randint(100000, 999999))
-    new_user.otp_code = otp
-    new_user.otp_expires = datetime.utcnow() + timedelta(minutes=10)
-    db.commit()
+    await db.commit()
 
     # Send OTP Email
     await send_otp_email(new_user.email, otp)
@@ -137,14 +143,21 @@ async def signup(request: Request, response: Response, user: UserCreate, db: Ses
 
 @router.post("/login")
 @limiter.limit("5/15minutes")
-def login(request: Request, response: Response, user: UserLogin, db: Session = Depends(get_db), csrf_protect: CsrfProtect = Depends()):
-    db_user = db.query(User).filter(User.email == user.email).first()
+async def login(request: Request, response: Response, user: UserLogin, db: AsyncSession = Depends(get_async_db), csrf_protect: CsrfProtect = Depends()):
+    db_user = (await db.execute(select(User).where(User.email == user.email))).scalars().first()
     if not db_user:
         raise HTTPException(status_code=400, detail="Invalid email or password")
 
-    if not verify_password(user.password, db_user.hashed_password):
+    valid, new_hash = await verify_password_async(user.password, db_user.hashed_password)
+    if not valid:
         raise HTTPException(status_code=400, detail="Invalid email or password.")
 
+    # Stored hash used a different bcrypt cost; replace it transparently
+    if new_hash:
+        db_user.hashed_password = new_hash
+        await db.commit()
+        invalidate_user(db_user.id)
+
     if not db_user.is_verified:
         return JSONResponse(
             status_code=403,
@@ -155,10 +168,7 @@ def login(request: Request, response: Response, user: UserLogin, db: Session = D
             }
         )
 
-    token = create_access_token(data={
-        "sub": db_user.email,
-        "username": db_user.username
-    })
+    token = create_access_token(data=access_token_claims(db_user))
 
     csrf_token, signed_token = csrf_protect.generate_csrf_tokens()
     csrf_protect.set_csrf_cookie(signed_token, response)
@@ -169,8 +179,7 @@ def login(request: Request, response: Response, user: UserLogin, db: Session = D
 
 @router.get("/check-username/{username}")
 def check_username(username: str, db: Session = Depends(get_db)):
-    username_lower = username.lower()
-    exists = db.query(User).filter(User.username == username_lower).first()
+    exists = db.query(User.id).filter(username_key(username)).first()
     return {"available": not exists, "username": username}
 
 @router.post("/verify-otp")
@@ -207,13 +216,10 @@ async def verify_otp(request: Request, response: Response, data: VerifyOTPReques
         avatar="",
     )
     db.add(profile)
-    db.commit()
+    commit_portfolio_change(db, user)
 
     # Issue token
-    token = create_access_token(data={
-        "sub": user.email,
-        "username": user.username
-    })
+    token = create_access_token(data=access_token_claims(user))
 
     csrf_token, signed_token = csrf_protect.generate_csrf_tokens()
     csrf_protect.set_csrf_cookie(signed_token, response)
@@ -244,6 +250,7 @@ async def resend_otp(request: Request, email_data: dict, db: Session = Depends(g
     user.otp_code = otp
     user.otp_expires = datetime.utcnow() + timedelta(minutes=10)
     db.commit()
+    invalidate_user(user.id)
 
     await send_otp_email(user.email, otp)
     return {"message": "A new verification code has been sent to your email."}
@@ -264,7 +271,11 @@ async def google_login():
     return RedirectResponse(url)
 
 @router.get("/google/callback")
-async def google_callback(code: str, db: Session = Depends(get_db)):
+async def google_callback(
+    code: str,
+    db: Session = Depends(get_db),
+    client: httpx.AsyncClient = Depends(http_client("google")),
+):
     """Handles Google OAuth Callback"""
     client_id = os.getenv("GOOGLE_CLIENT_ID")
     client_secret = os.getenv("GOOGLE_CLIENT_SECRET")
@@ -275,17 +286,16 @@ async def google_callback(code: str, db: Session = Depends(get_db)):
         redirect_uri = redirect_uri.replace("http://", "https://")
 
     # 1. Exchange code for access token
-    async with httpx.AsyncClient() as client:
-        token_res = await client.post(
-            "https://oauth2.googleapis.com/token",
-            data={
-                "client_id": client_id,
-                "client_secret": client_secret,
-                "code": code,
-                "grant_type": "authorization_code",
-                "redirect_uri": redirect_uri,
-            },
-        )
+    token_res = await client.post(
+        "https://oauth2.googleapis.com/token",
+        data={
+            "client_id": client_id,
+            "client_secret": client_secret,
+            "code": code,
+            "grant_type": "authorization_code",
+            "redirect_uri": redirect_uri,
+        },
+    )
     
     if token_res.status_code != 200:
         raise HTTPException(status_code=400, detail="Invalid Google Code")
@@ -293,11 +303,10 @@ async def google_callback(code: str, db: Session = Depends(get_db)):
     access_token = token_res.json().get("access_token")
 
     # 2. Get User Info
-    async with httpx.AsyncClient() as client:
-        user_res = await client.get(
-            "https://www.googleapis.com/oauth2/v1/userinfo",
-            headers={"Authorization": f"Bearer {access_token}"},
-        )
+    user_res = await client.get(
+        "https://www.googleapis.com/oauth2/v1/userinfo",
+        headers={"Authorization": f"Bearer {access_token}"},
+    )
     
     google_user = user_res.json()
     email = google_user.get("email")
@@ -316,7 +325,7 @@ async def google_callback(code: str, db: Session = Depends(get_db)):
             base_username = f"user{random.randint(1000, 9999)}"
             
         username = base_username.lower()
-        if db.query(User).filter(User.username == username).first():
+        if db.query(User.id).filter(username_key(username)).first():
             username = f"{base_username}{random.randint(1000, 9999)}"
 
         # Create new user
@@ -349,9 +358,10 @@ async def google_callback(code: str, db: Session = Depends(get_db)):
         if not user.is_verified:
             user.is_verified = True # Trust Google verification
         db.commit()
+        invalidate_user(user.id)
 
     # 4. Generate JWT
-    token = create_access_token(data={"sub": user.email, "username": user.username})
+    token = create_access_token(data=access_token_claims(user))
 
     # 5. Redirect to Frontend Dashboard with Token
     # Using 127.0.0.1:8080 for consistency
@@ -0,0 +1,83 @@
+"""
+Avatar upload and serving endpoints.
+"""
+from fastapi import APIRouter, Depends, File, HTTPException, Request, UploadFile, status
+from fastapi.responses import Response, StreamingResponse
+from sqlalchemy.orm import Session
+
+from app.dependencies.auth_user import get_db, get_current_user
+from app.models.user import User
+from app.models.profile import Profile
+from app.crud.portfolio import commit_portfolio_change
+from app.utils.security import validate_csrf
+from app.utils.avatar_store import (
+    AVATAR_SIZES,
+    DIGEST_RE,
+    MAX_AVATAR_BYTES,
+    InvalidAvatarError,
+    avatar_key,
+    avatar_url,
+    save_avatar,
+    store,
+)
+
+router = APIRouter(prefix="/avatars", tags=["Avatars"])
+
+# Stored avatars are content-addressed, so a given URL never changes
+IMMUTABLE_CACHE_CONTROL = "public, max-age=31536000, immutable"
+
+
+@router.post("/", dependencies=[Depends(validate_csrf)])
+def upload_avatar(
+    request: Request,
+    file: UploadFile = File(...),
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user),
+):
+    """
+    Upload a new avatar image and set it on the current user's profile.
+    Returns only the avatar URL.
+    A plain def route, so FastAPI runs it in the threadpool: the image
+    decoding/resizing and the database round trips stay off the event loop.
+    """
+    data = file.file.read(MAX_AVATAR_BYTES + 1)
+    try:
+        digest = save_avatar(data)
+    except InvalidAvatarError as e:
+        raise HTTPException(status_code=status.HTTP_422_UNPROCESSABLE_ENTITY, detail=str(e))
+
+    url = avatar_url(digest, base_url=str(request.base_url))
+
+    profile = db.query(Profile).filter(Profile.user_id == current_user.id).first()
+    if profile:
+        profile.avatar = url
+    else:
+        db.add(Profile(
+            user_id=current_user.id,
+            name=current_user.full_name or current_user.username,
+            email=current_user.email,
+            avatar=url,
+        ))
+    commit_portfolio_change(db, current_user)
+
+    return {"avatar": url}
+
+
+@router.get("/{digest}/{size}.webp")
+def get_avatar(digest: str, size: int, request: Request):
+    """
+    Stream a stored avatar variant. Public and cacheable forever.
+    """
+    if not DIGEST_RE.match(digest) or size not in AVATAR_SIZES:
+        raise HTTPException(status_code=404, detail="Avatar not found")
+
+    etag = f'"{digest}-{size}"'
+    headers = {"ETag": etag, "Cache-Control": IMMUTABLE_CACHE_CONTROL}
+    if request.headers.get("if-none-match") == etag:
+        return Response(status_code=304, headers=headers)
+
+    key = avatar_key(digest, size)
+    if not store.exists(key):
+        raise HTTPException(status_code=404, detail="Avatar not found")
+
+    return StreamingResponse(store.iter_bytes(key), media_type="image/webp", headers=headers)
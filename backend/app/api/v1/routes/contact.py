@@ -1,10 +1,14 @@
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Query, Response, status
+from sqlalchemy import insert, update
 from sqlalchemy.orm import Session
 from pydantic import BaseModel, EmailStr
-from typing import List
-from app.dependencies.auth_user import get_db, get_current_user
-from app.models.user import User
+from datetime import datetime
+from typing import List, Optional
+from app.dependencies.auth_user import get_db, CurrentPrincipal, get_current_principal
+from app.models.user import User, username_key
 from app.models.contact_message import ContactMessage
+from app.crud.contact import decode_cursor, encode_cursor, inbox_statement, unread_count_statement
+from app.utils.security import validate_csrf
 
 router = APIRouter(prefix="/api/contact", tags=["Contact"])
 
@@ -18,11 +22,15 @@ class ContactMessageResponse(BaseModel):
     name: str
     email: str
     message: str
-    created_at: str
+    created_at: datetime
+    is_read: bool
     
     class Config:
         from_attributes = True
 
+class ContactMessageReadUpdate(BaseModel):
+    is_read: bool
+
 @router.post("/{username}", status_code=status.HTTP_201_CREATED)
 def send_contact_message(
     username: str,
@@ -33,34 +41,84 @@ def send_contact_message(
     Send a message to a portfolio owner by username.
     Public endpoint.
     """
-    # Find user by username
-    user = db.query(User).filter(User.username == username).first()
+    # Find user by username (case-insensitive, uses the lower(username) index)
+    user = db.query(User).filter(username_key(username)).first()
     if not user:
         raise HTTPException(status_code=404, detail="User not found")
 
-    new_message = ContactMessage(
-        user_id=user.id,
-        name=message_data.name,
-        email=message_data.email,
-        message=message_data.message
+    # The response does not echo the message, so nothing is read back
+    db.execute(
+        insert(ContactMessage).values(
+            user_id=user.id,
+            name=message_data.name,
+            email=message_data.email,
+            message=message_data.message
+        )
     )
-    
-    db.add(new_message)
     db.commit()
-    db.refresh(new_message)
     
     return {"message": "Message sent successfully"}
 
 @router.get("/messages", response_model=List[ContactMessageResponse])
 def get_my_messages(
-    current_user: User = Depends(get_current_user),
+    response: Response,
+    limit: int = Query(50, ge=1, le=200),
+    cursor: Optional[str] = Query(None, description="X-Next-Cursor of the previous page"),
+    since: Optional[datetime] = Query(None, description="Only messages sent at or after this time"),
+    until: Optional[datetime] = Query(None, description="Only messages sent before this time"),
+    unread: bool = Query(False, description="Only unread messages"),
+    current_user: CurrentPrincipal = Depends(get_current_principal),
     db: Session = Depends(get_db)
 ):
     """
-    Get all messages sent to the current user.
+    Get messages sent to the current user, newest first, one page at a time.
+
+    Without a cursor this is the newest `limit` messages. When there are
+    more, the X-Next-Cursor response header holds the cursor for the next
+    page; it is absent on the last page. Keep the same filters across pages.
     """
-    messages = db.query(ContactMessage).filter(
-        ContactMessage.user_id == current_user.id
-    ).order_by(ContactMessage.created_at.desc()).all()
-    
+    try:
+        after = decode_cursor(cursor) if cursor else None
+    except ValueError:
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+
+    messages = db.execute(
+        inbox_statement(current_user.id, limit, after=after, since=since, until=until, unread_only=unread)
+    ).scalars().all()
+
+    if len(messages) > limit:
+        messages = messages[:limit]
+        last = messages[-1]
+        response.headers["X-Next-Cursor"] = encode_cursor(last.created_at, last.id)
     return messages
+
+@router.get("/messages/unread-count")
+def get_unread_count(
+    current_user: CurrentPrincipal = Depends(get_current_principal),
+    db: Session = Depends(get_db)
+):
+    """
+    Number of unread messages sent to the current user.
+    """
+    return {"unread": db.execute(unread_count_statement(current_user.id)).scalar_one()}
+
+@router.patch("/messages/{message_id}", dependencies=[Depends(validate_csrf)])
+def update_message_read_state(
+    message_id: int,
+    data: ContactMessageReadUpdate,
+    current_user: CurrentPrincipal = Depends(get_current_principal),
+    db: Session = Depends(get_db)
+):
+    """
+    Mark one of the current user's messages as read or unread.
+    """
+    updated = db.execute(
+        update(ContactMessage)
+        .where(ContactMessage.id == message_id, ContactMessage.user_id == current_user.id)
+        .values(is_read=data.is_read)
+        .returning(ContactMessage.id)
+    ).first()
+    if not updated:
+        raise HTTPException(status_code=404, detail="Message not found")
+    db.commit()
+    return {"id": message_id, "is_read": data.is_read}
@@ -1,11 +1,69 @@
-from fastapi import APIRouter
+import time
+from typing import Optional
+from fastapi import APIRouter, BackgroundTasks, Depends, Header
 from datetime import datetime
+from sqlalchemy import text
+from app.database import engine, async_engine
+from app.utils.pool_stats import pool_status
+from app.utils import resume_cache
+from app.utils.github_client import get_github_client
+from app.utils import github_refresh
+from app.utils.security import has_cron_secret, require_cron_secret
 
 router = APIRouter(prefix="/cron", tags=["Cron"])
 
 @router.get("/ping")
-async def cron_ping():
+async def cron_ping(background_tasks: BackgroundTasks, x_cron_secret: Optional[str] = Header(None)):
+    """
+    Keep-alive hook, open to anyone. Only the scheduler, sending the
+    X-Cron-Secret header, also starts the GitHub stars/forks refresh and
+    the GitHub disk cache pruning when they are due.
+    """
+    is_scheduler = has_cron_secret(x_cron_secret)
+    refresh_started = is_scheduler and github_refresh.refresh_due()
+    if refresh_started:
+        background_tasks.add_task(github_refresh.run_scheduled_refresh)
+    github = get_github_client()
+    if is_scheduler and github.prune_due():
+        background_tasks.add_task(github.prune_disk_cache)  # Blocking, so it runs in the threadpool
     return {
         "status": "ok",
-        "ran_at": datetime.utcnow().isoformat()
+        "ran_at": datetime.utcnow().isoformat(),
+        "github_refresh": "started" if refresh_started else "skipped",
+    }
+
+@router.get("/db", dependencies=[Depends(require_cron_secret)])
+async def cron_db():
+    """
+    Database diagnostics: round-trip time of a trivial query plus
+    connection pool stats (utilization, checkout wait times, timeouts).
+    Requires the X-Cron-Secret header.
+    """
+    start = time.perf_counter()
+    try:
+        async with async_engine.connect() as conn:
+            await conn.execute(text("SELECT 1"))
+        db_status = "ok"
+    except Exception as e:
+        db_status = f"error: {type(e).__name__}"
+    latency_ms = round((time.perf_counter() - start) * 1000, 3)
+
+    return {
+        "status": db_status,
+        "ran_at": datetime.utcnow().isoformat(),
+        "latency_ms": latency_ms,
+        "pools": {
+            "sync": pool_status(engine),
+            "async": pool_status(async_engine.sync_engine),
+        },
+    }
+
+@router.get("/caches", dependencies=[Depends(require_cron_secret)])
+async def cron_caches():
+    """Hit/miss counters and sizes of in-process caches. Requires the X-Cron-Secret header."""
+    return {
+        "ran_at": datetime.utcnow().isoformat(),
+        "resume_parse": resume_cache.stats(),
+        "github": get_github_client().stats(),
+        "github_refresh": github_refresh.last_run(),
     }
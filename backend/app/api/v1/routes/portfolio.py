@@ -1,14 +1,22 @@
-from fastapi import APIRouter, Depends, HTTPException, Request
+from fastapi import APIRouter, Depends, HTTPException, Request, Response
 from sqlalchemy.orm import Session
-from sqlalchemy import func
-from app.dependencies.auth_user import get_db, get_current_user
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.dependencies.auth_user import get_db, get_current_user, CurrentPrincipal, get_current_principal
+from app.database import get_async_db
 from app.models.user import User
-from app.models.profile import Profile
 from app.models.project import Project
 from app.models.skills import Skill
 from app.models.certificates import Certificate
 from app.models.work_experience import WorkExperience
 from app.models.awards import Award
+from app.crud.portfolio import (
+    load_portfolio_by_username,
+    build_portfolio_sections,
+    commit_portfolio_change,
+    get_portfolio_version,
+    portfolio_etag,
+)
+from app.utils.portfolio_cache import get_snapshot, store_snapshot
 from typing import Optional
 from app.utils.limiter import limiter
 
@@ -24,10 +32,26 @@ RESERVED_USERNAMES = {
     "terms", "privacy", "support", "blog", "docs", "faq"
 }
 
+# Lets browsers and CDNs reuse public responses and revalidate in the background
+PUBLIC_CACHE_CONTROL = "public, max-age=60, stale-while-revalidate=600"
+
+
+def _etag_matches(request: Request, etag: str) -> bool:
+    """Check an If-None-Match request header against the current ETag."""
+    if_none_match = request.headers.get("if-none-match")
+    if not if_none_match:
+        return False
+    candidates = [tag.strip() for tag in if_none_match.split(",")]
+    return "*" in candidates or etag in candidates
+
+
+def _not_modified(etag: str) -> Response:
+    return Response(status_code=304, headers={"ETag": etag, "Cache-Control": PUBLIC_CACHE_CONTROL})
+
 
 
 @router.put("/settings")
-async def update_portfolio_settings(
+def update_portfolio_settings(
     settings: dict,
     current_user: User = Depends(get_current_user),
     db: Session = Depends(get_db)
@@ -52,19 +76,23 @@ async def update_portfolio_settings(
     if "analytics_enabled" in settings:
         current_user.analytics_enabled = settings["analytics_enabled"]
         
-    db.commit()
+    commit_portfolio_change(db, current_user)
     return {"message": "Settings updated successfully"}
 
 
 @router.get("/{username}")
 @limiter.limit("100/minute")
-def get_portfolio_by_username(request: Request, username: str, db: Session = Depends(get_db)):
+async def get_portfolio_by_username(request: Request, username: str, db: AsyncSession = Depends(get_async_db)):
     """
     Get complete portfolio data by username.
     Public endpoint - no authentication required.
     
+    Supports conditional requests: responses carry a strong ETag derived
+    from the user's content_version, and a matching If-None-Match gets a 304.
+    
     Returns:
         - 200: Portfolio data (if public)
+        - 304: Not modified (If-None-Match matches)
         - 400: Invalid username (reserved)
         - 403: Portfolio is private
         - 404: User not found
@@ -76,110 +104,77 @@ def get_portfolio_by_username(request: Request, username: str, db: Session = Dep
     if username.lower() in RESERVED_USERNAMES:
         raise HTTPException(status_code=400, detail="Invalid username")
     
-    # Case-insensitive username lookup
+    # The current ETag always comes from the database (one indexed lookup):
+    # a cached snapshot may predate an edit handled by another worker
+    version = await get_portfolio_version(db, username)
+    if not version:
+        raise HTTPException(status_code=404, detail="Portfolio not found")
+    if not version.is_public:
+        raise HTTPException(status_code=403, detail="Portfolio is private")
+    
+    etag = portfolio_etag(version.id, version.content_version)
+    if _etag_matches(request, etag):
+        return _not_modified(etag)
+    
+    # Serve the pre-serialized snapshot only if it is of the current version
+    snapshot = get_snapshot(username, version.content_version)
+    if snapshot:
+        return Response(
+            content=snapshot.body,
+            media_type="application/json",
+            headers={"ETag": snapshot.etag, "Cache-Control": PUBLIC_CACHE_CONTROL},
+        )
+    
+    # Case-insensitive username lookup, loading the whole portfolio in one round trip
     # This ensures /portfolio/JohnDoe and /portfolio/johndoe both work
-    user = db.query(User).filter(
-        func.lower(User.username) == username.lower()
-    ).first()
+    portfolio = await load_portfolio_by_username(db, username)
     
-    if not user:
+    if not portfolio:
         raise HTTPException(status_code=404, detail="Portfolio not found")
     
+    user = portfolio.User
+    profile = portfolio.profile
+    
     # Check privacy setting
     if not user.is_public:
         raise HTTPException(status_code=403, detail="Portfolio is private")
     
-    # Fetch all portfolio data
-    profile = db.query(Profile).filter(Profile.user_id == user.id).first()
-    projects = db.query(Project).filter(Project.owner_id == user.id).all()
-    skills = db.query(Skill).filter(Skill.user_id == user.id).all()
-    certificates = db.query(Certificate).filter(Certificate.user_id == user.id).all()
-    work_experience = db.query(WorkExperience).filter(WorkExperience.user_id == user.id).all()
-    awards = db.query(Award).filter(Award.user_id == user.id).all()
-    
     # Build comprehensive portfolio response
     portfolio_data = {
         "username": user.username,  # Return actual casing
-        "name": profile.name if profile and profile.name else user.full_name,
-        "title": profile.title if profile else "Developer",
+        "name": profile["name"] if profile and profile["name"] else user.full_name,
+        "title": profile["title"] if profile else "Developer",
         "tagline": "Building the future with code, one project at a time",
-        "location": profile.location if profile else "",
-        "email": profile.email if profile else user.email,
-        "github": profile.github if profile else "",
-        "linkedin": profile.linkedin if profile else "",
-        "website": profile.website if profile else "",
-        "avatar": profile.avatar if profile else "",
-        "about": profile.bio if profile else "",
+        "location": profile["location"] if profile else "",
+        "email": profile["email"] if profile else user.email,
+        "github": profile["github"] if profile else "",
+        "linkedin": profile["linkedin"] if profile else "",
+        "website": profile["website"] if profile else "",
+        "avatar": profile["avatar"] if profile else "",
+        "about": profile["bio"] if profile else "",
         "theme_preference": user.theme_preference or "classic",
         "is_public": user.is_public,
         "analytics_enabled": user.analytics_enabled,
-        
-        "projects": [
-            {
-                "id": p.id,
-                "title": p.title,
-                "description": p.description or "",
-                "image": p.link or "https://via.placeholder.com/400x250",
-                "tech": p.stack if isinstance(p.stack, list) else (p.stack.split(",") if p.stack else []),
-                "features": p.features.split(",") if isinstance(p.features, str) else (p.features or []),
-                "stars": p.stars or 0,
-                "forks": p.forks or 0,
-                "demo": p.link,
-                "repo": p.link,
-                "featured": False
-            }
-            for p in projects
-        ],
-        
-        "achievements": [
-            {
-                "title": w.title,
-                "issuer": w.organization,
-                "date": w.duration,
-                "type": w.status or "internship",
-                "description": w.description or ""
-            }
-            for w in work_experience
-        ] + [
-            {
-                "title": a.title,
-                "issuer": a.organization,
-                "date": a.year,
-                "type": a.category or "award",
-                "description": a.description or ""
-            }
-            for a in awards
-        ],
-        
-        "certificates": [
-            {
-                "title": c.title,
-                "issuer": c.description or "Unknown",
-                "date": c.year,
-                "credentialId": c.credential_id
-            }
-            for c in certificates
-        ],
-        
-        "skills": [
-            {
-                "name": s.name,
-                "level": s.level,
-                "category": s.category
-            }
-            for s in skills
-        ]
+        **build_portfolio_sections(portfolio),
     }
     
-    return portfolio_data
+    snapshot = store_snapshot(
+        user.username, user.content_version, portfolio_data, portfolio_etag(user.id, user.content_version)
+    )
+    return Response(
+        content=snapshot.body,
+        media_type="application/json",
+        headers={"ETag": snapshot.etag, "Cache-Control": PUBLIC_CACHE_CONTROL},
+    )
 
 
 @router.get("/{username}/public-check")
 @limiter.limit("100/minute")
-def check_portfolio_public(request: Request, username: str, db: Session = Depends(get_db)):
+async def check_portfolio_public(request: Request, response: Response, username: str, db: AsyncSession = Depends(get_async_db)):
     """
     Quick check if a portfolio exists and is public.
     Used for routing decisions on frontend.
+    Supports If-None-Match revalidation against the user's content_version.
     
     Returns:
         - exists: boolean - whether user exists
@@ -198,10 +193,9 @@ def check_portfolio_public(request: Request, username: str, db: Session = Depend
             "username": username
         }
     
-    # Case-insensitive lookup
-    user = db.query(User).filter(
-        func.lower(User.username) == username.lower()
-    ).first()
+    # Case-insensitive lookup of only the columns we need
+    user = await get_portfolio_version(db, username)
+    response.headers["Cache-Control"] = PUBLIC_CACHE_CONTROL
     
     if not user:
         return {
@@ -210,6 +204,11 @@ def check_portfolio_public(request: Request, username: str, db: Session = Depend
             "username": username
         }
     
+    etag = portfolio_etag(user.id, user.content_version)
+    if _etag_matches(request, etag):
+        return _not_modified(etag)
+    response.headers["ETag"] = etag
+    
     return {
         "exists": True,
         "is_public": user.is_public,
@@ -220,7 +219,7 @@ def check_portfolio_public(request: Request, username: str, db: Session = Depend
 @router.get("/existing")
 def get_existing_portfolio_data(
     db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user)
+    current_user: CurrentPrincipal = Depends(get_current_principal)
 ):
     """
     Get existing portfolio data for duplicate detection during resume import.
@@ -1,4 +1,4 @@
-from fastapi import APIRouter, Depends
+from fastapi import APIRouter, Depends, HTTPException, Request
 from sqlalchemy.orm import Session
 from app import crud, schemas
 from app.crud import profile as crud_profile
@@ -6,6 +6,7 @@ from app.dependencies.auth_user import get_db
 from app.schemas.profile import ProfileUpdate, ProfileOut
 from app.dependencies.auth_user import get_current_user
 from app.utils.security import validate_csrf
+from app.utils.avatar_store import InvalidAvatarError
 
 router = APIRouter(prefix="/profile", tags=["Profile"])
 
@@ -21,8 +22,14 @@ def get_profile(
 
 @router.post("/", response_model=ProfileOut, dependencies=[Depends(validate_csrf)])
 def save_profile(
+    request: Request,
     profile_data: schemas.profile.ProfileUpdate,
     db: Session = Depends(get_db),
     current_user=Depends(get_current_user)
 ):
-    return crud_profile.create_or_update_profile(db, current_user.id, profile_data)
+    try:
+        return crud_profile.create_or_update_profile(
+            db, current_user, profile_data, base_url=str(request.base_url)
+        )
+    except InvalidAvatarError as e:
+        raise HTTPException(status_code=422, detail=str(e))
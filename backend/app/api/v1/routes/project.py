@@ -1,12 +1,22 @@
+import httpx
 from fastapi import APIRouter, Depends, HTTPException
+from fastapi.responses import StreamingResponse
+from sqlalchemy import select, func
 from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 from app.models.project import Project
-from app.utils.database import get_db
-from app.dependencies.auth_user import get_current_user
-from app.models.user import User
+from app.database import get_db, get_async_db
+from app.dependencies.auth_user import CurrentPrincipal, get_current_principal
 from pydantic import BaseModel
 from typing import List, Optional
 from app.utils.security import validate_csrf
+from app.crud.portfolio import commit_portfolio_change
+from app.crud.batch import apply_batch
+from app.crud.writes import insert_returning, update_returning
+from app.schemas.batch import BatchRequest, BatchResult
+from app.utils.http_clients import http_client
+from app.utils.github_client import GitHubClient, get_github_client
+from app.utils.github_import import GITHUB_USERNAME_RE, list_repos, import_events
 
 router = APIRouter()
 
@@ -20,6 +30,7 @@ class ProjectCreate(BaseModel):
     stars: Optional[int] = 0
     forks: Optional[int] = 0
     link: Optional[str] = None
+    github_repo: Optional[str] = None
     imported: Optional[bool] = False
     ai_summary: Optional[bool] = False
     saved: Optional[bool] = False
@@ -31,36 +42,69 @@ class ProjectOut(ProjectCreate):
 
 # Create a new project
 @router.post("/", response_model=ProjectOut, dependencies=[Depends(validate_csrf)])
-def create_project(project: ProjectCreate, db: Session = Depends(get_db), current_user: User = Depends(get_current_user)):
-    db_project = Project(**project.dict(), owner_id=current_user.id)
-    db.add(db_project)
-    db.commit()
-    db.refresh(db_project)
+def create_project(project: ProjectCreate, db: Session = Depends(get_db), current_user: CurrentPrincipal = Depends(get_current_principal)):
+    db_project = insert_returning(db, Project, {**project.dict(), "owner_id": current_user.id})
+    commit_portfolio_change(db, current_user)
     return db_project
 
 # Get all projects for the current user
 @router.get("/", response_model=List[ProjectOut])
-def get_projects(db: Session = Depends(get_db), current_user: User = Depends(get_current_user)):
-    return db.query(Project).filter(Project.owner_id == current_user.id).all()
+async def get_projects(db: AsyncSession = Depends(get_async_db), current_user: CurrentPrincipal = Depends(get_current_principal)):
+    result = await db.execute(select(Project).where(Project.owner_id == current_user.id))
+    return result.scalars().all()
 
 # Delete a project
 @router.delete("/{project_id}", dependencies=[Depends(validate_csrf)])
-def delete_project(project_id: int, db: Session = Depends(get_db), current_user: User = Depends(get_current_user)):
+def delete_project(project_id: int, db: Session = Depends(get_db), current_user: CurrentPrincipal = Depends(get_current_principal)):
     project = db.query(Project).filter(Project.id == project_id, Project.owner_id == current_user.id).first()
     if not project:
         raise HTTPException(status_code=404, detail="Project not found")
     db.delete(project)
-    db.commit()
+    commit_portfolio_change(db, current_user)
     return {"detail": "Project deleted"}
 
 # Update a project
 @router.put("/{project_id}", response_model=ProjectOut, dependencies=[Depends(validate_csrf)])
-def update_project(project_id: int, project_data: ProjectCreate, db: Session = Depends(get_db), current_user: User = Depends(get_current_user)):
-    project = db.query(Project).filter(Project.id == project_id, Project.owner_id == current_user.id).first()
+def update_project(project_id: int, project_data: ProjectCreate, db: Session = Depends(get_db), current_user: CurrentPrincipal = Depends(get_current_principal)):
+    values = project_data.dict()
+    # Set by GitHub imports; the edit form does not send it, and must not clear it
+    if "github_repo" not in project_data.model_fields_set:
+        values.pop("github_repo")
+    project = update_returning(
+        db, Project, (Project.id == project_id, Project.owner_id == current_user.id), values
+    )
     if not project:
         raise HTTPException(status_code=404, detail="Project not found")
-    for field, value in project_data.dict().items():
-        setattr(project, field, value)
-    db.commit()
-    db.refresh(project)
+    commit_portfolio_change(db, current_user)
     return project
+
+# Create, update and delete several projects in one transaction
+@router.post("/batch", response_model=BatchResult[ProjectOut], dependencies=[Depends(validate_csrf)])
+def batch_projects(batch: BatchRequest, db: Session = Depends(get_db), current_user: CurrentPrincipal = Depends(get_current_principal)):
+    return apply_batch(db, current_user, Project, Project.owner_id, ProjectCreate, ProjectCreate, ProjectOut, batch)
+
+# Import all of a GitHub account's repositories, streaming progress as server-sent events
+@router.post("/import/github/{username}", dependencies=[Depends(validate_csrf)])
+async def import_github_projects(
+    username: str,
+    db: AsyncSession = Depends(get_async_db),
+    current_user: CurrentPrincipal = Depends(get_current_principal),
+    github: GitHubClient = Depends(get_github_client),
+    openrouter: httpx.AsyncClient = Depends(http_client("openrouter")),
+):
+    if not GITHUB_USERNAME_RE.match(username):
+        raise HTTPException(status_code=400, detail="Invalid GitHub username")
+
+    # Listing errors (unknown user, rate limit) are reported before streaming starts
+    repos = await list_repos(github, username)
+
+    # Repos already in the portfolio are not imported twice
+    result = await db.execute(select(func.lower(Project.title)).where(Project.owner_id == current_user.id))
+    existing = set(result.scalars().all())
+    new_repos = [repo for repo in repos if repo["name"].lower() not in existing]
+
+    return StreamingResponse(
+        import_events(current_user, new_repos, len(repos) - len(new_repos), github, openrouter),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
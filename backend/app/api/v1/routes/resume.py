@@ -3,163 +3,177 @@
 Resume upload and AI extraction API endpoints.
 Handles PDF/DOCX upload, text extraction, AI parsing, and review-before-save workflow.
 """
-from fastapi import APIRouter, UploadFile, File, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, BackgroundTasks, Request, Response, status
+from sqlalchemy import select, delete
 from sqlalchemy.orm import Session
-from app.dependencies.auth_user import get_current_user, get_db
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.dependencies.auth_user import get_current_user, get_db, CurrentPrincipal, get_current_principal
+from app.database import get_async_db
 from app.models.user import User
 from app.models.resume import Resume
 from app.models.profile import Profile
-from app.models.project import Project
-from app.models.skills import Skill
-from app.models.skills import Skill
-from app.models.awards import Award
-from app.models.work_experience import WorkExperience
-from app.models.certificates import Certificate
 from app.schemas.resume import (
-    ResumeUploadResponse,
+    ResumeJobOut,
     ResumeConfirmRequest,
     ResumeExtractedData,
     ResumeOut
 )
-from app.utils.resume_extractor import extract_text
-from app.utils.groq_resume_parser import parse_resume_with_groq  # Groq LLM parser
-import os
+from app.utils.resume_jobs import expire_stale_jobs, job_is_stale, run_resume_job
+from app.utils import resume_cache
+from app.utils.upload_stream import UploadRejected, discard_upload, receive_upload
+from app.crud.portfolio import commit_portfolio_change
+from app.crud.resume_merge import merge_resume_sections
 import logging
-from io import BytesIO
 from datetime import datetime
 
 router = APIRouter(prefix="/api/v1/resumes", tags=["Resumes"])
 logger = logging.getLogger(__name__)
 
-# File upload constraints
+# File upload constraints (accepted types: see app.utils.upload_stream.MAGIC_BYTES)
 MAX_FILE_SIZE = 5 * 1024 * 1024  # 5MB
-ALLOWED_EXTENSIONS = {".pdf", ".docx"}
 
 
-@router.post("/upload", response_model=ResumeUploadResponse)
+JOB_MESSAGES = {
+    "queued": "Resume uploaded. Parsing will start shortly.",
+    "processing": "Resume is being parsed.",
+    "completed": "Resume parsed successfully. Please review the extracted data and confirm to save to your portfolio.",
+    "failed": "Resume parsing failed.",
+}
+
+
+def _job_response(resume: Resume) -> ResumeJobOut:
+    extracted_data = None
+    if resume.status == "completed" and resume.parsed_data:
+        extracted_data = ResumeExtractedData(**resume.parsed_data)
+    return ResumeJobOut(
+        job_id=resume.id,
+        resume_id=resume.id,
+        status=resume.status,
+        extracted_data=extracted_data,
+        error=resume.error,
+        message=JOB_MESSAGES.get(resume.status, ""),
+    )
+
+
+@router.post(
+    "/upload",
+    response_model=ResumeJobOut,
+    status_code=status.HTTP_202_ACCEPTED,
+    # The body is streamed by hand, so describe the form for the API docs
+    openapi_extra={
+        "requestBody": {
+            "required": True,
+            "content": {
+                "multipart/form-data": {
+                    "schema": {
+                        "type": "object",
+                        "required": ["file"],
+                        "properties": {"file": {"type": "string", "format": "binary"}},
+                    }
+                }
+            },
+        }
+    },
+)
 async def upload_resume(
-    current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db),
-    file: UploadFile = File(...)
+    request: Request,
+    background_tasks: BackgroundTasks,
+    response: Response,
+    current_user: CurrentPrincipal = Depends(get_current_principal),
+    db: AsyncSession = Depends(get_async_db)
 ):
     """
-    Upload and parse resume file (PDF or DOCX).
+    Upload a resume file (PDF or DOCX) for background parsing.
     
-    - Validates file type and size
-    - Extracts text from file
-    - Uses AI to parse structured data
-    - Saves to database with is_saved=False for review
+    - Streams the body to a temporary file, rejecting it as soon as the
+      type, signature or 5MB size limit check fails
     - Replaces any existing unsaved resume for the user
+    - Queues text extraction and AI parsing as a job
     
-    Returns extracted data for frontend review.
+    Returns immediately with the job id; poll GET /jobs/{job_id} for the
+    extracted data to review.
     """
-    
-    # Debug logging
     logger.info(f"Received file upload request from user {current_user.id}")
-    logger.info(f"File object: {file}")
-    logger.info(f"Filename: {file.filename if file else 'None'}")
-    
-    if not file or not file.filename:
-        raise HTTPException(
-            status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
-            detail="No file provided. Please upload a PDF or DOCX file."
-        )
-    
-    # Validate file extension
-    file_ext = os.path.splitext(file.filename)[1].lower()
     
-    if file_ext not in ALLOWED_EXTENSIONS:
-        raise HTTPException(
-            status_code=status.HTTP_415_UNSUPPORTED_MEDIA_TYPE,
-            detail=f"File type '{file_ext}' not supported. Please upload PDF or DOCX files only."
-        )
-    
-    # Read file content
     try:
-        file_bytes = await file.read()
-    except Exception as e:
-        logger.error(f"Failed to read uploaded file: {str(e)}")
-        raise HTTPException(
-            status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
-            detail="Failed to read uploaded file"
-        )
+        upload = await receive_upload(request, MAX_FILE_SIZE)
+    except UploadRejected as e:
+        raise HTTPException(status_code=e.status_code, detail=e.detail)
     
-    # Validate file size
-    if len(file_bytes) > MAX_FILE_SIZE:
-        raise HTTPException(
-            status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
-            detail=f"File size ({len(file_bytes)} bytes) exceeds 5MB limit"
-        )
+    logger.info(f"Received {upload.filename} ({upload.size} bytes)")
+    file_ext = upload.file_ext
     
-    # Extract text from file
-    import time
-    extraction_start = time.time()
-    logger.info(f"Extracting text from {file_ext} file: {file.filename}")
-    resume_text = extract_text(BytesIO(file_bytes), file_ext)
-    extraction_time = time.time() - extraction_start
-    logger.info(f"⏱️ TEXT EXTRACTION took {extraction_time:.2f} seconds")
-    
-    if not resume_text:
-        raise HTTPException(
-            status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
-            detail="Failed to extract text from file. Please ensure the file is not corrupted or password-protected."
-        )
-    
-    logger.info(f"Extracted {len(resume_text)} characters from resume")
-    
-    # Parse resume with Groq LLM (fast and reliable)
-    try:
-        llm_start = time.time()
-        logger.info("Parsing resume with Groq LLM...")
-        extracted_data = parse_resume_with_groq(resume_text)
-        llm_time = time.time() - llm_start
-        logger.info(f"⏱️ GROQ PARSING took {llm_time:.2f} seconds")
-        logger.info(f"⏱️ TOTAL TIME: {extraction_time + llm_time:.2f} seconds (Extraction: {extraction_time:.2f}s, Groq: {llm_time:.2f}s)")
-    except ValueError as e:
-        # Validation or JSON parsing error
-        logger.error(f"Resume parsing validation error: {str(e)}")
-        raise HTTPException(
-            status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
-            detail=f"Resume parsing failed: {str(e)}"
-        )
-    except Exception as e:
-        # OpenRouter API or other errors
-        logger.error(f"Resume parsing error: {str(e)}", exc_info=True)
-        raise HTTPException(
-            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-            detail="Resume parsing failed. Please try again or contact support."
-        )
-    
-    # Delete any existing unsaved resume for this user
-    db.query(Resume).filter(
-        Resume.owner_id == current_user.id,
-        Resume.is_saved == False
-    ).delete()
-    db.commit()
-    
-    # Save new resume draft
+    # Record the job; extraction and parsing happen in the background
     resume_record = Resume(
         owner_id=current_user.id,
-        filename=file.filename,
+        filename=upload.filename,
         file_type=file_ext.replace('.', ''),
-        extracted_text=resume_text,
-        parsed_data=extracted_data.model_dump(),  # Pydantic v2
         is_saved=False,
+        status="queued",
         created_at=datetime.utcnow(),
         updated_at=datetime.utcnow()
     )
     
-    db.add(resume_record)
-    db.commit()
-    db.refresh(resume_record)
+    # A file we have already parsed completes immediately, without a job
+    cached = resume_cache.lookup(upload.sha256)
+    if cached:
+        resume_text, extracted_data = cached
+        resume_record.status = "completed"
+        resume_record.extracted_text = resume_text
+        resume_record.parsed_data = extracted_data.model_dump()
     
-    logger.info(f"Resume saved with ID {resume_record.id} for user {current_user.id}")
+    try:
+        # Delete any existing unsaved resume for this user
+        await db.execute(delete(Resume).where(
+            Resume.owner_id == current_user.id,
+            Resume.is_saved == False
+        ))
+        db.add(resume_record)
+        await db.commit()
+    except Exception:
+        discard_upload(upload.path)
+        raise
+    
+    if cached:
+        discard_upload(upload.path)
+        response.status_code = status.HTTP_200_OK
+        logger.info(f"Resume {resume_record.id} served from parse cache for user {current_user.id}")
+    else:
+        background_tasks.add_task(run_resume_job, resume_record.id, upload.path, file_ext, upload.sha256)
+        logger.info(f"Resume job {resume_record.id} queued for user {current_user.id}")
+    
+    return _job_response(resume_record)
+
+
+@router.get("/jobs/{job_id}", response_model=ResumeJobOut)
+async def get_resume_job(
+    job_id: int,
+    current_user: CurrentPrincipal = Depends(get_current_principal),
+    db: AsyncSession = Depends(get_async_db)
+):
+    """
+    Poll a resume parsing job.
     
-    return ResumeUploadResponse(
-        resume_id=resume_record.id,
-        extracted_data=extracted_data,
-        message="Resume parsed successfully. Please review the extracted data and confirm to save to your portfolio."
-    )
+    Returns the job status, plus the extracted data once it is 'completed'
+    or the reason once it has 'failed'.
+    """
+    resume = (await db.execute(select(Resume).where(
+        Resume.id == job_id,
+        Resume.owner_id == current_user.id
+    ))).scalars().first()
+    
+    if not resume:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Resume job not found"
+        )
+    
+    # Its worker was restarted or crashed; the job will never finish
+    if job_is_stale(resume):
+        await expire_stale_jobs(db, resume.id)
+        await db.refresh(resume)
+    
+    return _job_response(resume)
 
 
 @router.get("/draft", response_model=ResumeExtractedData)
@@ -174,7 +188,8 @@ async def get_draft(
     """
     draft = db.query(Resume).filter(
         Resume.owner_id == current_user.id,
-        Resume.is_saved == False
+        Resume.is_saved == False,
+        Resume.status == "completed"
     ).order_by(Resume.created_at.desc()).first()
     
     if not draft:
@@ -197,7 +212,7 @@ async def get_draft(
 
 
 @router.post("/confirm")
-async def confirm_resume(
+def confirm_resume(
     request: ResumeConfirmRequest,
     current_user: User = Depends(get_current_user),
     db: Session = Depends(get_db)
@@ -209,15 +224,18 @@ async def confirm_resume(
     - Merges approved data into profile, projects, skills, and achievements
     - Marks the resume as saved (is_saved=True)
     
-    This implements the review-before-save workflow.
+    This implements the review-before-save workflow. A plain def: the
+    row lock below can wait on a concurrent confirm, which must block a
+    threadpool worker rather than the event loop.
     """
     
     # Get the draft resume
     draft = db.query(Resume).filter(
         Resume.id == request.resume_id,
         Resume.owner_id == current_user.id,
-        Resume.is_saved == False
-    ).first()
+        Resume.is_saved == False,
+        Resume.status == "completed"
+    ).with_for_update().first()  # A concurrent confirm of the same draft waits, then finds it saved
     
     if not draft:
         raise HTTPException(
@@ -227,9 +245,6 @@ async def confirm_resume(
     
     approved_data = request.approved_data
     
-    # TODO: Implement comprehensive merge logic
-    # For now, we'll implement basic profile update and creation of new records
-    
     try:
         # 1. Update or create profile
         profile = db.query(Profile).filter(Profile.user_id == current_user.id).first()
@@ -267,121 +282,27 @@ async def confirm_resume(
             )
             db.add(profile)
         
-        # 2. Add projects (only new ones, avoid duplicates)
-        for project_data in approved_data.projects:
-            # Check if project with same title already exists
-            existing = db.query(Project).filter(
-                Project.owner_id == current_user.id,
-                Project.title == project_data.title
-            ).first()
-            
-            if not existing:
-                project = Project(
-                    owner_id=current_user.id,
-                    title=project_data.title,
-                    description=project_data.description,
-                    type="resume",  # Mark as imported from resume
-                    stack=project_data.tech,
-                    features=project_data.features,
-                    stars=0,
-                    forks=0,
-                    link="",
-                    imported=True,
-                    ai_summary=True,
-                    saved=True,
-                    last_updated=datetime.utcnow()
-                )
-                db.add(project)
-        
-        # 3. Add skills (avoid duplicates)
-        for skill_data in approved_data.skills:
-            existing = db.query(Skill).filter(
-                Skill.user_id == current_user.id,
-                Skill.name == skill_data.name
-            ).first()
-            
-            if not existing:
-                skill = Skill(
-                    user_id=current_user.id,
-                    name=skill_data.name,
-                    category=skill_data.category.value,
-                    level=skill_data.level.value,
-                    experience=""  # TODO: Could be inferred from resume
-                )
-                db.add(skill)
-        
-        # 4a. Add Work Experience
-        for work_data in approved_data.work_experience:
-            existing = db.query(WorkExperience).filter(
-                WorkExperience.user_id == current_user.id,
-                WorkExperience.title == work_data.title,
-                WorkExperience.organization == work_data.company
-            ).first()
-            
-            if not existing:
-                work = WorkExperience(
-                    user_id=current_user.id,
-                    title=work_data.title,
-                    organization=work_data.company,
-                    duration=work_data.duration,
-                    location=work_data.location,
-                    description=work_data.description
-                )
-                db.add(work)
-
-        # 4b. Add Certificates
-        for cert_data in approved_data.certifications:
-            existing = db.query(Certificate).filter(
-                Certificate.user_id == current_user.id,
-                Certificate.title == cert_data.name
-            ).first()
-            
-            if not existing:
-                cert = Certificate(
-                    user_id=current_user.id,
-                    title=cert_data.name,
-                    issuer=cert_data.issuer,
-                    year=cert_data.year,
-                    description=cert_data.description,
-                    credential_id="" # Resume might not have this
-                )
-                db.add(cert)
-        
-        # 4. Add achievements (avoid duplicates)
-        for achievement_data in approved_data.achievements:
-            existing = db.query(Award).filter(
-                Award.user_id == current_user.id,
-                Award.title == achievement_data.title
-            ).first()
-            
-            if not existing:
-                award = Award(
-                    user_id=current_user.id,
-                    title=achievement_data.title,
-                    organization=achievement_data.issuer,
-                    year=achievement_data.date,
-                    description=achievement_data.description,
-                    category=achievement_data.type
-                )
-                db.add(award)
+        # 2-4. Add work experience, projects, skills, certificates and
+        # achievements the user does not have yet (set-based, see app.crud.resume_merge)
+        added = merge_resume_sections(db, current_user.id, approved_data)
         
         # 5. Mark resume as saved
         draft.is_saved = True
         draft.updated_at = datetime.utcnow()
         
         # Commit all changes
-        db.commit()
+        commit_portfolio_change(db, current_user)
         
         logger.info(f"Successfully saved resume data for user {current_user.id}")
         
         return {
             "message": "Resume data saved successfully to your portfolio",
             "profile_updated": True,
-            "work_experience_added": len(approved_data.work_experience),
-            "projects_added": len(approved_data.projects),
-            "skills_added": len(approved_data.skills),
-            "certifications_added": len(approved_data.certifications),
-            "achievements_added": len(approved_data.achievements)
+            "work_experience_added": added["work_experience"],
+            "projects_added": added["projects"],
+            "skills_added": added["skills"],
+            "certifications_added": added["certifications"],
+            "achievements_added": added["achievements"]
         }
         
     except Exception as e:
@@ -1,67 +1,78 @@
 from fastapi import APIRouter, Depends, HTTPException, status
+from sqlalchemy import select
 from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 from typing import List
 
-from app.utils.database import get_db
-from app.dependencies.auth_user import get_current_user
+from app.database import get_db, get_async_db
+from app.dependencies.auth_user import CurrentPrincipal, get_current_principal
 
 from app.models.skills import Skill as SkillModel
 from app.schemas.skills import Skill as SkillSchema
-from app.models.user import User  # Import User explicitly
 from app.schemas.skills import SkillCreate, SkillUpdate # or from app import schemas
 from app.utils.security import validate_csrf
+from app.crud.portfolio import commit_portfolio_change
+from app.crud.batch import apply_batch
+from app.crud.writes import insert_returning, update_returning
+from app.schemas.batch import BatchRequest, BatchResult
 
 router = APIRouter(
     prefix="/skills",
     tags=["skills"],
-    dependencies=[Depends(get_current_user)],
+    dependencies=[Depends(get_current_principal)],
 )
 
 @router.post("/", response_model=SkillSchema, status_code=status.HTTP_201_CREATED, dependencies=[Depends(validate_csrf)])
 def create_skill(
     skill_in: SkillCreate,
     db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user),
+    current_user: CurrentPrincipal = Depends(get_current_principal),
 ):
-    skill = SkillModel(**skill_in.dict(), user_id=current_user.id)
-    db.add(skill)
-    db.commit()
-    db.refresh(skill)
+    skill = insert_returning(db, SkillModel, {**skill_in.dict(), "user_id": current_user.id})
+    commit_portfolio_change(db, current_user)
     return skill
 
 @router.get("/", response_model=List[SkillSchema])
-def read_skills(
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user),
+async def read_skills(
+    db: AsyncSession = Depends(get_async_db),
+    current_user: CurrentPrincipal = Depends(get_current_principal),
 ):
-    skills = db.query(SkillModel).filter(SkillModel.user_id == current_user.id).all()
-    return skills
+    result = await db.execute(select(SkillModel).where(SkillModel.user_id == current_user.id))
+    return result.scalars().all()
 
 @router.put("/{skill_id}", response_model=SkillSchema, dependencies=[Depends(validate_csrf)])
 def update_skill(
     skill_id: int,
     skill_in: SkillUpdate,
     db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user),
+    current_user: CurrentPrincipal = Depends(get_current_principal),
 ):
-    skill = db.query(SkillModel).filter(SkillModel.id == skill_id, SkillModel.user_id == current_user.id).first()
+    skill = update_returning(
+        db, SkillModel, (SkillModel.id == skill_id, SkillModel.user_id == current_user.id), skill_in.dict()
+    )
     if not skill:
         raise HTTPException(status_code=404, detail="Skill not found")
-    for key, value in skill_in.dict().items():
-        setattr(skill, key, value)
-    db.commit()
-    db.refresh(skill)
+    commit_portfolio_change(db, current_user)
     return skill
 
 @router.delete("/{skill_id}", status_code=status.HTTP_204_NO_CONTENT, dependencies=[Depends(validate_csrf)])
 def delete_skill(
     skill_id: int,
     db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user),
+    current_user: CurrentPrincipal = Depends(get_current_principal),
 ):
     skill = db.query(SkillModel).filter(SkillModel.id == skill_id, SkillModel.user_id == current_user.id).first()
     if not skill:
         raise HTTPException(status_code=404, detail="Skill not found")
     db.delete(skill)
-    db.commit()
+    commit_portfolio_change(db, current_user)
     return
+
+@router.post("/batch", response_model=BatchResult[SkillSchema], dependencies=[Depends(validate_csrf)])
+def batch_skills(
+    batch: BatchRequest,
+    db: Session = Depends(get_db),
+    current_user: CurrentPrincipal = Depends(get_current_principal),
+):
+    """Create, update and delete several skills in one transaction; see app.crud.batch."""
+    return apply_batch(db, current_user, SkillModel, SkillModel.user_id, SkillCreate, SkillUpdate, SkillSchema, batch)
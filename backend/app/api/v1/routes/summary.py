@@ -1,8 +1,12 @@
 import os
-import requests
-from fastapi import APIRouter, Query
+import asyncio
+import httpx
+from fastapi import APIRouter, Depends, Query
 from dotenv import load_dotenv
 import json
+from typing import List, Optional
+from app.utils.http_clients import http_client
+from app.utils.github_client import GitHubClient, GitHubRateLimited, get_github_client
 
 load_dotenv()
 
@@ -12,50 +16,53 @@ API_KEY = os.getenv("OPENROUTER_API_KEY")
 MODEL = os.getenv("MODEL", "google/gemma-3-4b-it:free")
 OPENROUTER_URL = "https://openrouter.ai/api/v1/chat/completions"
 
-@router.get("/smart-summary")
-def github_summary(repo_url: str = Query(..., description="GitHub repo URL")):
-    try:
-        if "github.com" not in repo_url:
-            return {"error": "Invalid GitHub URL"}
-
-        # Extract GitHub owner/repo
-        parts = repo_url.strip('/').split('/')
-        if len(parts) < 2:
-            return {"error": "Could not parse GitHub repo URL"}
-        owner, repo = parts[-2], parts[-1].replace(".git", "")
-
-        # GitHub headers
-        github_headers = {
-            "Accept": "application/vnd.github+json",
-            "Authorization": f"Bearer {os.getenv('GITHUB_API_TOKEN')}"
-        }
+# Budget for the whole request: GitHub fetches and the LLM call together
+SMART_SUMMARY_TIMEOUT = float(os.getenv("SMART_SUMMARY_TIMEOUT", "20"))  # seconds
 
 
-        # Fetch GitHub repo data
-        repo_api_url = f"https://api.github.com/repos/{owner}/{repo}"
-        repo_resp = requests.get(repo_api_url, headers=github_headers)
-        if repo_resp.status_code != 200:
-            return {"error": "Failed to fetch GitHub repo data"}
-        repo_data = repo_resp.json()
+class SummaryError(Exception):
+    """Upstream failure; the message is returned to the client as {"error": ...}."""
 
-        # Extract fields from GitHub
-        title = repo_data.get("name", "")
-        stars = repo_data.get("stargazers_count", 0)
-        forks = repo_data.get("forks_count", 0)
-        homepage = (repo_data.get("homepage") or "").strip()
 
-        # Fetch README
-        readme_url = f"https://raw.githubusercontent.com/{owner}/{repo}/main/README.md"
-        readme_resp = requests.get(readme_url)
-        if readme_resp.status_code == 200 and readme_resp.text.strip():
-            readme = readme_resp.text[:2000].replace("\n", " ").strip()
-            readme_available = True
-        else:
-            readme = ""
-            readme_available = False
-
-        # Construct the prompt
-        prompt = f"""
+async def _fetch_repo(github: GitHubClient, owner: str, repo: str) -> dict:
+    repo_resp = await github.get(f"/repos/{owner}/{repo}")
+    if repo_resp.status_code != 200:
+        raise SummaryError("Failed to fetch GitHub repo data")
+    return repo_resp.json()
+
+
+async def _fetch_readme(github: GitHubClient, owner: str, repo: str) -> str:
+    """README of the default branch, whatever its name or file name; "" if there is none."""
+    readme_resp = await github.get(f"/repos/{owner}/{repo}/readme", accept="application/vnd.github.raw+json")
+    if readme_resp.status_code == 200 and readme_resp.text.strip():
+        return readme_resp.text[:2000].replace("\n", " ").strip()
+    return ""
+
+
+async def _fetch_languages(github: GitHubClient, owner: str, repo: str) -> List[str]:
+    """Repo languages, most code first."""
+    languages_resp = await github.get(f"/repos/{owner}/{repo}/languages")
+    if languages_resp.status_code != 200:
+        return []
+    languages = languages_resp.json()
+    return sorted(languages, key=languages.get, reverse=True)
+
+
+async def _summarize(
+    github: GitHubClient,
+    openrouter: httpx.AsyncClient,
+    owner: str,
+    repo: str,
+) -> Optional[dict]:
+    """
+    Fetch the README, then ask the LLM for the summary right away (it only
+    needs the README and the repo name). Returns None if the reply is not JSON.
+    """
+    readme = await _fetch_readme(github, owner, repo)
+    title = repo
+
+    # Construct the prompt
+    prompt = f"""
 You are an assistant that summarizes GitHub projects into a short structured JSON. 
 Given the README content and/or project name, extract the following fields with these strict rules:
 
@@ -73,59 +80,122 @@ Output format:
 }}
 
 README:
-{readme if readme_available else "Not available. Only use project name."}
+{readme or "Not available. Only use project name."}
 """
 
-        # OpenRouter headers
-        headers = {
-            "Authorization": f"Bearer {API_KEY}",
-            "Content-Type": "application/json",
-            "HTTP-Referer": "https://openrouter.ai"
-        }
+    # OpenRouter headers
+    headers = {
+        "Authorization": f"Bearer {API_KEY}",
+        "Content-Type": "application/json",
+        "HTTP-Referer": "https://openrouter.ai"
+    }
+
+    payload = {
+        "model": MODEL,
+        "messages": [
+            {
+                "role": "user",
+                "content": prompt
+            }
+        ],
+        "max_tokens": 500,
+        "temperature": 0.2
+    }
 
-        payload = {
-            "model": MODEL,
-            "messages": [
-                {
-                    "role": "user",
-                    "content": prompt
-                }
-            ],
-            "max_tokens": 500,
-            "temperature": 0.2
-        }
+    response = await openrouter.post(OPENROUTER_URL, json=payload, headers=headers)
+    if response.status_code != 200:
+        raise SummaryError(f"OpenRouter error: {response.text}")
 
+    content = response.json()["choices"][0]["message"]["content"].strip()
 
-        response = requests.post(OPENROUTER_URL, json=payload, headers=headers)
-        if response.status_code != 200:
-            return {"error": f"OpenRouter error: {response.text}"}
+    # Remove Markdown code fences if present
+    if content.startswith("```"):
+        content = content.replace("```json", "").replace("```", "").strip()
 
-        content = response.json()["choices"][0]["message"]["content"].strip()
+    try:
+        return json.loads(content)
+    except json.JSONDecodeError:
+        return None
+
+
+def _fallback_summary(title: str, stars: int, forks: int, homepage: str, languages: List[str], reason: str) -> dict:
+    stack = (languages + ["Unknown"] * 3)[:3]
+    return {
+        "title": title,
+        "description": f"{title} is a GitHub project with {stars} stars and {forks} forks.",
+        "type": "github",
+        "stack": stack,
+        "features": [reason],
+        "stars": stars,
+        "forks": forks,
+        "link": homepage
+    }
 
-        # Remove Markdown code fences if present
-        if content.startswith("```"):
-            content = content.replace("```json", "").replace("```", "").strip()
 
+@router.get("/smart-summary")
+async def github_summary(
+    repo_url: str = Query(..., description="GitHub repo URL"),
+    github: GitHubClient = Depends(get_github_client),
+    openrouter: httpx.AsyncClient = Depends(http_client("openrouter")),
+):
+    """
+    Repo metadata, languages and README are fetched concurrently; the LLM
+    call starts as soon as the README is in. Everything shares one
+    SMART_SUMMARY_TIMEOUT budget. If the LLM misses it, a summary built
+    from the metadata is returned instead. GitHub responses are cached and
+    revalidated with conditional requests (see app.utils.github_client).
+    """
+    if "github.com" not in repo_url:
+        return {"error": "Invalid GitHub URL"}
+
+    # Extract GitHub owner/repo
+    parts = repo_url.strip('/').split('/')
+    if len(parts) < 2:
+        return {"error": "Could not parse GitHub repo URL"}
+    owner, repo = parts[-2], parts[-1].replace(".git", "")
+
+    loop = asyncio.get_running_loop()
+    deadline = loop.time() + SMART_SUMMARY_TIMEOUT
+
+    def remaining() -> float:
+        return max(deadline - loop.time(), 0)
+
+    repo_task = asyncio.create_task(_fetch_repo(github, owner, repo))
+    languages_task = asyncio.create_task(_fetch_languages(github, owner, repo))
+    summary_task = asyncio.create_task(_summarize(github, openrouter, owner, repo))
+
+    try:
         try:
-            llm_data = json.loads(content)
-        except json.JSONDecodeError:
-            return {
-                "title": title,
-                "description": f"{title} is a GitHub project with {stars} stars and {forks} forks.",
-                "type": "github",
-                "stack": ["Unknown", "Unknown", "Unknown"],
-                "features": ["LLM output parsing failed"],
-                "stars": stars,
-                "forks": forks,
-                "link": homepage
-            }
+            repo_data = await asyncio.wait_for(repo_task, remaining())
+        except asyncio.TimeoutError:
+            return {"error": "GitHub did not respond in time"}
+
+        # Extract fields from GitHub
+        title = repo_data.get("name", "")
+        stars = repo_data.get("stargazers_count", 0)
+        forks = repo_data.get("forks_count", 0)
+        homepage = (repo_data.get("homepage") or "").strip()
+
+        try:
+            languages = await asyncio.wait_for(languages_task, remaining())
+        except (asyncio.TimeoutError, httpx.HTTPError, GitHubRateLimited):
+            languages = []
+
+        try:
+            llm_data = await asyncio.wait_for(summary_task, remaining())
+        except asyncio.TimeoutError:
+            return _fallback_summary(title, stars, forks, homepage, languages, "AI summary timed out")
 
+        if llm_data is None:
+            return _fallback_summary(title, stars, forks, homepage, languages, "LLM output parsing failed")
 
         # Final response formatting
         description = llm_data.get("description", "").strip()[:500]
         stack = llm_data.get("stack", [])[:3]
         if len(stack) < 3:
-            stack += [""] * (3 - len(stack))  # Ensure at least 3 items
+            # Ensure at least 3 items, preferring languages GitHub detected
+            stack += [lang for lang in languages if lang not in stack][:3 - len(stack)]
+            stack += [""] * (3 - len(stack))
         features = llm_data.get("features", [])[:3]
 
         return {
@@ -141,3 +211,9 @@ README:
 
     except Exception as e:
         return {"error": str(e)}
+    finally:
+        for task in (repo_task, languages_task, summary_task):
+            if not task.done():
+                task.cancel()
+            elif not task.cancelled():
+                task.exception()  # Mark failures we no longer care about as retrieved
@@ -0,0 +1,149 @@
+# app/crud/batch.py
+"""
+Batch create/update/delete for a user's portfolio rows (skills, projects,
+work experience, certificates, awards).
+
+A batch is applied in one transaction with one commit and one content
+version bump, using a single DELETE ... RETURNING, a single SELECT of
+the rows to update, and one flush for the updates and inserts. Items
+that fail validation, target a row the user does not own, or repeat an
+id are skipped and reported in `errors`; the rest is applied.
+
+BATCH_MAX_ITEMS bounds the total number of operations per request.
+"""
+import os
+from typing import Dict, List, Set, Tuple, Type
+
+from fastapi import HTTPException
+from pydantic import BaseModel, ValidationError
+from sqlalchemy import delete, select
+from sqlalchemy.orm import Session
+
+from app.crud.portfolio import commit_portfolio_change
+from app.schemas.batch import BatchItemError, BatchRequest
+
+BATCH_MAX_ITEMS = int(os.getenv("BATCH_MAX_ITEMS", "100"))
+
+
+def _validation_detail(error: ValidationError) -> List[dict]:
+    return [{"loc": list(item["loc"]), "msg": item["msg"]} for item in error.errors()]
+
+
+def apply_batch(
+    db: Session,
+    user,
+    model,
+    owner_column,
+    create_schema: Type[BaseModel],
+    update_schema: Type[BaseModel],
+    out_schema: Type[BaseModel],
+    batch: BatchRequest,
+) -> dict:
+    """
+    Apply `batch` to the rows of `model` owned by `user`.
+
+    Updates only change the fields present in each item. Deletes run
+    first; updating a row that is deleted in the same batch is an error.
+
+    Returns:
+        BatchResult fields: created and updated rows as `out_schema`,
+        deleted ids, per-item errors
+
+    Raises:
+        HTTPException: 413 if the batch has more than BATCH_MAX_ITEMS operations
+    """
+    total = len(batch.create) + len(batch.update) + len(batch.delete)
+    if total > BATCH_MAX_ITEMS:
+        raise HTTPException(
+            status_code=413,
+            detail=f"Too many operations in one batch: {total} (limit {BATCH_MAX_ITEMS})",
+        )
+
+    errors: List[BatchItemError] = []
+
+    # --- validate ---
+    deletes: List[Tuple[int, int]] = []
+    delete_ids: Set[int] = set()
+    for index, item_id in enumerate(batch.delete):
+        if item_id in delete_ids:
+            errors.append(BatchItemError(op="delete", index=index, id=item_id, detail="Duplicate id in batch"))
+            continue
+        delete_ids.add(item_id)
+        deletes.append((index, item_id))
+
+    # Validated against the current row once it is loaded
+    updates: List[Tuple[int, int, dict]] = []
+    update_ids: Set[int] = set()
+    for index, item in enumerate(batch.update):
+        fields = dict(item)
+        item_id = fields.pop("id", None)
+        if not isinstance(item_id, int) or isinstance(item_id, bool):
+            errors.append(BatchItemError(op="update", index=index, detail="Missing or invalid id"))
+            continue
+        if item_id in update_ids:
+            errors.append(BatchItemError(op="update", index=index, id=item_id, detail="Duplicate id in batch"))
+            continue
+        if item_id in delete_ids:
+            errors.append(BatchItemError(op="update", index=index, id=item_id, detail="Also deleted in this batch"))
+            continue
+        update_ids.add(item_id)
+        updates.append((index, item_id, fields))
+
+    creates: List[dict] = []
+    for index, item in enumerate(batch.create):
+        try:
+            creates.append(create_schema.model_validate(item).model_dump())
+        except ValidationError as e:
+            errors.append(BatchItemError(op="create", index=index, detail=_validation_detail(e)))
+
+    # --- apply ---
+    deleted: List[int] = []
+    if deletes:
+        result = db.execute(
+            delete(model)
+            .where(model.id.in_(delete_ids), owner_column == user.id)
+            .returning(model.id)
+        )
+        found = set(result.scalars().all())
+        for index, item_id in deletes:
+            if item_id in found:
+                deleted.append(item_id)
+            else:
+                errors.append(BatchItemError(op="delete", index=index, id=item_id, detail="Not found"))
+
+    updated_rows = []
+    if updates:
+        rows: Dict[int, object] = {
+            row.id: row
+            for row in db.scalars(select(model).where(model.id.in_(update_ids), owner_column == user.id))
+        }
+        for index, item_id, fields in updates:
+            row = rows.get(item_id)
+            if row is None:
+                errors.append(BatchItemError(op="update", index=index, id=item_id, detail="Not found"))
+                continue
+            # Validate the row as it will be, so required fields may be left out
+            current = {name: getattr(row, name) for name in update_schema.model_fields if hasattr(row, name)}
+            try:
+                values = update_schema.model_validate({**current, **fields}).model_dump()
+            except ValidationError as e:
+                errors.append(BatchItemError(op="update", index=index, id=item_id, detail=_validation_detail(e)))
+                continue
+            for key in fields.keys() & values.keys():
+                setattr(row, key, values[key])
+            updated_rows.append(row)
+
+    created_rows = [model(**values, **{owner_column.key: user.id}) for values in creates]
+    db.add_all(created_rows)
+
+    result = {"created": [], "updated": [], "deleted": deleted, "errors": errors}
+    if not (deleted or updated_rows or created_rows):
+        db.rollback()
+        return result
+
+    db.flush()
+    # Serialized before the commit expires the instances
+    result["created"] = [out_schema.model_validate(row, from_attributes=True) for row in created_rows]
+    result["updated"] = [out_schema.model_validate(row, from_attributes=True) for row in updated_rows]
+    commit_portfolio_change(db, user)
+    return result
@@ -0,0 +1,71 @@
+# app/crud/contact.py
+"""
+Contact message inbox queries.
+
+The inbox is paginated by keyset on (created_at, id), newest first: a
+page is the next `limit` messages strictly older than the cursor, read
+straight off ix_contact_messages_user_id_created_at_id, so deep pages
+cost the same as the first one (no OFFSET). The cursor is the position
+of the last message of a page, encoded as an opaque URL-safe string.
+"""
+import base64
+from datetime import datetime
+from typing import Optional, Tuple
+
+from sqlalchemy import func, select, tuple_
+
+from app.models.contact_message import ContactMessage
+
+Cursor = Tuple[datetime, int]
+
+
+def encode_cursor(created_at: datetime, message_id: int) -> str:
+    raw = f"{created_at.isoformat()}|{message_id}".encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> Cursor:
+    """Raises ValueError for anything encode_cursor() did not produce."""
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)).decode()
+        created_at, message_id = raw.rsplit("|", 1)
+        return datetime.fromisoformat(created_at), int(message_id)
+    except (ValueError, UnicodeDecodeError) as e:
+        raise ValueError("Invalid cursor") from e
+
+
+def inbox_statement(
+    user_id: int,
+    limit: int,
+    after: Optional[Cursor] = None,
+    since: Optional[datetime] = None,
+    until: Optional[datetime] = None,
+    unread_only: bool = False,
+):
+    """
+    One inbox page, newest first. `since` is inclusive, `until` exclusive.
+    Selects limit + 1 rows so the caller can tell whether a next page exists.
+    """
+    statement = select(ContactMessage).where(ContactMessage.user_id == user_id)
+    if after is not None:
+        statement = statement.where(tuple_(ContactMessage.created_at, ContactMessage.id) < after)
+    if since is not None:
+        statement = statement.where(ContactMessage.created_at >= since)
+    if until is not None:
+        statement = statement.where(ContactMessage.created_at < until)
+    if unread_only:
+        statement = statement.where(~ContactMessage.is_read)
+    return (
+        statement
+        .order_by(ContactMessage.created_at.desc(), ContactMessage.id.desc())
+        .limit(limit + 1)
+    )
+
+
+def unread_count_statement(user_id: int):
+    """Index-only scan of the partial ix_contact_messages_user_id_unread."""
+    return (
+        select(func.count())
+        .select_from(ContactMessage)
+        .where(ContactMessage.user_id == user_id, ~ContactMessage.is_read)
+    )
@@ -0,0 +1,180 @@
+from sqlalchemy import select, update, func, literal_column
+from sqlalchemy.dialects.postgresql import JSON, aggregate_order_by
+from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
+from app import models
+from app.models.user import username_key
+from app.utils.portfolio_cache import invalidate_portfolio
+from app.utils.user_cache import invalidate_user
+
+
+def _child_rows(model, owner_column):
+    """
+    Correlated subquery that aggregates every row of `model` owned by the
+    outer user into a JSON array (ordered by id, empty array when none).
+    """
+    table = model.__table__
+    return (
+        select(
+            func.coalesce(
+                func.json_agg(aggregate_order_by(table.table_valued(), table.c.id)),
+                literal_column("'[]'::json"),
+                type_=JSON,
+            )
+        )
+        .where(owner_column == models.User.id)
+        .scalar_subquery()
+    )
+
+
+def _portfolio_statement():
+    profile_table = models.Profile.__table__
+    profile = (
+        select(func.row_to_json(profile_table.table_valued(), type_=JSON))
+        .where(profile_table.c.user_id == models.User.id)
+        .limit(1)
+        .scalar_subquery()
+    )
+    return select(
+        models.User,
+        profile.label("profile"),
+        _child_rows(models.Project, models.Project.owner_id).label("projects"),
+        _child_rows(models.Skill, models.Skill.user_id).label("skills"),
+        _child_rows(models.Certificate, models.Certificate.user_id).label("certificates"),
+        _child_rows(models.WorkExperience, models.WorkExperience.user_id).label("work_experience"),
+        _child_rows(models.Award, models.Award.user_id).label("awards"),
+    )
+
+
+async def load_portfolio_by_username(db: AsyncSession, username: str):
+    """
+    Load a user and their whole portfolio in a single round trip.
+    Username matching is case-insensitive.
+
+    Returns a row with `User` (ORM instance), `profile` (dict or None) and
+    `projects`, `skills`, `certificates`, `work_experience`, `awards` (lists of dicts),
+    or None if the user does not exist.
+    """
+    stmt = _portfolio_statement().where(username_key(username))
+    return (await db.execute(stmt)).first()
+
+
+async def get_portfolio_version(db: AsyncSession, username: str):
+    """
+    Cheap indexed lookup of the fields needed for conditional requests:
+    (id, username, is_public, content_version), or None if the user does not exist.
+    """
+    result = await db.execute(
+        select(
+            models.User.id,
+            models.User.username,
+            models.User.is_public,
+            models.User.content_version,
+        ).where(username_key(username))
+    )
+    return result.first()
+
+
+def portfolio_etag(user_id: int, content_version: int) -> str:
+    """Strong ETag for a user's public portfolio at a given content version."""
+    return f'"{user_id}-{content_version}"'
+
+
+async def load_portfolio_by_user_id(db: AsyncSession, user_id: int):
+    """Same as load_portfolio_by_username, keyed by user id."""
+    stmt = _portfolio_statement().where(models.User.id == user_id)
+    return (await db.execute(stmt)).first()
+
+
+def build_portfolio_sections(portfolio) -> dict:
+    """
+    Build the projects / achievements / certificates / skills part of the
+    frontend portfolio object from a loaded portfolio row.
+    """
+    return {
+        "projects": [
+            {
+                "id": p["id"],
+                "title": p["title"],
+                "description": p["description"] or "",
+                "image": p["link"] or "https://via.placeholder.com/400x250",
+                "tech": p["stack"] if isinstance(p["stack"], list) else (p["stack"].split(",") if p["stack"] else []),
+                "features": p["features"].split(",") if isinstance(p["features"], str) else (p["features"] or []),
+                "stars": p["stars"] or 0,
+                "forks": p["forks"] or 0,
+                "demo": p["link"],
+                "repo": p["link"],
+                "featured": False
+            }
+            for p in portfolio.projects
+        ],
+
+        "achievements": [
+            {
+                "title": w["title"],
+                "issuer": w["organization"],
+                "date": w["duration"],
+                "type": w["status"] or "internship",
+                "description": w["description"] or ""
+            }
+            for w in portfolio.work_experience
+        ] + [
+            {
+                "title": a["title"],
+                "issuer": a["organization"],
+                "date": a["year"],
+                "type": a["category"] or "award",
+                "description": a["description"] or ""
+            }
+            for a in portfolio.awards
+        ],
+
+        "certificates": [
+            {
+                "title": c["title"],
+                "issuer": c["description"] or "Unknown",
+                "date": c["year"],
+                "credentialId": c["credential_id"]
+            }
+            for c in portfolio.certificates
+        ],
+
+        "skills": [
+            {
+                "name": s["name"],
+                "level": s["level"],
+                "category": s["category"]
+            }
+            for s in portfolio.skills
+        ]
+    }
+
+
+def commit_portfolio_change(db: Session, user) -> None:
+    """
+    Commit a change to a user's portfolio data, bumping their content
+    version and dropping their cached public snapshot and user row.
+    Use instead of db.commit() in every mutating route.
+    """
+    # Read before the commit expires an ORM user, which would cost a reload
+    user_id, username = user.id, user.username
+    db.execute(
+        update(models.User)
+        .where(models.User.id == user_id)
+        .values(content_version=models.User.content_version + 1)
+    )
+    db.commit()
+    invalidate_portfolio(username)
+    invalidate_user(user_id)
+
+
+async def commit_portfolio_change_async(db: AsyncSession, user) -> None:
+    """Same as commit_portfolio_change, for async sessions."""
+    await db.execute(
+        update(models.User)
+        .where(models.User.id == user.id)
+        .values(content_version=models.User.content_version + 1)
+    )
+    await db.commit()
+    invalidate_portfolio(user.username)
+    invalidate_user(user.id)
@@ -1,13 +1,14 @@
 from sqlalchemy.orm import Session
 from app import models, schemas
 from app.schemas.profile import ProfileUpdate
+from app.crud.portfolio import commit_portfolio_change
+from app.crud.writes import insert_returning, update_returning
+from app.utils.avatar_store import is_data_url, decode_data_url, save_avatar, avatar_url
 
 def get_profile_by_user(db: Session, user_id: int):
     return db.query(models.Profile).filter(models.Profile.user_id == user_id).first()
 
-def create_or_update_profile(db: Session, user_id: int, profile_data: ProfileUpdate):
-    profile = get_profile_by_user(db, user_id)
-    
+def create_or_update_profile(db: Session, user: models.User, profile_data: ProfileUpdate, base_url: str = ""):
     # Extract User model fields (privacy settings)
     user_fields = {}
     profile_fields = profile_data.dict(exclude_unset=True)
@@ -17,21 +18,19 @@ def create_or_update_profile(db: Session, user_id: int, profile_data: ProfileUpd
         if field in profile_fields:
             user_fields[field] = profile_fields.pop(field)
     
-    # Update User model fields (single query optimization)
-    if user_fields:
-        user = db.query(models.User).filter(models.User.id == user_id).first()
-        if user:
-            for key, value in user_fields.items():
-                setattr(user, key, value)
+    # Inline base64 avatars go to the avatar store; the profile keeps only the URL
+    if is_data_url(profile_fields.get("avatar")):
+        digest = save_avatar(decode_data_url(profile_fields["avatar"]))
+        profile_fields["avatar"] = avatar_url(digest, base_url=base_url)
+    
+    # Update User model fields on the already loaded user
+    for key, value in user_fields.items():
+        setattr(user, key, value)
     
-    # Update or create Profile
-    if profile:
-        for key, value in profile_fields.items():
-            setattr(profile, key, value)
-    else:
-        profile = models.Profile(user_id=user_id, **profile_fields)
-        db.add(profile)
+    # Update or create Profile; the existing-profile case is a single UPDATE ... RETURNING
+    profile = update_returning(db, models.Profile, (models.Profile.user_id == user.id,), profile_fields)
+    if profile is None:
+        profile = insert_returning(db, models.Profile, {**profile_fields, "user_id": user.id})
     
-    db.commit()
-    db.refresh(profile)
+    commit_portfolio_change(db, user)
     return profile
@@ -0,0 +1,160 @@
+# app/crud/resume_merge.py
+"""
+Set-based merge of confirmed resume data into a user's portfolio.
+
+The existing keys of every section are loaded in one UNION ALL query,
+approved items are deduplicated in memory against them (and against
+each other) on normalized keys, and each section's new rows go in with
+a single multi-row INSERT. A resume costs at most six statements
+regardless of how many items it has.
+
+Keys are compared case- and whitespace-insensitively:
+- work experience: title + organization
+- projects, certifications, achievements: title
+- skills: name
+"""
+from typing import Callable, Dict, List, NamedTuple, Optional, Set, Tuple
+
+from sqlalchemy import insert, literal, null, select, union_all
+from sqlalchemy.orm import Session
+
+from app.models.project import Project
+from app.models.skills import Skill
+from app.models.awards import Award
+from app.models.work_experience import WorkExperience
+from app.models.certificates import Certificate
+from app.schemas.resume import ResumeExtractedData
+
+Key = Tuple[str, ...]
+
+
+def normalize_key(*values: Optional[str]) -> Key:
+    """'  React   Dashboard ' and 'react dashboard' -> ('react dashboard',)."""
+    return tuple(" ".join((value or "").split()).lower() for value in values)
+
+
+class MergeSection(NamedTuple):
+    model: type
+    owner_column: object
+    key_columns: tuple
+    # ResumeExtractedData list field
+    field: str
+    item_key: Callable[[object], Key]
+    to_row: Callable[[object], dict]
+
+
+MERGE_SECTIONS: Dict[str, MergeSection] = {
+    "work_experience": MergeSection(
+        WorkExperience, WorkExperience.user_id, (WorkExperience.title, WorkExperience.organization),
+        "work_experience",
+        lambda item: normalize_key(item.title, item.company),
+        lambda item: {
+            "title": item.title,
+            "organization": item.company,
+            "duration": item.duration,
+            "location": item.location,
+            "description": item.description,
+        },
+    ),
+    "projects": MergeSection(
+        Project, Project.owner_id, (Project.title,),
+        "projects",
+        lambda item: normalize_key(item.title),
+        lambda item: {
+            "title": item.title,
+            "description": item.description,
+            "type": "resume",  # Mark as imported from resume
+            "stack": item.tech,
+            "features": item.features,
+            "stars": 0,
+            "forks": 0,
+            "link": "",
+            "imported": True,
+            "ai_summary": True,
+            "saved": True,
+        },
+    ),
+    "skills": MergeSection(
+        Skill, Skill.user_id, (Skill.name,),
+        "skills",
+        lambda item: normalize_key(item.name),
+        lambda item: {
+            "name": item.name,
+            "category": item.category.value,
+            "level": item.level.value,
+            "experience": "",  # TODO: Could be inferred from resume
+        },
+    ),
+    "certifications": MergeSection(
+        Certificate, Certificate.user_id, (Certificate.title,),
+        "certifications",
+        lambda item: normalize_key(item.name),
+        lambda item: {
+            "title": item.name,
+            "issuer": item.issuer,
+            "year": item.year,
+            "description": item.description,
+            "credential_id": "",  # Resume might not have this
+        },
+    ),
+    "achievements": MergeSection(
+        Award, Award.user_id, (Award.title,),
+        "achievements",
+        lambda item: normalize_key(item.title),
+        lambda item: {
+            "title": item.title,
+            "organization": item.issuer,
+            "year": item.date,
+            "description": item.description,
+            "category": item.type,
+        },
+    ),
+}
+
+
+def existing_keys_statement(user_id: int):
+    """(section, k0, k1) rows of everything the user already has, across all sections."""
+    width = max(len(section.key_columns) for section in MERGE_SECTIONS.values())
+    selects = []
+    for name, section in MERGE_SECTIONS.items():
+        columns = list(section.key_columns) + [null()] * (width - len(section.key_columns))
+        selects.append(
+            select(literal(name).label("section"), *(column.label(f"k{i}") for i, column in enumerate(columns)))
+            .where(section.owner_column == user_id)
+        )
+    return union_all(*selects)
+
+
+def load_existing_keys(db: Session, user_id: int) -> Dict[str, Set[Key]]:
+    """Normalized keys of everything the user already has, per section, in one query."""
+    existing: Dict[str, Set[Key]] = {name: set() for name in MERGE_SECTIONS}
+    for row in db.execute(existing_keys_statement(user_id)):
+        section = MERGE_SECTIONS[row.section]
+        existing[row.section].add(normalize_key(*row[1:1 + len(section.key_columns)]))
+    return existing
+
+
+def merge_resume_sections(db: Session, user_id: int, approved_data: ResumeExtractedData) -> Dict[str, int]:
+    """
+    Insert the approved items the user does not have yet. Does not commit.
+
+    Returns:
+        Number of rows actually inserted per MERGE_SECTIONS name
+    """
+    existing = load_existing_keys(db, user_id)
+    added: Dict[str, int] = {}
+
+    for name, section in MERGE_SECTIONS.items():
+        seen = existing[name]
+        rows: List[dict] = []
+        for item in getattr(approved_data, section.field):
+            key = section.item_key(item)
+            if not any(key) or key in seen:
+                continue
+            seen.add(key)
+            rows.append({**section.to_row(item), section.owner_column.key: user_id})
+
+        if rows:
+            db.execute(insert(section.model).values(rows))
+        added[name] = len(rows)
+    return added
@@ -0,0 +1,42 @@
+# app/crud/writes.py
+"""
+Single-statement writes that return the written row.
+
+The ORM pattern `db.add(obj); db.commit(); db.refresh(obj)` costs an
+INSERT/UPDATE plus a SELECT (and for updates a SELECT first to load the
+object). These helpers issue one INSERT/UPDATE ... RETURNING and hand
+back the row as a plain dict, which response models accept as-is and
+which is not expired by the following commit.
+
+Nothing here commits; call commit_portfolio_change() (or db.commit())
+afterwards. Python-side column defaults (e.g. Project.last_updated)
+still apply.
+"""
+from typing import Optional
+
+from sqlalchemy import insert, select, update
+from sqlalchemy.orm import Session
+
+
+def _columns(model):
+    return list(model.__table__.c)
+
+
+def insert_returning(db: Session, model, values: dict) -> dict:
+    """INSERT one row; returns all its columns."""
+    row = db.execute(insert(model).values(**values).returning(*_columns(model))).mappings().one()
+    return dict(row)
+
+
+def update_returning(db: Session, model, where, values: dict) -> Optional[dict]:
+    """
+    UPDATE the row matching `where` (e.g. id and owner); returns all its
+    columns, or None if no row matched. An empty `values` only reads the row.
+    """
+    if values:
+        statement = update(model).where(*where).values(**values).returning(*_columns(model))
+    else:
+        statement = select(*_columns(model)).where(*where)
+    row = db.execute(statement).mappings().first()
+    return dict(row) if row is not None else None
+
@@ -1,17 +1,36 @@
 from sqlalchemy import create_engine
+from sqlalchemy.engine import make_url
 from sqlalchemy.orm import sessionmaker, declarative_base
+from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker, AsyncSession
 import os
 from dotenv import load_dotenv
+from app.utils.pool_stats import InstrumentedQueuePool, InstrumentedAsyncQueuePool, instrument_engine
 
 load_dotenv()  # Load environment variables from .env file
 
 DATABASE_URL = os.getenv("DATABASE_URL")
 
+# The only place engines are created; app.utils.database re-exports these.
+# Pool settings apply to the sync and the async engine each.
+DB_POOL_SIZE = int(os.getenv("DB_POOL_SIZE", "5"))
+DB_MAX_OVERFLOW = int(os.getenv("DB_MAX_OVERFLOW", "10"))
+DB_POOL_TIMEOUT = float(os.getenv("DB_POOL_TIMEOUT", "30"))  # seconds waiting for a free connection
+DB_POOL_RECYCLE = int(os.getenv("DB_POOL_RECYCLE", "300"))   # seconds
+
+POOL_OPTIONS = dict(
+    pool_pre_ping=True,      # ⭐ IMPORTANT
+    pool_recycle=DB_POOL_RECYCLE,
+    pool_size=DB_POOL_SIZE,
+    max_overflow=DB_MAX_OVERFLOW,
+    pool_timeout=DB_POOL_TIMEOUT,
+)
+
 engine = create_engine(
     DATABASE_URL,
-    pool_pre_ping=True,      # ⭐ IMPORTANT
-    pool_recycle=300,        # ⭐ IMPORTANT (5 min)
+    poolclass=InstrumentedQueuePool,
+    **POOL_OPTIONS,
 )
+instrument_engine(engine)
 
 SessionLocal = sessionmaker(
     autocommit=False,
@@ -19,6 +38,34 @@ SessionLocal = sessionmaker(
     bind=engine,
 )
 
+
+def _async_database_url(url: str):
+    """
+    Same database through the asyncpg driver. asyncpg takes `ssl` instead of
+    libpq's `sslmode` and does not understand `channel_binding`.
+    """
+    async_url = make_url(url).set(drivername="postgresql+asyncpg")
+    query = dict(async_url.query)
+    if "sslmode" in query:
+        query["ssl"] = query.pop("sslmode")
+    query.pop("channel_binding", None)
+    return async_url.set(query=query)
+
+
+async_engine = create_async_engine(
+    _async_database_url(DATABASE_URL),
+    poolclass=InstrumentedAsyncQueuePool,
+    **POOL_OPTIONS,
+)
+instrument_engine(async_engine.sync_engine)
+
+AsyncSessionLocal = async_sessionmaker(
+    bind=async_engine,
+    autoflush=False,
+    expire_on_commit=False,
+    class_=AsyncSession,
+)
+
 Base = declarative_base()
 
 def get_db():
@@ -27,3 +74,9 @@ def get_db():
         yield db
     finally:
         db.close()   # 🔥 THIS WAS MISSING OR NOT EXECUTING
+
+
+async def get_async_db():
+    """Async session for routes that should not block the event loop on DB I/O."""
+    async with AsyncSessionLocal() as db:
+        yield db
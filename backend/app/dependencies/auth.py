@@ -1,33 +1,9 @@
-from fastapi import Depends, HTTPException, status
-from fastapi.security import OAuth2PasswordBearer
-from jose import JWTError, jwt
-from app.schemas.token import TokenData
-from app.database import get_db
-from app.models import user as models
-from sqlalchemy.orm import Session
-import os
-
-oauth2_scheme = OAuth2PasswordBearer(tokenUrl="/login")  # This will be used in Swagger UI
-
-SECRET_KEY = os.getenv("SECRET_KEY")
-ALGORITHM = "HS256"
-
-def get_current_user(token: str = Depends(oauth2_scheme), db: Session = Depends(get_db)):
-    credentials_exception = HTTPException(
-        status_code=status.HTTP_401_UNAUTHORIZED,
-        detail="Could not validate credentials",
-        headers={"WWW-Authenticate": "Bearer"},
-    )
-    try:
-        payload = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
-        email: str = payload.get("sub")
-        if email is None:
-            raise credentials_exception
-        token_data = TokenData(email=email)
-    except JWTError:
-        raise credentials_exception
-
-    user = db.query(models.User).filter(models.User.email == token_data.email).first()
-    if user is None:
-        raise credentials_exception
-    return user
+# Kept for existing imports; authentication lives in app.dependencies.auth_user
+from app.dependencies.auth_user import (
+    CurrentPrincipal,
+    get_current_principal,
+    get_current_user,
+    oauth2_scheme,
+)
+
+__all__ = ["CurrentPrincipal", "get_current_principal", "get_current_user", "oauth2_scheme"]
@@ -1,31 +1,56 @@
 # app/dependencies/auth_user.py
+from typing import NamedTuple
 from fastapi import Depends, HTTPException
 from fastapi.security import OAuth2PasswordBearer
 from jose import jwt, JWTError
 from sqlalchemy.orm import Session
 from ..models.user import User
 from ..utils.auth import SECRET_KEY, ALGORITHM
+from ..utils.user_cache import get_user, user_exists
 from app.database import get_db
 
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="login")
 
-def get_current_user(
-    token: str = Depends(oauth2_scheme),
-    db: Session = Depends(get_db),
-):
+
+class CurrentPrincipal(NamedTuple):
+    """The authenticated user as described by the access token claims."""
+    id: int
+    email: str
+    username: str
+
+
+def get_current_principal(token: str = Depends(oauth2_scheme)) -> CurrentPrincipal:
+    """
+    Authenticate from the token claims. Enough for routes that only scope
+    queries by user id. The only database access is a cached existence
+    check, so tokens of a deleted account get a 401 rather than write access.
+    """
     try:
         payload = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
-        email = payload.get("sub")
+    except JWTError:
+        raise HTTPException(status_code=401, detail="Invalid token")
 
-        if not email:
-            raise HTTPException(status_code=401, detail="Invalid token")
+    email = payload.get("sub")
+    user_id = payload.get("uid")
 
-        user = db.query(User).filter(User.email == email).first()
+    # Tokens issued before `uid` was added must be refreshed by logging in again
+    if not email or not isinstance(user_id, int):
+        raise HTTPException(status_code=401, detail="Invalid token")
 
-        if not user:
-            raise HTTPException(status_code=401, detail="User not found")
+    if not user_exists(user_id):
+        raise HTTPException(status_code=401, detail="User not found")
 
-        return user
+    return CurrentPrincipal(id=user_id, email=email, username=payload.get("username") or "")
 
-    except JWTError:
-        raise HTTPException(status_code=401, detail="Invalid token")
+
+def get_current_user(
+    principal: CurrentPrincipal = Depends(get_current_principal),
+    db: Session = Depends(get_db),
+):
+    """Full User row for routes that need more than the token claims (cached briefly)."""
+    user = get_user(db, principal.id)
+
+    if not user:
+        raise HTTPException(status_code=401, detail="User not found")
+
+    return user
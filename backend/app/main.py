@@ -1,3 +1,4 @@
+from contextlib import asynccontextmanager
 from fastapi import FastAPI, Request, Response
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.middleware.trustedhost import TrustedHostMiddleware
@@ -5,6 +6,9 @@ from fastapi.middleware.httpsredirect import HTTPSRedirectMiddleware
 from fastapi.responses import JSONResponse
 from slowapi.errors import RateLimitExceeded
 from app.utils.limiter import limiter
+from app.utils.password_hasher import PasswordHasherBusy
+from app.utils import http_clients
+from app.utils import resume_jobs
 import os
 
 # Routers
@@ -22,16 +26,30 @@ from app.api.v1.routes import (
     resume,
     ai,
     contact,
+    avatar,
 )
 
 # Models (force registration)
 from app.models.user import User
 from app.models.project import Project
 
+# ─────────────────────────────────────────────
+# LIFESPAN (SHARED OUTBOUND HTTP CLIENTS, RESUME WORKERS)
+# ─────────────────────────────────────────────
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    app.state.http_clients = await http_clients.start()
+    await resume_jobs.expire_stale_jobs_on_startup()
+    try:
+        yield
+    finally:
+        await http_clients.close()
+        resume_jobs.shutdown_process_pool()
+
 # ─────────────────────────────────────────────
 # CREATE APP (ONLY ONCE)
 # ─────────────────────────────────────────────
-app = FastAPI()
+app = FastAPI(lifespan=lifespan)
 app.state.limiter = limiter
 
 # ─────────────────────────────────────────────
@@ -65,6 +83,8 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    # Inbox pagination cursor (GET /api/contact/messages)
+    expose_headers=["X-Next-Cursor"],
 )
 
 # ─────────────────────────────────────────────
@@ -95,6 +115,14 @@ async def rate_limit_handler(request: Request, exc: RateLimitExceeded):
         content={"detail": "Too many requests. Please try again later."},
     )
 
+@app.exception_handler(PasswordHasherBusy)
+async def password_hasher_busy_handler(request: Request, exc: PasswordHasherBusy):
+    return JSONResponse(
+        status_code=503,
+        content={"detail": "Server is busy. Please try again shortly."},
+        headers={"Retry-After": "1"},
+    )
+
 # ─────────────────────────────────────────────
 # ROUTERS
 # ─────────────────────────────────────────────
@@ -110,3 +138,4 @@ app.include_router(preview.router)
 app.include_router(portfolio.router)
 app.include_router(resume.router, tags=["Resumes"])
 app.include_router(contact.router)
+app.include_router(avatar.router)
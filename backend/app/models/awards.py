@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, Text, ForeignKey
+from sqlalchemy import Column, Integer, String, Text, ForeignKey, Index
 from sqlalchemy.dialects.postgresql import ARRAY
 from sqlalchemy.orm import relationship
 from app.utils.database import Base
@@ -17,3 +17,7 @@ class Award(Base):
 
     owner = relationship("User", back_populates="awards")
 
+    __table_args__ = (
+        Index("ix_awards_user_id_title", user_id, title),
+    )
+
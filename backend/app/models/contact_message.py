@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, Text, ForeignKey, DateTime
+from sqlalchemy import Column, Integer, String, Text, Boolean, ForeignKey, DateTime, Index, text
 from sqlalchemy.sql import func
 from app.utils.database import Base
 
@@ -6,8 +6,16 @@ class ContactMessage(Base):
     __tablename__ = "contact_messages"
 
     id = Column(Integer, primary_key=True, index=True)
-    user_id = Column(Integer, ForeignKey("users.id"), nullable=False)
+    user_id = Column(Integer, ForeignKey("user.id", ondelete="CASCADE"), nullable=False)
     name = Column(String, nullable=False)
     email = Column(String, nullable=False)
     message = Column(Text, nullable=False)
-    created_at = Column(DateTime(timezone=True), server_default=func.now())
+    created_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
+    is_read = Column(Boolean, default=False, server_default="false", nullable=False)
+
+    __table_args__ = (
+        # Inbox pages, newest first; id breaks ties between equal timestamps
+        Index("ix_contact_messages_user_id_created_at_id", user_id, created_at.desc(), id.desc()),
+        # Unread count, answered from the index alone
+        Index("ix_contact_messages_user_id_unread", user_id, postgresql_where=text("NOT is_read")),
+    )
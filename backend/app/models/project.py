@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, ForeignKey, DateTime, Boolean, ARRAY
+from sqlalchemy import Column, Integer, String, ForeignKey, DateTime, Boolean, ARRAY, Index, text
 from sqlalchemy.orm import relationship
 from datetime import datetime
 from app.utils.database import Base
@@ -15,6 +15,8 @@ class Project(Base):
     stars = Column(Integer, default=0)
     forks = Column(Integer, default=0)
     link = Column(String)
+    # "owner/name" of the source repository, for type "github"
+    github_repo = Column(String, nullable=True)
     
     imported = Column(Boolean, default=False)
     ai_summary = Column(Boolean, default=False)
@@ -24,3 +26,14 @@ class Project(Base):
     owner_id = Column(Integer, ForeignKey("user.id"))
 
     owner = relationship("User", back_populates="projects")
+
+    __table_args__ = (
+        # Owner's project list; title for dedup on resume/GitHub import
+        Index("ix_project_owner_id_title", owner_id, title),
+        # Stale-project scan of the stars/forks refresher, in its NULLS FIRST order
+        Index(
+            "ix_project_github_stale",
+            last_updated.asc().nullsfirst(),
+            postgresql_where=text("type = 'github'"),
+        ),
+    )
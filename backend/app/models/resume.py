@@ -1,5 +1,5 @@
 # app/models/resume.py
-from sqlalchemy import Column, Integer, String, Text, Boolean, DateTime, ForeignKey, JSON
+from sqlalchemy import Column, Integer, String, Text, Boolean, DateTime, ForeignKey, JSON, Index
 from sqlalchemy.orm import relationship
 from app.utils.database import Base
 from datetime import datetime
@@ -15,7 +15,15 @@ class Resume(Base):
     extracted_text = Column(Text)  # Raw text extracted from file
     parsed_data = Column(JSON)  # AI-parsed structured data
     is_saved = Column(Boolean, default=False, nullable=False)
+    # Background parsing job state: queued -> processing -> completed | failed
+    status = Column(String, default="queued", server_default="completed", nullable=False)
+    error = Column(Text, nullable=True)  # User-facing reason when status is 'failed'
     created_at = Column(DateTime, default=datetime.utcnow)
     updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
     
     owner = relationship("User", backref="resumes")
+
+    __table_args__ = (
+        # History and current draft, newest first
+        Index("ix_resumes_owner_id_created_at", owner_id, created_at.desc()),
+    )
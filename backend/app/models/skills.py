@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, ForeignKey
+from sqlalchemy import Column, Integer, String, ForeignKey, Index
 from sqlalchemy.orm import relationship
 from app.utils.database import Base
 
@@ -13,3 +13,7 @@ class Skill(Base):
     
     user_id = Column(Integer, ForeignKey("user.id"))  # associate skill to a user
     user = relationship("User", back_populates="skills")
+
+    __table_args__ = (
+        Index("ix_skills_user_id_name", user_id, name),
+    )
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, Boolean, DateTime
+from sqlalchemy import Column, Integer, String, Boolean, DateTime, Index, func
 from app.utils.database import Base
 from sqlalchemy.orm import relationship
 
@@ -7,6 +7,7 @@ class User(Base):
     __tablename__ = "user"
     id = Column(Integer, primary_key=True, index=True)
     username = Column(String, nullable=False, unique=True, index=True)
+    # Case-insensitive lookups must filter on username_key(...) to use ix_user_username_lower
     full_name = Column(String, nullable=False)  # keep original case
     email = Column(String, unique=True, index=True)
     hashed_password = Column(String)
@@ -15,6 +16,8 @@ class User(Base):
     is_public = Column(Boolean, default=True, nullable=False)
     theme_preference = Column(String, default="classic", nullable=True)
     analytics_enabled = Column(Boolean, default=False, nullable=False)
+    # Bumped on every portfolio mutation; drives public portfolio ETags
+    content_version = Column(Integer, default=1, server_default="1", nullable=False)
 
     # Password reset fields
     reset_token = Column(String, nullable=True, index=True)
@@ -31,4 +34,16 @@ class User(Base):
     certificates = relationship("Certificate", back_populates="owner")
     awards = relationship("Award", back_populates="owner")
     skills = relationship("Skill", back_populates="user")
-    profile = relationship("Profile", back_populates="user", uselist=False)
\ No newline at end of file
+    profile = relationship("Profile", back_populates="user", uselist=False)
+
+    __table_args__ = (
+        Index("ix_user_username_lower", func.lower(username), unique=True),
+    )
+
+
+def username_key(username: str):
+    """
+    Case-insensitive username predicate matching the lower(username)
+    functional index, e.g. db.query(User).filter(username_key("JohnDoe")).
+    """
+    return func.lower(User.username) == username.lower()
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, Text, ForeignKey
+from sqlalchemy import Column, Integer, String, Text, ForeignKey, Index
 from sqlalchemy.dialects.postgresql import ARRAY
 from sqlalchemy.orm import relationship
 from app.utils.database import Base
@@ -17,3 +17,7 @@ class WorkExperience(Base):
     skills = Column(ARRAY(String))  # PostgreSQL Array for skills
     status = Column(String, nullable=True)
     owner = relationship("User", back_populates="work_experiences")
+
+    __table_args__ = (
+        Index("ix_work_experience_user_id_title", user_id, title),
+    )
@@ -0,0 +1,30 @@
+from pydantic import BaseModel
+from typing import Any, Dict, Generic, List, Optional, TypeVar
+
+T = TypeVar("T")
+
+
+class BatchRequest(BaseModel):
+    """
+    Create, update and delete operations applied in one transaction.
+    Items are validated one by one so a bad item is reported in `errors`
+    instead of failing the whole batch.
+    """
+    create: List[Dict[str, Any]] = []
+    # Each item carries its "id" plus the fields to change
+    update: List[Dict[str, Any]] = []
+    delete: List[int] = []
+
+
+class BatchItemError(BaseModel):
+    op: str  # "create", "update" or "delete"
+    index: int  # Position in that operation's list
+    id: Optional[int] = None
+    detail: Any
+
+
+class BatchResult(BaseModel, Generic[T]):
+    created: List[T] = []
+    updated: List[T] = []
+    deleted: List[int] = []
+    errors: List[BatchItemError] = []
@@ -23,6 +23,19 @@ class SkillCategory(str, Enum):
     OTHER = "Other"
 
 
+_CATEGORY_BY_VALUE = {category.value.lower(): category for category in SkillCategory}
+
+# Checked in order; generic programming/tools words fall through to Other
+_CATEGORY_KEYWORDS = (
+    (('react', 'vue', 'angular', 'html', 'css', 'javascript', 'typescript', 'ui', 'ux', 'web dev', 'frontend'), SkillCategory.FRONTEND),
+    (('python', 'java', 'node', 'django', 'flask', 'spring', 'api', 'backend', 'server'), SkillCategory.BACKEND),
+    (('docker', 'kubernetes', 'ci/cd', 'jenkins', 'devops', 'deployment'), SkillCategory.DEVOPS),
+    (('sql', 'mongodb', 'postgres', 'mysql', 'redis', 'database', 'db'), SkillCategory.DATABASE),
+    (('aws', 'azure', 'gcp', 'cloud', 'heroku'), SkillCategory.CLOUD),
+    (('ai', 'ml', 'machine learning', 'tensorflow', 'pytorch', 'nlp', 'data science'), SkillCategory.AI_ML),
+)
+
+
 class ProjectExtracted(BaseModel):
     """Extracted project data from resume."""
     title: str
@@ -63,28 +76,22 @@ class SkillExtracted(BaseModel):
     @classmethod
     def normalize_category(cls, v):
         """Normalize skill category to match enum values."""
+        if isinstance(v, SkillCategory):
+            return v
         if isinstance(v, str):
             v_lower = v.lower()
-            
+
+            # The prompts ask for the enum values, so this is the usual case
+            exact = _CATEGORY_BY_VALUE.get(v_lower.strip())
+            if exact is not None:
+                return exact
+
             # Map common variations to our enum values
-            if any(word in v_lower for word in ['react', 'vue', 'angular', 'html', 'css', 'javascript', 'typescript', 'ui', 'ux', 'web dev', 'frontend']):
-                return SkillCategory.FRONTEND
-            elif any(word in v_lower for word in ['python', 'java', 'node', 'django', 'flask', 'spring', 'api', 'backend', 'server']):
-                return SkillCategory.BACKEND
-            elif any(word in v_lower for word in ['docker', 'kubernetes', 'ci/cd', 'jenkins', 'devops', 'deployment']):
-                return SkillCategory.DEVOPS
-            elif any(word in v_lower for word in ['sql', 'mongodb', 'postgres', 'mysql', 'redis', 'database', 'db']):
-                return SkillCategory.DATABASE
-            elif any(word in v_lower for word in ['aws', 'azure', 'gcp', 'cloud', 'heroku']):
-                return SkillCategory.CLOUD
-            elif any(word in v_lower for word in ['ai', 'ml', 'machine learning', 'tensorflow', 'pytorch', 'nlp', 'data science']):
-                return SkillCategory.AI_ML
-            elif any(word in v_lower for word in ['programming', 'language', 'tool', 'framework']):
-                # Generic programming/tools -> map to Other
-                return SkillCategory.OTHER
-            else:
-                # Default to Other for unrecognized categories
-                return SkillCategory.OTHER
+            for keywords, category in _CATEGORY_KEYWORDS:
+                if any(word in v_lower for word in keywords):
+                    return category
+            # Default to Other for unrecognized categories
+            return SkillCategory.OTHER
         return v
 
 
@@ -148,6 +155,16 @@ class ResumeUploadResponse(BaseModel):
     message: str
 
 
+class ResumeJobOut(BaseModel):
+    """Status of a background resume parsing job (job id is the resume id)."""
+    job_id: int
+    resume_id: int
+    status: str  # 'queued', 'processing', 'completed' or 'failed'
+    extracted_data: Optional[ResumeExtractedData] = None
+    error: Optional[str] = None
+    message: str = ""
+
+
 class ResumeConfirmRequest(BaseModel):
     """Request to confirm and save resume data to portfolio."""
     resume_id: int
@@ -162,6 +179,8 @@ class ResumeOut(BaseModel):
     file_type: str
     parsed_data: Optional[dict] = None
     is_saved: bool
+    status: str
+    error: Optional[str] = None
     created_at: datetime
     updated_at: datetime
     
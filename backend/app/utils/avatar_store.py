@@ -0,0 +1,182 @@
+# app/utils/avatar_store.py
+"""
+Content-addressed avatar image store.
+
+Uploaded images are decoded with Pillow, resized to WebP variants and stored
+under the SHA-256 of the original bytes, so identical uploads share storage
+and the stored files never change (safe to cache forever). Profiles keep only
+the resulting URL instead of inline base64 data.
+
+Backends:
+- local disk under AVATAR_STORAGE_DIR (default)
+- S3-compatible bucket when AVATAR_S3_BUCKET is set and boto3 is installed
+"""
+import os
+import re
+import base64
+import hashlib
+import logging
+from io import BytesIO
+from pathlib import Path
+from typing import Iterator, Optional
+
+from PIL import Image, ImageOps, UnidentifiedImageError
+
+try:
+    import boto3
+    from botocore.exceptions import ClientError
+except ImportError:  # optional dependency
+    boto3 = None
+
+logger = logging.getLogger(__name__)
+
+AVATAR_STORAGE_DIR = os.getenv("AVATAR_STORAGE_DIR", "media/avatars")
+AVATAR_S3_BUCKET = os.getenv("AVATAR_S3_BUCKET")
+AVATAR_S3_ENDPOINT = os.getenv("AVATAR_S3_ENDPOINT")  # e.g. MinIO / R2 endpoint
+PUBLIC_API_URL = os.getenv("PUBLIC_API_URL", "").rstrip("/")
+
+MAX_AVATAR_BYTES = 5 * 1024 * 1024  # 5MB
+MAX_AVATAR_PIXELS = 40_000_000
+ALLOWED_FORMATS = {"JPEG", "PNG", "WEBP", "GIF"}
+
+# Variant sizes (longest edge, px); the first one is what profiles link to
+AVATAR_SIZES = (512, 128)
+DEFAULT_AVATAR_SIZE = AVATAR_SIZES[0]
+
+DIGEST_RE = re.compile(r"^[0-9a-f]{64}$")
+DATA_URL_RE = re.compile(r"^data:image/[a-zA-Z0-9.+-]+;base64,", re.IGNORECASE)
+
+
+class InvalidAvatarError(ValueError):
+    """Raised when uploaded data is not a usable image."""
+
+
+class LocalAvatarStore:
+    def __init__(self, root: str):
+        self.root = Path(root)
+
+    def _path(self, key: str) -> Path:
+        return self.root / key
+
+    def exists(self, key: str) -> bool:
+        return self._path(key).is_file()
+
+    def put(self, key: str, data: bytes) -> None:
+        path = self._path(key)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        # Write then rename so readers never see a partial file
+        tmp_path = path.with_suffix(path.suffix + ".tmp")
+        tmp_path.write_bytes(data)
+        os.replace(tmp_path, path)
+
+    def iter_bytes(self, key: str, chunk_size: int = 64 * 1024) -> Iterator[bytes]:
+        with open(self._path(key), "rb") as f:
+            while chunk := f.read(chunk_size):
+                yield chunk
+
+
+class S3AvatarStore:
+    def __init__(self, bucket: str, endpoint_url: Optional[str] = None):
+        self.bucket = bucket
+        self.client = boto3.client("s3", endpoint_url=endpoint_url)
+
+    def exists(self, key: str) -> bool:
+        try:
+            self.client.head_object(Bucket=self.bucket, Key=key)
+            return True
+        except ClientError:
+            return False
+
+    def put(self, key: str, data: bytes) -> None:
+        self.client.put_object(
+            Bucket=self.bucket,
+            Key=key,
+            Body=data,
+            ContentType="image/webp",
+            CacheControl="public, max-age=31536000, immutable",
+        )
+
+    def iter_bytes(self, key: str, chunk_size: int = 64 * 1024) -> Iterator[bytes]:
+        body = self.client.get_object(Bucket=self.bucket, Key=key)["Body"]
+        yield from body.iter_chunks(chunk_size)
+
+
+def _build_store():
+    if AVATAR_S3_BUCKET:
+        if boto3 is None:
+            logger.warning("AVATAR_S3_BUCKET is set but boto3 is not installed; using local avatar storage")
+        else:
+            return S3AvatarStore(AVATAR_S3_BUCKET, AVATAR_S3_ENDPOINT)
+    return LocalAvatarStore(AVATAR_STORAGE_DIR)
+
+
+store = _build_store()
+
+
+def avatar_key(digest: str, size: int) -> str:
+    return f"{digest[:2]}/{digest}/{size}.webp"
+
+
+def avatar_url(digest: str, size: int = DEFAULT_AVATAR_SIZE, base_url: str = "") -> str:
+    """Public URL of an avatar variant. PUBLIC_API_URL wins over the request base URL."""
+    base = PUBLIC_API_URL or base_url.rstrip("/")
+    return f"{base}/avatars/{digest}/{size}.webp"
+
+
+def is_data_url(value: Optional[str]) -> bool:
+    return bool(value) and DATA_URL_RE.match(value) is not None
+
+
+def decode_data_url(value: str) -> bytes:
+    """Decode a `data:image/...;base64,` URL into raw image bytes."""
+    try:
+        return base64.b64decode(value.split(",", 1)[1], validate=True)
+    except (IndexError, ValueError):
+        raise InvalidAvatarError("Avatar is not valid base64 image data")
+
+
+def _render_variant(image: Image.Image, size: int) -> bytes:
+    variant = image.copy()
+    variant.thumbnail((size, size), Image.LANCZOS)
+    out = BytesIO()
+    variant.save(out, format="WEBP", quality=85, method=4)
+    return out.getvalue()
+
+
+def save_avatar(data: bytes) -> str:
+    """
+    Store an avatar image and its WebP variants.
+
+    Args:
+        data: Raw uploaded image bytes
+
+    Returns:
+        SHA-256 hex digest identifying the stored avatar
+
+    Raises:
+        InvalidAvatarError: If the data is too large or not a supported image
+    """
+    if len(data) > MAX_AVATAR_BYTES:
+        raise InvalidAvatarError("Avatar exceeds 5MB limit")
+
+    digest = hashlib.sha256(data).hexdigest()
+    keys = {size: avatar_key(digest, size) for size in AVATAR_SIZES}
+    if all(store.exists(key) for key in keys.values()):
+        return digest
+
+    try:
+        image = Image.open(BytesIO(data))
+        if image.format not in ALLOWED_FORMATS:
+            raise InvalidAvatarError(f"Unsupported image format: {image.format}")
+        if image.width * image.height > MAX_AVATAR_PIXELS:
+            raise InvalidAvatarError("Avatar dimensions are too large")
+        image = ImageOps.exif_transpose(image)
+        image = image.convert("RGBA" if "A" in image.getbands() else "RGB")
+    except (UnidentifiedImageError, Image.DecompressionBombError, OSError) as e:
+        raise InvalidAvatarError(f"Could not decode avatar image: {str(e)}")
+
+    for size, key in keys.items():
+        store.put(key, _render_variant(image, size))
+
+    logger.info(f"Stored avatar {digest} ({len(data)} bytes)")
+    return digest
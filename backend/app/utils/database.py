@@ -1,20 +1,4 @@
-from sqlalchemy import create_engine
-from sqlalchemy.orm import sessionmaker, declarative_base
-import os
-from dotenv import load_dotenv
+# Kept for existing imports; the engine, sessions and Base live in app.database
+from app.database import Base, DATABASE_URL, SessionLocal, engine, get_db
 
-load_dotenv()  # Load variables from .env
-
-DATABASE_URL = os.getenv("DATABASE_URL")
-
-engine = create_engine(DATABASE_URL)
-SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
-
-Base = declarative_base()
-
-def get_db():
-    db = SessionLocal()
-    try:
-        yield db
-    finally:
-        db.close()
\ No newline at end of file
+__all__ = ["Base", "DATABASE_URL", "SessionLocal", "engine", "get_db"]
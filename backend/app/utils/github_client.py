@@ -0,0 +1,338 @@
+# app/utils/github_client.py
+"""
+GitHub REST client with conditional-request caching and rate-limit tracking.
+
+Successful GET responses are cached with their ETag / Last-Modified.
+Repeat requests are sent with If-None-Match / If-Modified-Since, and a
+304 is answered from the cache; authenticated 304s do not count against
+the GitHub rate limit.
+
+Entries live in an in-process LRU and are written through to
+GITHUB_CACHE_DIR (one JSON file per URL), so the cache survives
+restarts and deploys that keep the directory. Disk reads and writes run
+in a thread. prune_disk_cache() (run from the cron hook) deletes files
+not used for GITHUB_CACHE_TTL and keeps at most GITHUB_CACHE_MAX_FILES,
+most recently used first; a file's mtime is its last use.
+
+X-RateLimit-* headers are tracked on every response. Once fewer than
+GITHUB_RATE_LIMIT_RESERVE requests remain (or GitHub asked us to wait),
+cached URLs are served stale without a request and uncached ones raise
+GitHubRateLimited until the window resets. GraphQL requests (graphql())
+are tracked against their own budget and are not cached.
+"""
+import os
+import json
+import time
+import asyncio
+import base64
+import hashlib
+import logging
+import threading
+from typing import Any, Dict, List, NamedTuple, Optional
+
+import httpx
+
+from app.utils.http_clients import get_client
+from app.utils.portfolio_cache import LRUBackend
+
+logger = logging.getLogger(__name__)
+
+GITHUB_CACHE_DIR = os.getenv("GITHUB_CACHE_DIR", "media/github_cache")
+GITHUB_CACHE_MAX_ENTRIES = int(os.getenv("GITHUB_CACHE_MAX_ENTRIES", "2048"))
+# Entries are revalidated on every use; this only bounds how long unused ones stay
+GITHUB_CACHE_TTL = int(os.getenv("GITHUB_CACHE_TTL", str(7 * 24 * 60 * 60)))  # seconds
+GITHUB_CACHE_MAX_FILES = int(os.getenv("GITHUB_CACHE_MAX_FILES", "20000"))
+GITHUB_CACHE_PRUNE_INTERVAL = int(os.getenv("GITHUB_CACHE_PRUNE_INTERVAL", "3600"))  # seconds
+GITHUB_RATE_LIMIT_RESERVE = int(os.getenv("GITHUB_RATE_LIMIT_RESERVE", "10"))
+
+
+class GitHubRateLimited(Exception):
+    """The rate limit is (nearly) used up and the response is not cached."""
+
+    def __init__(self, reset_at: float):
+        super().__init__(f"GitHub rate limit reached; retry after {int(max(reset_at - time.time(), 0))}s")
+        self.reset_at = reset_at
+
+
+class GitHubResponse(NamedTuple):
+    status_code: int
+    content: bytes
+    content_type: str
+    from_cache: bool = False
+
+    @property
+    def text(self) -> str:
+        return self.content.decode("utf-8", "replace")
+
+    def json(self) -> Any:
+        return json.loads(self.content)
+
+
+class _CacheEntry(NamedTuple):
+    etag: str
+    last_modified: str
+    content: bytes
+    content_type: str
+
+
+class RateLimitState:
+    """Latest X-RateLimit-* values seen for one rate-limit resource (core, graphql)."""
+
+    def __init__(self):
+        self.limit: Optional[int] = None
+        self.remaining: Optional[int] = None
+        self.reset_at: float = 0.0
+        # Set by Retry-After (secondary rate limits)
+        self.blocked_until: float = 0.0
+        self._lock = threading.Lock()
+
+    def update(self, response: httpx.Response) -> None:
+        headers = response.headers
+        with self._lock:
+            if "x-ratelimit-remaining" in headers:
+                self.remaining = int(headers["x-ratelimit-remaining"])
+            if "x-ratelimit-limit" in headers:
+                self.limit = int(headers["x-ratelimit-limit"])
+            if "x-ratelimit-reset" in headers:
+                self.reset_at = float(headers["x-ratelimit-reset"])
+            retry_after = headers.get("retry-after")
+            if response.status_code in (403, 429) and retry_after and retry_after.isdigit():
+                self.blocked_until = time.time() + int(retry_after)
+
+    def exhausted(self) -> bool:
+        now = time.time()
+        if self.blocked_until > now:
+            return True
+        return (
+            self.remaining is not None
+            and self.remaining <= GITHUB_RATE_LIMIT_RESERVE
+            and self.reset_at > now
+        )
+
+    def resume_at(self) -> float:
+        return max(self.blocked_until, self.reset_at)
+
+    def snapshot(self) -> Dict[str, Any]:
+        return {
+            "limit": self.limit,
+            "remaining": self.remaining,
+            "reset_at": self.reset_at or None,
+            "blocked_until": self.blocked_until or None,
+            "reserve": GITHUB_RATE_LIMIT_RESERVE,
+        }
+
+
+class GitHubClient:
+    def __init__(self, cache_dir: Optional[str] = GITHUB_CACHE_DIR):
+        self.cache_dir = cache_dir
+        self.rate_limit = RateLimitState()
+        # GraphQL requests draw on a separate budget
+        self.graphql_rate_limit = RateLimitState()
+        self._memory = LRUBackend(GITHUB_CACHE_MAX_ENTRIES, GITHUB_CACHE_TTL)
+        self._counters = {
+            "requests": 0, "not_modified": 0, "stale_served": 0, "graphql_requests": 0, "files_pruned": 0,
+        }
+        self._counters_lock = threading.Lock()
+        self._last_prune = 0.0
+        self._prune_lock = threading.Lock()
+
+    # --- cache storage ---------------------------------------------------
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.cache_dir, f"{key}.json")
+
+    async def _load(self, key: str) -> Optional[_CacheEntry]:
+        entry = self._memory.get(key)
+        if entry is not None or not self.cache_dir:
+            return entry
+        entry = await asyncio.to_thread(self._read_file, key)
+        if entry is not None:
+            self._memory.set(key, entry)
+        return entry
+
+    async def _store(self, key: str, entry: _CacheEntry) -> None:
+        self._memory.set(key, entry)
+        if self.cache_dir:
+            await asyncio.to_thread(self._write_file, key, entry)
+
+    async def _touch(self, key: str) -> None:
+        """Mark a revalidated entry as used, so pruning keeps its file."""
+        if self.cache_dir:
+            await asyncio.to_thread(self._touch_file, key)
+
+    def _read_file(self, key: str) -> Optional[_CacheEntry]:
+        try:
+            with open(self._path(key)) as f:
+                stored = json.load(f)
+            return _CacheEntry(
+                etag=stored["etag"],
+                last_modified=stored["last_modified"],
+                content=base64.b64decode(stored["content"]),
+                content_type=stored["content_type"],
+            )
+        except FileNotFoundError:
+            return None
+        except (OSError, ValueError, KeyError) as e:
+            logger.warning(f"Ignoring unreadable GitHub cache entry {key}: {str(e)}")
+            return None
+
+    def _touch_file(self, key: str) -> None:
+        try:
+            os.utime(self._path(key))
+        except OSError:
+            pass  # Not persisted (or pruned meanwhile); nothing to keep
+
+    def _write_file(self, key: str, entry: _CacheEntry) -> None:
+        try:
+            os.makedirs(self.cache_dir, exist_ok=True)
+            tmp_path = f"{self._path(key)}.{os.getpid()}.tmp"
+            with open(tmp_path, "w") as f:
+                json.dump({
+                    "etag": entry.etag,
+                    "last_modified": entry.last_modified,
+                    "content": base64.b64encode(entry.content).decode(),
+                    "content_type": entry.content_type,
+                }, f)
+            os.replace(tmp_path, self._path(key))
+        except OSError as e:
+            # The in-memory copy still works; persistence is best effort
+            logger.warning(f"Could not persist GitHub cache entry {key}: {str(e)}")
+
+    def _count(self, name: str, n: int = 1) -> None:
+        with self._counters_lock:
+            self._counters[name] += n
+
+    def prune_due(self) -> bool:
+        return bool(self.cache_dir) and time.time() - self._last_prune >= GITHUB_CACHE_PRUNE_INTERVAL
+
+    def prune_disk_cache(self) -> int:
+        """
+        Delete cache files unused for GITHUB_CACHE_TTL, then the least
+        recently used ones beyond GITHUB_CACHE_MAX_FILES. Blocking; returns
+        the number of files deleted.
+        """
+        if not self.cache_dir or not self._prune_lock.acquire(blocking=False):
+            return 0
+        try:
+            self._last_prune = time.time()
+            cutoff = self._last_prune - GITHUB_CACHE_TTL
+            files: List[tuple] = []
+            try:
+                with os.scandir(self.cache_dir) as entries:
+                    for entry in entries:
+                        if entry.is_file() and entry.name.endswith(".json"):
+                            try:
+                                files.append((entry.stat().st_mtime, entry.path))
+                            except OSError:
+                                continue
+            except FileNotFoundError:
+                return 0
+
+            files.sort(reverse=True)  # Most recently used first
+            doomed = [path for index, (mtime, path) in enumerate(files)
+                      if mtime < cutoff or index >= GITHUB_CACHE_MAX_FILES]
+            deleted = 0
+            for path in doomed:
+                try:
+                    os.remove(path)
+                    deleted += 1
+                except OSError:
+                    continue
+            self._count("files_pruned", deleted)
+            if deleted:
+                logger.info(f"Pruned {deleted} GitHub cache files, {len(files) - deleted} left")
+            return deleted
+        finally:
+            self._prune_lock.release()
+
+    # --- requests ----------------------------------------------------------
+
+    async def get(self, path: str, accept: Optional[str] = None) -> GitHubResponse:
+        """
+        GET an API path (e.g. "/repos/{owner}/{repo}"), revalidating any cached copy.
+
+        Raises:
+            GitHubRateLimited: If the rate limit reserve is reached and the
+                response is not cached
+            httpx.HTTPError: On network errors
+        """
+        key = hashlib.sha256(f"{path}\n{accept or ''}".encode()).hexdigest()
+        cached = await self._load(key)
+
+        if self.rate_limit.exhausted():
+            if cached is not None:
+                self._count("stale_served")
+                return GitHubResponse(200, cached.content, cached.content_type, from_cache=True)
+            raise GitHubRateLimited(self.rate_limit.resume_at())
+
+        headers = {}
+        if accept:
+            headers["Accept"] = accept
+        if cached is not None:
+            if cached.etag:
+                headers["If-None-Match"] = cached.etag
+            if cached.last_modified:
+                headers["If-Modified-Since"] = cached.last_modified
+
+        response = await get_client("github").get(path, headers=headers)
+        self._count("requests")
+        if response.headers.get("x-ratelimit-resource", "core") == "core":
+            self.rate_limit.update(response)
+
+        if response.status_code == 304 and cached is not None:
+            self._count("not_modified")
+            await self._touch(key)
+            return GitHubResponse(200, cached.content, cached.content_type, from_cache=True)
+
+        content_type = response.headers.get("content-type", "")
+        if response.status_code == 200:
+            etag = response.headers.get("etag", "")
+            last_modified = response.headers.get("last-modified", "")
+            if etag or last_modified:
+                await self._store(key, _CacheEntry(etag, last_modified, response.content, content_type))
+        elif response.status_code in (403, 429) and self.rate_limit.exhausted() and cached is not None:
+            self._count("stale_served")
+            return GitHubResponse(200, cached.content, cached.content_type, from_cache=True)
+
+        return GitHubResponse(response.status_code, response.content, content_type)
+
+    async def graphql(self, query: str, variables: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Run a GraphQL query (not cached; GraphQL has no conditional requests).
+        Requires GITHUB_API_TOKEN.
+
+        Returns:
+            The response body: {"data": ..., "errors": [...]}; `data`
+            fields for missing objects are null
+
+        Raises:
+            GitHubRateLimited: If the GraphQL rate limit reserve is reached
+            httpx.HTTPStatusError: On a non-200 response
+            httpx.HTTPError: On network errors
+        """
+        if self.graphql_rate_limit.exhausted():
+            raise GitHubRateLimited(self.graphql_rate_limit.resume_at())
+        response = await get_client("github").post("/graphql", json={"query": query, "variables": variables})
+        self._count("graphql_requests")
+        self.graphql_rate_limit.update(response)
+        response.raise_for_status()
+        return response.json()
+
+    def stats(self) -> Dict[str, Any]:
+        with self._counters_lock:
+            counters = dict(self._counters)
+        return {
+            **counters,
+            "entries": len(self._memory),
+            "cache_dir": self.cache_dir,
+            "rate_limit": self.rate_limit.snapshot(),
+            "graphql_rate_limit": self.graphql_rate_limit.snapshot(),
+        }
+
+
+_github = GitHubClient()
+
+
+def get_github_client() -> GitHubClient:
+    """Process-wide client; also usable as a FastAPI dependency."""
+    return _github
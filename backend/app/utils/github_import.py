@@ -0,0 +1,289 @@
+# app/utils/github_import.py
+"""
+Bulk import of a GitHub account's repositories as projects.
+
+list_repos() pages through the account's public repositories (100 per
+page, forks and archived repos dropped). import_events() then
+summarizes them in batches: each batch fetches its READMEs concurrently
+and sends them to the LLM in one request, batches run concurrently, and
+everything is inserted with a single multi-row INSERT at the end.
+
+Progress is reported as server-sent events (see sse_event()):
+  start     {"total", "skipped"}
+  progress  {"done", "total", "repos"}   after each batch
+  done      {"imported", "projects"}
+  error     {"detail"}
+
+Limits:
+- GITHUB_IMPORT_MAX_REPOS: repos considered per import (default 100)
+- GITHUB_IMPORT_BATCH_SIZE: READMEs per LLM request (default 5)
+- GITHUB_IMPORT_CONCURRENCY: simultaneous README fetches (default 8)
+- GITHUB_IMPORT_LLM_CONCURRENCY: simultaneous LLM requests (default 4)
+
+Repos the LLM fails on (error, timeout, missing from the reply) are
+still imported, with a summary built from the repo metadata and
+ai_summary=False.
+"""
+import os
+import re
+import json
+import asyncio
+import logging
+from typing import AsyncIterator, Dict, List, Optional
+
+import httpx
+from fastapi import HTTPException
+from sqlalchemy import insert
+
+from app.database import AsyncSessionLocal
+from app.models.project import Project
+from app.crud.portfolio import commit_portfolio_change_async
+from app.utils.github_client import GitHubClient, GitHubRateLimited
+from app.utils.security import sanitize_html
+
+logger = logging.getLogger(__name__)
+
+OPENROUTER_API_KEY = os.getenv("OPENROUTER_API_KEY")
+MODEL = os.getenv("MODEL", "google/gemma-3-4b-it:free")
+OPENROUTER_URL = "https://openrouter.ai/api/v1/chat/completions"
+
+GITHUB_IMPORT_MAX_REPOS = int(os.getenv("GITHUB_IMPORT_MAX_REPOS", "100"))
+GITHUB_IMPORT_BATCH_SIZE = int(os.getenv("GITHUB_IMPORT_BATCH_SIZE", "5"))
+GITHUB_IMPORT_CONCURRENCY = int(os.getenv("GITHUB_IMPORT_CONCURRENCY", "8"))
+GITHUB_IMPORT_LLM_CONCURRENCY = int(os.getenv("GITHUB_IMPORT_LLM_CONCURRENCY", "4"))
+GITHUB_IMPORT_LLM_TIMEOUT = float(os.getenv("GITHUB_IMPORT_LLM_TIMEOUT", "45"))  # seconds per batch
+
+README_CHARS = 2000
+TOKENS_PER_REPO = 300
+REPOS_PER_PAGE = 100
+
+GITHUB_USERNAME_RE = re.compile(r"^[A-Za-z0-9](?:[A-Za-z0-9]|-(?=[A-Za-z0-9])){0,38}$")
+
+BATCH_PROMPT = """
+You are an assistant that summarizes GitHub projects into short structured JSON.
+Below are {count} repositories, each with its name and README. For EVERY repository, extract these fields with these strict rules:
+
+1. "repo" – the repository name exactly as given.
+2. "description" – a clear, catchy summary of the project (max 500 characters).
+3. "stack" – a list of at least 3 technologies used (or guessed if not given).
+4. "features" – a list of max 3 important features or capabilities (bullet points), EACH with at least 4 words to at most 6 words.
+
+If a README is missing or vague, use the repository name to infer everything.
+
+Output a JSON array with one object per repository and nothing else:
+[
+  {{"repo": "...", "description": "...", "stack": ["...", "...", "..."], "features": ["...", "...", "..."]}}
+]
+
+{repos}
+"""
+
+
+def sse_event(event: str, data: dict) -> str:
+    return f"event: {event}\ndata: {json.dumps(data)}\n\n"
+
+
+async def list_repos(github: GitHubClient, username: str) -> List[dict]:
+    """
+    The account's own public repos, most recently pushed first, without
+    forks and archived repos.
+
+    Raises:
+        HTTPException: 404 for an unknown account, 429 when the GitHub
+            rate limit is used up, 502 for other GitHub errors
+    """
+    repos: List[dict] = []
+    page = 1
+    while len(repos) < GITHUB_IMPORT_MAX_REPOS:
+        try:
+            response = await github.get(
+                f"/users/{username}/repos?type=owner&sort=pushed&per_page={REPOS_PER_PAGE}&page={page}"
+            )
+        except GitHubRateLimited as e:
+            raise HTTPException(status_code=429, detail=str(e))
+        except httpx.HTTPError:
+            raise HTTPException(status_code=502, detail="Failed to reach GitHub")
+        if response.status_code == 404:
+            raise HTTPException(status_code=404, detail="GitHub user not found")
+        if response.status_code != 200:
+            raise HTTPException(status_code=502, detail="Failed to list GitHub repositories")
+
+        items = response.json()
+        repos += [
+            {
+                "name": item["name"],
+                "full_name": item["full_name"],
+                "description": item.get("description") or "",
+                "language": item.get("language") or "",
+                "stars": item.get("stargazers_count", 0),
+                "forks": item.get("forks_count", 0),
+                "link": (item.get("homepage") or "").strip() or item["html_url"],
+            }
+            for item in items
+            if not item.get("fork") and not item.get("archived") and not item.get("disabled")
+        ]
+        if len(items) < REPOS_PER_PAGE:
+            break
+        page += 1
+    return repos[:GITHUB_IMPORT_MAX_REPOS]
+
+
+async def _fetch_readme(github: GitHubClient, full_name: str, slots: asyncio.Semaphore) -> str:
+    async with slots:
+        try:
+            response = await github.get(f"/repos/{full_name}/readme", accept="application/vnd.github.raw+json")
+        except (httpx.HTTPError, GitHubRateLimited):
+            return ""
+    if response.status_code == 200:
+        return response.text[:README_CHARS].replace("\n", " ").strip()
+    return ""
+
+
+def _parse_batch_reply(content: str) -> Dict[str, dict]:
+    """LLM reply -> {lowercased repo name: summary}; {} if it is not a JSON array."""
+    content = content.strip()
+    if content.startswith("```"):
+        content = content.replace("```json", "").replace("```", "").strip()
+    try:
+        items = json.loads(content)
+    except json.JSONDecodeError:
+        return {}
+    if isinstance(items, dict):
+        # Single repo answered as a bare object
+        items = [items]
+    if not isinstance(items, list):
+        return {}
+    return {
+        str(item["repo"]).strip().lower(): item
+        for item in items
+        if isinstance(item, dict) and item.get("repo")
+    }
+
+
+async def _summarize_batch(openrouter: httpx.AsyncClient, batch: List[dict], readmes: List[str]) -> Dict[str, dict]:
+    """One LLM request for the whole batch; {} on any failure."""
+    repos = "\n\n".join(
+        f"### {repo['name']}\nREADME: {readme or 'Not available. Only use project name.'}"
+        for repo, readme in zip(batch, readmes)
+    )
+    headers = {
+        "Authorization": f"Bearer {OPENROUTER_API_KEY}",
+        "Content-Type": "application/json",
+        "HTTP-Referer": "https://openrouter.ai"
+    }
+    payload = {
+        "model": MODEL,
+        "messages": [{"role": "user", "content": BATCH_PROMPT.format(count=len(batch), repos=repos)}],
+        "max_tokens": TOKENS_PER_REPO * len(batch),
+        "temperature": 0.2
+    }
+    try:
+        response = await openrouter.post(OPENROUTER_URL, json=payload, headers=headers)
+    except httpx.HTTPError as e:
+        logger.warning(f"GitHub import batch failed: {str(e)}")
+        return {}
+    if response.status_code != 200:
+        logger.warning(f"GitHub import batch failed: OpenRouter returned {response.status_code}")
+        return {}
+    try:
+        content = response.json()["choices"][0]["message"]["content"]
+    except (ValueError, KeyError, IndexError):
+        return {}
+    return _parse_batch_reply(content)
+
+
+def _project_values(repo: dict, summary: Optional[dict]) -> dict:
+    values = {
+        "title": repo["name"],
+        "type": "github",
+        "stars": repo["stars"],
+        "forks": repo["forks"],
+        "link": repo["link"],
+        "github_repo": repo["full_name"],
+        "imported": True,
+    }
+    if summary:
+        stack = [str(item) for item in summary.get("stack") or []][:3]
+        if len(stack) < 3 and repo["language"] and repo["language"] not in stack:
+            stack.append(repo["language"])
+        values.update(
+            description=str(summary.get("description") or repo["description"]).strip()[:500],
+            stack=stack,
+            features=[str(item) for item in summary.get("features") or []][:3],
+            ai_summary=True,
+        )
+    else:
+        values.update(
+            description=repo["description"]
+            or f"{repo['name']} is a GitHub project with {repo['stars']} stars and {repo['forks']} forks.",
+            stack=[repo["language"]] if repo["language"] else [],
+            features=[],
+            ai_summary=False,
+        )
+    # README-derived text ends up on a public page
+    for field in ("description", "link"):
+        values[field] = sanitize_html(values[field])
+    for field in ("stack", "features"):
+        values[field] = [sanitize_html(item) for item in values[field]]
+    return values
+
+
+async def import_events(
+    user,
+    repos: List[dict],
+    skipped: int,
+    github: GitHubClient,
+    openrouter: httpx.AsyncClient,
+) -> AsyncIterator[str]:
+    """Summarize `repos`, insert them as the user's projects and yield progress events."""
+    total = len(repos)
+    yield sse_event("start", {"total": total, "skipped": skipped})
+
+    readme_slots = asyncio.Semaphore(GITHUB_IMPORT_CONCURRENCY)
+    llm_slots = asyncio.Semaphore(GITHUB_IMPORT_LLM_CONCURRENCY)
+
+    async def run_batch(batch: List[dict]) -> List[dict]:
+        readmes = await asyncio.gather(*(_fetch_readme(github, repo["full_name"], readme_slots) for repo in batch))
+        async with llm_slots:
+            try:
+                summaries = await asyncio.wait_for(_summarize_batch(openrouter, batch, readmes), GITHUB_IMPORT_LLM_TIMEOUT)
+            except asyncio.TimeoutError:
+                logger.warning(f"GitHub import batch timed out ({len(batch)} repos)")
+                summaries = {}
+        return [_project_values(repo, summaries.get(repo["name"].lower())) for repo in batch]
+
+    batches = [repos[i:i + GITHUB_IMPORT_BATCH_SIZE] for i in range(0, total, GITHUB_IMPORT_BATCH_SIZE)]
+    tasks = [asyncio.create_task(run_batch(batch)) for batch in batches]
+    rows: List[dict] = []
+    try:
+        for finished in asyncio.as_completed(tasks):
+            batch_rows = await finished
+            rows += batch_rows
+            yield sse_event("progress", {
+                "done": len(rows),
+                "total": total,
+                "repos": [row["title"] for row in batch_rows],
+            })
+
+        projects = []
+        if rows:
+            # Keep the account's order (most recently pushed first)
+            order = {repo["name"]: index for index, repo in enumerate(repos)}
+            rows.sort(key=lambda row: order[row["title"]])
+            async with AsyncSessionLocal() as db:
+                result = await db.execute(
+                    insert(Project)
+                    .values([{**row, "owner_id": user.id} for row in rows])
+                    .returning(Project.id, Project.title, Project.ai_summary)
+                )
+                projects = [dict(row._mapping) for row in result]
+                await commit_portfolio_change_async(db, user)
+        yield sse_event("done", {"imported": len(projects), "projects": projects})
+    except Exception as e:
+        logger.error(f"GitHub import for user {user.id} failed: {str(e)}", exc_info=True)
+        yield sse_event("error", {"detail": "GitHub import failed. Please try again."})
+    finally:
+        # Client disconnected or a batch raised: stop the rest
+        for task in tasks:
+            if not task.done():
+                task.cancel()
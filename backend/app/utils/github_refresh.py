@@ -0,0 +1,234 @@
+# app/utils/github_refresh.py
+"""
+Periodic refresh of stars/forks on GitHub projects.
+
+refresh_github_stats() picks up to GITHUB_REFRESH_MAX_PROJECTS projects
+of type "github" whose last_updated is older than
+GITHUB_REFRESH_MAX_AGE_HOURS (oldest first), fetches current counts and
+writes them back with one UPDATE ... FROM (VALUES ...). Only owners whose
+numbers actually changed get a content version bump and have their
+cached portfolio dropped.
+
+Counts come from the GraphQL API, GITHUB_REFRESH_BATCH_SIZE repositories
+per query (one rate-limit point each). Without GITHUB_API_TOKEN, GraphQL
+is unavailable and the cached REST client is used instead, where
+unchanged repos cost a 304. In both cases a run stops at the rate-limit
+reserve (see app.utils.github_client), or at a GraphQL response that
+failed for any reason other than missing repositories; projects it did
+not reach stay stale and come first next time.
+
+Runs are started by GET /cron/ping when it carries the X-Cron-Secret
+header (see app.utils.security), at most once per
+GITHUB_REFRESH_MIN_INTERVAL seconds and never two at a time per process.
+"""
+import os
+import re
+import time
+import asyncio
+import logging
+from datetime import datetime, timedelta
+from typing import Dict, List, Optional, Tuple
+
+import httpx
+from sqlalchemy import Integer, column, or_, select, update, values
+
+from app.database import AsyncSessionLocal
+from app.models.project import Project
+from app.models.user import User
+from app.utils.github_client import GitHubClient, GitHubRateLimited, get_github_client
+from app.utils.portfolio_cache import invalidate_portfolio
+from app.utils.user_cache import invalidate_user
+
+logger = logging.getLogger(__name__)
+
+GITHUB_REFRESH_MAX_AGE_HOURS = float(os.getenv("GITHUB_REFRESH_MAX_AGE_HOURS", "24"))
+GITHUB_REFRESH_MAX_PROJECTS = int(os.getenv("GITHUB_REFRESH_MAX_PROJECTS", "1000"))
+GITHUB_REFRESH_BATCH_SIZE = int(os.getenv("GITHUB_REFRESH_BATCH_SIZE", "50"))
+GITHUB_REFRESH_MIN_INTERVAL = int(os.getenv("GITHUB_REFRESH_MIN_INTERVAL", "600"))  # seconds
+# REST fallback only
+GITHUB_REFRESH_CONCURRENCY = int(os.getenv("GITHUB_REFRESH_CONCURRENCY", "8"))
+
+_REPO_LINK_RE = re.compile(r"github\.com/([A-Za-z0-9-]+)/([A-Za-z0-9._-]+?)(?:\.git)?/?(?:[?#].*)?$", re.I)
+
+RepoKey = Tuple[str, str]
+
+_lock = asyncio.Lock()
+_last_started = 0.0
+_last_run: Dict = {}
+
+
+class GitHubQueryFailed(Exception):
+    """A GraphQL response carried no data, or errors other than NOT_FOUND."""
+
+
+def repo_key(github_repo: Optional[str], link: Optional[str]) -> Optional[RepoKey]:
+    """(owner, name) lowercased, from github_repo or else a github.com link."""
+    if github_repo and github_repo.count("/") == 1:
+        owner, name = github_repo.split("/")
+        return owner.lower(), name.lower()
+    match = _REPO_LINK_RE.search(link or "")
+    if match:
+        return match.group(1).lower(), match.group(2).lower()
+    return None
+
+
+async def _fetch_graphql(github: GitHubClient, repos: List[RepoKey], counts: Dict[RepoKey, Optional[Tuple[int, int]]]) -> None:
+    for start in range(0, len(repos), GITHUB_REFRESH_BATCH_SIZE):
+        batch = repos[start:start + GITHUB_REFRESH_BATCH_SIZE]
+        params = ", ".join(f"$o{i}: String!, $n{i}: String!" for i in range(len(batch)))
+        fields = " ".join(
+            f"r{i}: repository(owner: $o{i}, name: $n{i}) {{ stargazerCount forkCount }}"
+            for i in range(len(batch))
+        )
+        variables = {}
+        for i, (owner, name) in enumerate(batch):
+            variables[f"o{i}"] = owner
+            variables[f"n{i}"] = name
+
+        body = await github.graphql(f"query({params}) {{ {fields} }}", variables)
+        data = body.get("data")
+        # NOT_FOUND comes with a null field per missing repo; anything else
+        # (timeouts, RATE_LIMITED, abuse limits) says nothing about the repos
+        errors = {error.get("type") for error in body.get("errors") or []}
+        if data is None or errors - {"NOT_FOUND"}:
+            raise GitHubQueryFailed(f"GitHub GraphQL error: {', '.join(sorted(map(str, errors))) or 'no data'}")
+        for i, key in enumerate(batch):
+            repo = data.get(f"r{i}")
+            # null: renamed, deleted or private now; nothing to update
+            counts[key] = (repo["stargazerCount"], repo["forkCount"]) if repo else None
+
+
+async def _fetch_rest(github: GitHubClient, repos: List[RepoKey], counts: Dict[RepoKey, Optional[Tuple[int, int]]]) -> None:
+    slots = asyncio.Semaphore(GITHUB_REFRESH_CONCURRENCY)
+
+    async def fetch(key: RepoKey) -> None:
+        async with slots:
+            response = await github.get(f"/repos/{key[0]}/{key[1]}")
+        if response.status_code == 200:
+            repo = response.json()
+            counts[key] = (repo.get("stargazers_count", 0), repo.get("forks_count", 0))
+        elif response.status_code in (404, 451):
+            counts[key] = None
+
+    results = await asyncio.gather(*(fetch(key) for key in repos), return_exceptions=True)
+    for result in results:
+        if isinstance(result, GitHubRateLimited):
+            raise result
+        if isinstance(result, Exception) and not isinstance(result, httpx.HTTPError):
+            raise result
+
+
+def stale_projects_statement(cutoff: datetime):
+    """GitHub projects not refreshed since `cutoff`, oldest first (ix_project_github_stale)."""
+    return (
+        select(Project.id, Project.owner_id, Project.github_repo, Project.link, Project.stars, Project.forks)
+        .where(Project.type == "github", or_(Project.last_updated.is_(None), Project.last_updated < cutoff))
+        .order_by(Project.last_updated.asc().nullsfirst())
+        .limit(GITHUB_REFRESH_MAX_PROJECTS)
+    )
+
+
+async def refresh_github_stats() -> Dict:
+    """Refresh one round of stale projects; returns a summary of the run."""
+    started = time.time()
+    cutoff = datetime.utcnow() - timedelta(hours=GITHUB_REFRESH_MAX_AGE_HOURS)
+    github = get_github_client()
+
+    async with AsyncSessionLocal() as db:
+        result = await db.execute(stale_projects_statement(cutoff))
+        projects = result.all()
+
+    # No connection is held while waiting on GitHub
+    keys = {project.id: repo_key(project.github_repo, project.link) for project in projects}
+    repos = sorted({key for key in keys.values() if key})
+
+    # Repo -> (stars, forks), or None if it no longer exists; absent if not reached
+    counts: Dict[RepoKey, Optional[Tuple[int, int]]] = {}
+    stopped = None
+    try:
+        if os.getenv("GITHUB_API_TOKEN"):
+            await _fetch_graphql(github, repos, counts)
+        else:
+            await _fetch_rest(github, repos, counts)
+    except (GitHubRateLimited, GitHubQueryFailed) as e:
+        stopped = str(e)
+    except httpx.HTTPError as e:
+        stopped = f"GitHub error: {type(e).__name__}"
+    if stopped:
+        logger.warning(f"GitHub refresh stopped early: {stopped}")
+
+    rows = []
+    changed = 0
+    changed_owners = set()
+    for project in projects:
+        key = keys[project.id]
+        if key is not None and key not in counts:
+            continue  # Not reached this run
+        stars, forks = counts.get(key) or (project.stars, project.forks)
+        if (stars, forks) != (project.stars, project.forks):
+            changed += 1
+            changed_owners.add(project.owner_id)
+        # Unresolvable and vanished repos are marked checked too, so they
+        # do not hold up the queue
+        rows.append((project.id, stars, forks))
+
+    usernames = []
+    if rows:
+        refreshed = values(
+            column("id", Integer), column("stars", Integer), column("forks", Integer),
+            name="refreshed",
+        ).data(rows)
+        async with AsyncSessionLocal() as db:
+            await db.execute(
+                update(Project)
+                .where(Project.id == refreshed.c.id)
+                .values(stars=refreshed.c.stars, forks=refreshed.c.forks, last_updated=datetime.utcnow())
+            )
+            if changed_owners:
+                result = await db.execute(
+                    update(User)
+                    .where(User.id.in_(changed_owners))
+                    .values(content_version=User.content_version + 1)
+                    .returning(User.id, User.username)
+                )
+                usernames = result.all()
+            await db.commit()
+
+    for user_id, username in usernames:
+        invalidate_portfolio(username)
+        invalidate_user(user_id)
+
+    summary = {
+        "started_at": datetime.utcfromtimestamp(started).isoformat(),
+        "duration_ms": round((time.time() - started) * 1000, 1),
+        "stale": len(projects),
+        "repos": len(repos),
+        "refreshed": len(rows),
+        "changed": changed,
+        "portfolios_invalidated": len(usernames),
+        "stopped": stopped,
+    }
+    logger.info(f"GitHub refresh: {summary}")
+    return summary
+
+
+async def run_scheduled_refresh() -> None:
+    """Background task for the cron hook; skips if a run is active or too recent."""
+    global _last_started, _last_run
+    if _lock.locked() or time.time() - _last_started < GITHUB_REFRESH_MIN_INTERVAL:
+        return
+    async with _lock:
+        _last_started = time.time()
+        try:
+            _last_run = await refresh_github_stats()
+        except Exception as e:
+            logger.error(f"GitHub refresh failed: {str(e)}", exc_info=True)
+            _last_run = {"error": type(e).__name__}
+
+
+def refresh_due() -> bool:
+    return not _lock.locked() and time.time() - _last_started >= GITHUB_REFRESH_MIN_INTERVAL
+
+
+def last_run() -> Dict:
+    return dict(_last_run)
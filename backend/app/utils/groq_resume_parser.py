@@ -1,21 +1,50 @@
 # app/utils/groq_resume_parser.py
 """
-Minimal Groq LLM-based resume parser.
-Single function, single prompt, strict JSON output.
+Groq LLM-based resume parser.
+Section-targeted prompts run concurrently, strict JSON output.
 """
 import os
 import json
+import asyncio
+import hashlib
 import logging
-from typing import Dict, Any
-from groq import Groq
+from typing import Any, Awaitable, Dict, List, Optional, Tuple
+import httpx
+from groq import AsyncGroq
 from app.schemas.resume import ResumeExtractedData
+from app.utils.http_clients import get_client
+from app.utils.resume_sections import (
+    LIST_SECTIONS,
+    SECTION_HEADINGS,
+    merge_extracted,
+    segment_resume,
+    split_text,
+)
+from app.utils.resume_prefill import TAXONOMY_VERSION, extract_contacts, match_skills, taxonomy_category
 
 logger = logging.getLogger(__name__)
 
-# Groq client
-client = Groq(api_key=os.environ.get("GROQ_API_KEY"))
+_groq: Optional[AsyncGroq] = None
+# The pool _groq was built on
+_groq_http_client: Optional[httpx.AsyncClient] = None
 
-# Strict JSON prompt
+
+def get_groq_client() -> AsyncGroq:
+    """
+    Async Groq client on the shared "groq" connection pool
+    (app.utils.http_clients); rebuilt if that pool was replaced.
+    """
+    global _groq, _groq_http_client
+    http_client = get_client("groq")
+    if _groq is None or _groq_http_client is not http_client:
+        _groq = AsyncGroq(api_key=os.environ.get("GROQ_API_KEY"), http_client=http_client)
+        _groq_http_client = http_client
+    return _groq
+
+RESUME_PARSER_MODEL = "llama-3.3-70b-versatile"  # Fast and accurate
+SYSTEM_PROMPT = "You are a precise resume parser. Return ONLY valid JSON, no markdown, no explanations."
+
+# Strict JSON prompt for the whole resume; used when no sections are recognised
 RESUME_PARSING_PROMPT = """Extract ALL information from this resume and return ONLY valid JSON.
 
 Resume Text:
@@ -87,82 +116,267 @@ JSON Schema (MUST match exactly):
 Return ONLY the JSON object. Start with {{ and end with }}.
 """
 
+# One small prompt per section (see app.utils.resume_sections). Each sees
+# only its own text and schema, so the calls are short and run in parallel.
+SECTION_PROMPT = """Extract {what} from this resume section and return ONLY valid JSON.
+
+Resume section:
+{section_text}
+
+CRITICAL RULES:
+1. Return ONLY the JSON object - no markdown, no explanations, no extra text
+2. Extract ALL {what} in the section - do not skip or summarize entries
+3. NEVER use the person's name in descriptions - write in first person or passive voice
+{rules}
+JSON Schema (MUST match exactly):
+{schema}
+
+Return ONLY the JSON object. Start with {{ and end with }}.
+"""
+
+# section -> (what, extra rules, schema, max_tokens)
+SECTION_SPECS: Dict[str, Tuple[str, str, str, int]] = {
+    "profile": (
+        "the candidate's profile details",
+        "4. 'about' is a 2-3 sentence professional summary; use empty strings for anything missing\n",
+        "",  # built per resume from PROFILE_FIELDS, see _profile_schema()
+        600,
+    ),
+    "experience": (
+        "work experience entries",
+        "4. Description: if the original is <20 words, enhance to 2-3 sentences. Otherwise keep original.\n",
+        '''{"work_experience": [{"title": "Job Title", "company": "Company Name",
+ "duration": "Start Date - End Date", "location": "City, Country",
+ "description": "2-3 sentences about responsibilities and impact"}]}''',
+        2500,
+    ),
+    "projects": (
+        "projects",
+        "4. Description: if the original is <20 words, enhance to 2-3 sentences. Otherwise keep original.\n",
+        '''{"projects": [{"title": "Project Name", "description": "2-3 sentences about what it does and impact",
+ "tech": ["Technology1", "Technology2"], "features": ["Feature 1", "Feature 2"]}]}''',
+        2500,
+    ),
+    "skills": (
+        "skills",
+        "4. Categorize skills: Frontend, Backend, Database, DevOps, Cloud, AI/ML, Mobile, Other\n"
+        "5. Skill levels: Beginner, Intermediate, Advanced\n",
+        '''{"skills": [{"name": "Skill Name", "level": "Beginner|Intermediate|Advanced",
+ "category": "Frontend|Backend|Database|DevOps|Cloud|AI/ML|Mobile|Other"}]}''',
+        1500,
+    ),
+    "certifications": (
+        "certifications",
+        "",
+        '''{"certifications": [{"name": "Certificate Name", "issuer": "Issuing Organization",
+ "year": "YYYY", "description": "Brief description"}]}''',
+        1200,
+    ),
+    "awards": (
+        "awards, achievements and activities",
+        "4. type is 'award' for awards and competitions, 'internship' for internships, otherwise 'other'\n",
+        '''{"achievements": [{"title": "Achievement Title", "issuer": "Organization",
+ "date": "YYYY or Month YYYY", "type": "award|internship|other", "description": "1-2 sentences"}]}''',
+        1500,
+    ),
+}
+
+# Profile fields with their schema examples; fields already found by
+# app.utils.resume_prefill are left out of the prompt
+PROFILE_FIELDS: Dict[str, str] = {
+    "name": "Full Name",
+    "title": "Current/Target Job Title",
+    "location": "City, Country",
+    "email": "email@example.com",
+    "about": "2-3 sentence professional summary",
+    "github": "username",
+    "linkedin": "username",
+    "website": "https://...",
+}
+
+# Sections longer than this are split and each chunk parsed separately;
+# also the chunk size for resumes without recognisable sections
+SECTION_MAX_CHARS = int(os.getenv("RESUME_SECTION_MAX_CHARS", "6000"))
+
+# Unsegmented text before the first heading beyond this suggests headings
+# the segmenter does not know; parse the whole resume with the full prompt
+MAX_PREAMBLE_CHARS = 1500
+
+# Changes whenever the prompts, the segmentation or the model do, so cached
+# parses of the old prompt are not reused (see app.utils.resume_cache)
+PROMPT_VERSION = hashlib.sha256(
+    json.dumps(
+        [RESUME_PARSER_MODEL, SYSTEM_PROMPT, RESUME_PARSING_PROMPT, SECTION_PROMPT,
+         SECTION_SPECS, PROFILE_FIELDS, SECTION_HEADINGS, SECTION_MAX_CHARS, TAXONOMY_VERSION],
+        sort_keys=True,
+    ).encode()
+).hexdigest()[:16]
+
+RESUME_PARSE_CONCURRENCY = int(os.getenv("RESUME_PARSE_CONCURRENCY", "8"))
+
+_request_slots: Optional[asyncio.Semaphore] = None
+
 
-def parse_resume_with_groq(resume_text: str) -> ResumeExtractedData:
+def _get_request_slots() -> asyncio.Semaphore:
+    # Bounds simultaneous Groq requests across all jobs in this worker
+    global _request_slots
+    if _request_slots is None:
+        _request_slots = asyncio.Semaphore(RESUME_PARSE_CONCURRENCY)
+    return _request_slots
+
+
+def _clean_json_response(response_text: str) -> str:
+    response_text = response_text.strip()
+
+    # Remove markdown code fences if present
+    if response_text.startswith("```"):
+        response_text = response_text.split("```", 1)[1]
+        if response_text.startswith("json"):
+            response_text = response_text[4:]
+        if "```" in response_text:
+            response_text = response_text.rsplit("```", 1)[0]
+        response_text = response_text.strip()
+
+    # Find JSON object boundaries
+    first_brace = response_text.find('{')
+    last_brace = response_text.rfind('}')
+    if first_brace != -1 and last_brace != -1:
+        response_text = response_text[first_brace:last_brace+1]
+    return response_text
+
+
+async def _complete_json(prompt: str, max_tokens: int, label: str) -> Dict[str, Any]:
     """
-    Parse resume using Groq LLM.
-    
-    Args:
-        resume_text: Raw text extracted from resume
-        
-    Returns:
-        ResumeExtractedData: Validated structured resume data
-        
+    One Groq call that must return a JSON object.
+
     Raises:
-        ValueError: If LLM returns invalid JSON or validation fails
-        Exception: If Groq API call fails
+        ValueError: If the response is not valid JSON
     """
-    try:
-        # Truncate if too long
-        max_chars = 12000
-        if len(resume_text) > max_chars:
-            logger.warning(f"Resume text truncated from {len(resume_text)} to {max_chars} chars")
-            resume_text = resume_text[:max_chars]
-        
-        # Format prompt
-        prompt = RESUME_PARSING_PROMPT.format(resume_text=resume_text)
-        
-        logger.info("Calling Groq API for resume parsing...")
-        
-        # Call Groq
-        chat_completion = client.chat.completions.create(
+    async with _get_request_slots():
+        chat_completion = await get_groq_client().chat.completions.create(
             messages=[
                 {
                     "role": "system",
-                    "content": "You are a precise resume parser. Return ONLY valid JSON, no markdown, no explanations."
+                    "content": SYSTEM_PROMPT
                 },
                 {
                     "role": "user",
                     "content": prompt
                 }
             ],
-            model="llama-3.3-70b-versatile",  # Fast and accurate
+            model=RESUME_PARSER_MODEL,
             temperature=0.1,  # Low for consistency
-            max_tokens=4000
+            max_tokens=max_tokens
         )
+
+    response_text = chat_completion.choices[0].message.content or ""
+    usage = chat_completion.usage
+    if usage is not None:
+        logger.info(
+            f"Groq {label}: {usage.prompt_tokens} prompt + {usage.completion_tokens} completion tokens, "
+            f"{len(response_text)} chars"
+        )
+
+    response_text = _clean_json_response(response_text)
+    try:
+        parsed = json.loads(response_text)
+    except json.JSONDecodeError as e:
+        logger.error(f"JSON parsing failed for {label}: {str(e)}")
+        logger.error(f"Response text: {response_text[:500]}")
+        raise ValueError(f"Invalid JSON from Groq: {str(e)}")
+    if not isinstance(parsed, dict):
+        raise ValueError(f"Invalid JSON from Groq: expected an object for {label}")
+    return parsed
+
+
+def _profile_schema(known: Dict[str, str]) -> str:
+    return json.dumps({field: example for field, example in PROFILE_FIELDS.items() if field not in known})
+
+
+async def _parse_section(section: str, section_text: str, schema: Optional[str] = None) -> ResumeExtractedData:
+    what, rules, default_schema, max_tokens = SECTION_SPECS[section]
+    schema = schema or default_schema
+    prompt = SECTION_PROMPT.format(what=what, section_text=section_text, rules=rules, schema=schema)
+    return ResumeExtractedData(**await _complete_json(prompt, max_tokens, section))
+
+
+async def _parse_full(chunk: str) -> ResumeExtractedData:
+    prompt = RESUME_PARSING_PROMPT.format(resume_text=chunk)
+    return ResumeExtractedData(**await _complete_json(prompt, 4000, "full resume"))
+
+
+def _plan_requests(resume_text: str) -> Tuple[ResumeExtractedData, List[Awaitable[ResumeExtractedData]]]:
+    """
+    Fields resolved locally, plus one request per section chunk (or per
+    chunk of the whole text if segmentation failed) for everything else.
+    """
+    segments = segment_resume(resume_text)
+    logger.info(f"Resume segmented: {segments!r}")
+
+    if len(segments.list_sections) < 2 or segments.preamble_chars > MAX_PREAMBLE_CHARS:
+        # Skills are only matched inside a skills section; in running text
+        # words like "go", "rest" or "express" are too ambiguous
+        local = ResumeExtractedData(**extract_contacts(resume_text[:MAX_PREAMBLE_CHARS]))
+        chunks = split_text(resume_text, SECTION_MAX_CHARS)
+        logger.info(f"Resume sections not recognised; parsing as {len(chunks)} chunk(s) with the full prompt")
+        return local, [_parse_full(chunk) for chunk in chunks]
+
+    contacts = extract_contacts(segments.sections.get("profile", ""))
+    skills, unresolved_skills = match_skills(segments.sections.get("skills", ""))
+    local = ResumeExtractedData(**contacts, skills=skills)
+    logger.info(
+        f"Resolved locally: {sorted(contacts)}, {len(skills)} skills; "
+        f"{len(unresolved_skills)} chars of skills text left for the LLM"
+    )
+
+    requests = [
+        # Only the short scalar fields come from here; they are near the top
+        _parse_section("profile", segments.sections.get("profile", "")[:SECTION_MAX_CHARS], _profile_schema(contacts))
+    ]
+    for section in LIST_SECTIONS:
+        section_text = unresolved_skills if section == "skills" else segments.sections.get(section)
+        if not section_text:
+            continue
+        for chunk in split_text(section_text, SECTION_MAX_CHARS):
+            requests.append(_parse_section(section, chunk))
+    return local, requests
+
+
+async def parse_resume_with_groq(resume_text: str) -> ResumeExtractedData:
+    """
+    Parse resume using Groq LLM.
+
+    Contact fields and known skills are extracted locally
+    (app.utils.resume_prefill). The rest of the text is split into
+    sections that are parsed concurrently with targeted prompts and
+    merged; nothing is truncated.
+    
+    Args:
+        resume_text: Raw text extracted from resume
         
-        # Extract response
-        response_text = chat_completion.choices[0].message.content
-        logger.info(f"Received {len(response_text)} characters from Groq")
-        
-        # Clean response
-        response_text = response_text.strip()
-        
-        # Remove markdown code fences if present
-        if response_text.startswith("```"):
-            response_text = response_text.split("```", 1)[1]
-            if response_text.startswith("json"):
-                response_text = response_text[4:]
-            if "```" in response_text:
-                response_text = response_text.rsplit("```", 1)[0]
-            response_text = response_text.strip()
-        
-        # Find JSON object boundaries
-        first_brace = response_text.find('{')
-        last_brace = response_text.rfind('}')
-        if first_brace != -1 and last_brace != -1:
-            response_text = response_text[first_brace:last_brace+1]
-        
-        # Parse JSON
-        try:
-            parsed_data = json.loads(response_text)
-        except json.JSONDecodeError as e:
-            logger.error(f"JSON parsing failed: {str(e)}")
-            logger.error(f"Response text: {response_text[:500]}")
-            raise ValueError(f"Invalid JSON from Groq: {str(e)}")
+    Returns:
+        ResumeExtractedData: Validated structured resume data
         
-        # Validate with Pydantic
-        extracted_data = ResumeExtractedData(**parsed_data)
+    Raises:
+        ValueError: If LLM returns invalid JSON or validation fails
+        Exception: If Groq API call fails
+    """
+    try:
+        local, requests = _plan_requests(resume_text)
+        logger.info(f"Calling Groq API for resume parsing ({len(requests)} requests)...")
+
+        results = await asyncio.gather(*requests, return_exceptions=True)
+        for result in results:
+            if isinstance(result, BaseException):
+                # A partial parse would be cached and confirmed as if complete
+                raise result
+
+        # Local results first: for contact fields the regex match wins
+        extracted_data = merge_extracted([local, *results])
+        for skill in extracted_data.skills:
+            category = taxonomy_category(skill.name)
+            if category is not None:
+                skill.category = category
         
         logger.info(
             f"Successfully parsed resume: {len(extracted_data.work_experience)} work exp, "
@@ -0,0 +1,108 @@
+# app/utils/http_clients.py
+"""
+Application-lifetime httpx.AsyncClient registry for outbound HTTP.
+
+One client per upstream, so each gets its own connection pool (which
+acts as a per-host connection limit), timeouts and default headers.
+Connections are kept alive between requests, so LLM, GitHub and Google
+calls skip the TCP/TLS handshake after the first one. HTTP/2 is used
+when the optional `h2` package is installed.
+
+Clients are created by start() in the app lifespan and closed by
+close(). Routes get them with `Depends(http_client("github"))`,
+other code with get_client("github"). Outside the app (scripts), the
+first get_client() call creates the registry.
+
+Transport retries only cover failed connection attempts, so they are
+safe for POSTs too; status-code retries are up to the caller.
+"""
+import os
+import logging
+import importlib.util
+from typing import Callable, Dict
+
+import httpx
+
+logger = logging.getLogger(__name__)
+
+HTTP2_AVAILABLE = importlib.util.find_spec("h2") is not None
+
+HTTP_CONNECT_RETRIES = int(os.getenv("HTTP_CONNECT_RETRIES", "2"))
+HTTP_MAX_CONNECTIONS = int(os.getenv("HTTP_MAX_CONNECTIONS", "20"))
+HTTP_KEEPALIVE_EXPIRY = float(os.getenv("HTTP_KEEPALIVE_EXPIRY", "60"))  # seconds
+
+def _github_headers() -> Dict[str, str]:
+    headers = {"Accept": "application/vnd.github+json", "X-GitHub-Api-Version": "2022-11-28"}
+    token = os.getenv("GITHUB_API_TOKEN")
+    if token:
+        headers["Authorization"] = f"Bearer {token}"
+    return headers
+
+
+# name -> (timeout, extra client options); callables are resolved when the
+# client is built, so values from .env are picked up
+CLIENT_CONFIGS: Dict[str, tuple] = {
+    # LLM calls stream back slowly; only the connect phase is kept short
+    "openrouter": (httpx.Timeout(60.0, connect=5.0), {}),
+    "groq": (httpx.Timeout(60.0, connect=5.0), {}),
+    "github": (httpx.Timeout(15.0, connect=5.0), {"base_url": "https://api.github.com", "headers": _github_headers}),
+    "google": (httpx.Timeout(10.0, connect=5.0), {}),
+    # Anything else, e.g. raw.githubusercontent.com
+    "default": (httpx.Timeout(15.0, connect=5.0), {"follow_redirects": True}),
+}
+
+_clients: Dict[str, httpx.AsyncClient] = {}
+
+
+def _build(name: str) -> httpx.AsyncClient:
+    timeout, options = CLIENT_CONFIGS[name]
+    options = {key: value() if callable(value) else value for key, value in options.items()}
+    limits = httpx.Limits(
+        max_connections=HTTP_MAX_CONNECTIONS,
+        max_keepalive_connections=HTTP_MAX_CONNECTIONS,
+        keepalive_expiry=HTTP_KEEPALIVE_EXPIRY,
+    )
+    # A custom transport bypasses httpx's proxy environment handling; every
+    # upstream is HTTPS, so honour HTTPS_PROXY explicitly
+    proxy = os.getenv("HTTPS_PROXY") or os.getenv("https_proxy") or None
+    transport = httpx.AsyncHTTPTransport(
+        http2=HTTP2_AVAILABLE,
+        limits=limits,
+        retries=HTTP_CONNECT_RETRIES,
+        proxy=proxy,
+    )
+    return httpx.AsyncClient(transport=transport, timeout=timeout, **options)
+
+
+async def start() -> Dict[str, httpx.AsyncClient]:
+    """Create every client; called once from the app lifespan."""
+    for name in CLIENT_CONFIGS:
+        if name not in _clients or _clients[name].is_closed:
+            _clients[name] = _build(name)
+    logger.info(f"HTTP clients started: {', '.join(_clients)} (http2={HTTP2_AVAILABLE})")
+    return _clients
+
+
+async def close() -> None:
+    clients = list(_clients.values())
+    _clients.clear()
+    for client in clients:
+        await client.aclose()
+
+
+def get_client(name: str) -> httpx.AsyncClient:
+    client = _clients.get(name)
+    if client is None or client.is_closed:
+        client = _clients[name] = _build(name)
+    return client
+
+
+def http_client(name: str) -> Callable[[], httpx.AsyncClient]:
+    """FastAPI dependency factory: `client: httpx.AsyncClient = Depends(http_client("github"))`."""
+    if name not in CLIENT_CONFIGS:
+        raise ValueError(f"Unknown HTTP client '{name}'")
+
+    def dependency() -> httpx.AsyncClient:
+        return get_client(name)
+
+    return dependency
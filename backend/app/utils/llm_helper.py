@@ -4,10 +4,11 @@ Reusable LLM helper using OpenRouter API.
 Extracted from summary.py to avoid duplication.
 """
 import os
-import requests
+import httpx
 import json
 import logging
 from typing import Dict, Any, Optional
+from app.utils.http_clients import get_client
 
 logger = logging.getLogger(__name__)
 
@@ -17,7 +18,7 @@ OPENROUTER_MODEL = os.getenv("MODEL", "google/gemma-3-4b-it:free")
 OPENROUTER_URL = "https://openrouter.ai/api/v1/chat/completions"
 
 
-def call_llm(
+async def call_llm(
     prompt: str,
     max_tokens: int = 2000,
     temperature: float = 0.3,
@@ -37,7 +38,7 @@ def call_llm(
         
     Raises:
         ValueError: If API key is not configured
-        requests.RequestException: If API request fails
+        httpx.HTTPError: If API request fails
     """
     if not OPENROUTER_API_KEY:
         logger.error("OPENROUTER_API_KEY not found in environment")
@@ -62,7 +63,7 @@ def call_llm(
     }
     
     try:
-        response = requests.post(OPENROUTER_URL, json=payload, headers=headers, timeout=60)
+        response = await get_client("openrouter").post(OPENROUTER_URL, json=payload, headers=headers, timeout=60)
         
         # Log response for debugging
         logger.info(f"OpenRouter response status: {response.status_code}")
@@ -70,7 +71,9 @@ def call_llm(
         
         if response.status_code != 200:
             logger.error(f"OpenRouter API error: {response.status_code} - {response.text}")
-            raise requests.RequestException(f"OpenRouter error: {response.text}")
+            raise httpx.HTTPStatusError(
+                f"OpenRouter error: {response.text}", request=response.request, response=response
+            )
         
         response_json = response.json()
         logger.debug(f"Response JSON keys: {response_json.keys()}")
@@ -93,10 +96,10 @@ def call_llm(
         logger.info(f"Received response from OpenRouter ({len(content)} chars)")
         return content
         
-    except requests.Timeout:
+    except httpx.TimeoutException:
         logger.error("OpenRouter API request timed out")
-        raise requests.RequestException("OpenRouter API request timed out")
-    except requests.RequestException as e:
+        raise
+    except httpx.HTTPError as e:
         logger.error(f"OpenRouter API request failed: {str(e)}")
         raise
     except Exception as e:
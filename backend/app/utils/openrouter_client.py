@@ -2,6 +2,7 @@ import os
 from typing import List
 import httpx
 from fastapi import HTTPException
+from app.utils.http_clients import get_client
 
 OPENROUTER_API_KEY = os.getenv("OPENROUTER_API_KEY")
 PRIMARY_MODEL = "google/gemma-3-4b-it:free"
@@ -31,19 +32,18 @@ async def generate_variants_from_openrouter(prompt: str, n_variants: int = 3) ->
         "temperature": 0.6,
     }
 
+    client = get_client("openrouter")
     try:
-        async with httpx.AsyncClient(timeout=30) as client:
-            response = await client.post(OPENROUTER_URL, json=payload, headers=headers)
-            response.raise_for_status()
-            data = response.json()
+        response = await client.post(OPENROUTER_URL, json=payload, headers=headers, timeout=30)
+        response.raise_for_status()
+        data = response.json()
     except httpx.HTTPError:
         # Simple fallback once with the secondary model
         payload["model"] = FALLBACK_MODEL
         try:
-            async with httpx.AsyncClient(timeout=30) as client:
-                response = await client.post(OPENROUTER_URL, json=payload, headers=headers)
-                response.raise_for_status()
-                data = response.json()
+            response = await client.post(OPENROUTER_URL, json=payload, headers=headers, timeout=30)
+            response.raise_for_status()
+            data = response.json()
         except httpx.HTTPError:
             raise HTTPException(
                 status_code=502,
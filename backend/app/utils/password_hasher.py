@@ -0,0 +1,64 @@
+# app/utils/password_hasher.py
+"""
+Async password hashing service.
+
+bcrypt is deliberately slow (~250ms at cost 12), so it runs in its own
+small thread pool instead of on the event loop or in the threadpool that
+serves sync routes. Admission is bounded: once PASSWORD_HASH_WORKERS jobs
+are running and PASSWORD_HASH_QUEUE more are waiting, further calls fail
+fast with PasswordHasherBusy (served as 503) instead of queueing without
+limit during a login burst.
+"""
+import os
+import asyncio
+import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Optional, Tuple
+
+from app.utils.auth import hash_password, verify_and_update_password
+
+logger = logging.getLogger(__name__)
+
+PASSWORD_HASH_WORKERS = int(os.getenv("PASSWORD_HASH_WORKERS", "2"))
+PASSWORD_HASH_QUEUE = int(os.getenv("PASSWORD_HASH_QUEUE", "16"))
+
+_executor = ThreadPoolExecutor(max_workers=PASSWORD_HASH_WORKERS, thread_name_prefix="bcrypt")
+_slots = threading.BoundedSemaphore(PASSWORD_HASH_WORKERS + PASSWORD_HASH_QUEUE)
+
+
+class PasswordHasherBusy(Exception):
+    """Raised when the hashing pool and its queue are full."""
+
+
+async def _run(fn, *args):
+    if not _slots.acquire(blocking=False):
+        logger.warning("Password hashing queue is full; rejecting request")
+        raise PasswordHasherBusy()
+    # Free the slot when the thread is done, even if the caller was cancelled
+    future = _executor.submit(fn, *args)
+    future.add_done_callback(lambda _: _slots.release())
+    return await asyncio.wrap_future(future)
+
+
+async def hash_password_async(password: str) -> str:
+    return await _run(hash_password, password)
+
+
+def _verify(password: str, hashed_password: Optional[str]) -> Tuple[bool, Optional[str]]:
+    try:
+        return verify_and_update_password(password, hashed_password)
+    except (ValueError, TypeError):
+        # Missing or non-bcrypt value, e.g. the placeholder stored for Google accounts
+        return False, None
+
+
+async def verify_password_async(password: str, hashed_password: Optional[str]) -> Tuple[bool, Optional[str]]:
+    """
+    Check a password against its stored hash.
+
+    Returns:
+        (valid, new_hash) where new_hash is a replacement hash when the stored
+        one was made with a different bcrypt cost, otherwise None
+    """
+    return await _run(_verify, password, hashed_password)
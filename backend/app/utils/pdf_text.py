@@ -0,0 +1,252 @@
+# app/utils/pdf_text.py
+"""
+PDF text extraction backends.
+
+- pdfium: pypdfium2 (PDFium, C++); fast, the default
+- pdfplumber: pdfminer.six with layout analysis; slow, but copes with
+  fonts and layouts that PDFium turns into garbage
+- pypdf2: the original pure-Python extractor, kept for comparison
+
+extract_pdf_text() runs PDF_BACKEND over every page, scores each page
+with text_quality(), and re-extracts pages that score below
+PDF_MIN_QUALITY with the fallback backend, keeping whichever result
+scores better. Given an executor and a file path, pages are split into
+contiguous chunks that are extracted in parallel.
+
+PDFium is not thread-safe; run backends in processes, not threads.
+"""
+import os
+import re
+import logging
+import unicodedata
+from concurrent.futures import Executor
+from typing import BinaryIO, Callable, Dict, List, Optional, Sequence, Union
+
+logger = logging.getLogger(__name__)
+
+PdfSource = Union[str, BinaryIO]
+
+PDF_BACKEND = os.getenv("PDF_BACKEND", "pdfium")
+PDF_FALLBACK_BACKEND = os.getenv("PDF_FALLBACK_BACKEND", "pdfplumber")
+PDF_MIN_QUALITY = float(os.getenv("PDF_MIN_QUALITY", "0.75"))
+# Below this many pages, splitting costs more than it saves
+PDF_PARALLEL_MIN_PAGES = int(os.getenv("PDF_PARALLEL_MIN_PAGES", "4"))
+
+# Pages with less text than this are not scored (a name alone is not "garbled")
+_MIN_SCORED_CHARS = 40
+
+_CID_RE = re.compile(r"\(cid:\d+\)")
+_TOKEN_RE = re.compile(r"\S+")
+_WORD_RE = re.compile(r"^[\W_]*[^\W\d_][^\W_]*(?:['’.\-/@+&][^\W_]+)*[\W_]*$")
+_COMMON_SYMBOLS = set("$€£+<>=|~^`©®°•")
+
+
+# --- Backends: (source, page indices) -> one string per page --------------
+
+def _pdfium_pages(source: PdfSource, pages: Sequence[int]) -> List[str]:
+    import pypdfium2 as pdfium
+
+    pdf = pdfium.PdfDocument(source)
+    try:
+        texts = []
+        for index in pages:
+            page = pdf[index]
+            textpage = page.get_textpage()
+            try:
+                texts.append(textpage.get_text_range().replace("\r\n", "\n").replace("\r", "\n"))
+            finally:
+                textpage.close()
+                page.close()
+        return texts
+    finally:
+        pdf.close()
+
+
+def _pdfplumber_pages(source: PdfSource, pages: Sequence[int]) -> List[str]:
+    import pdfplumber
+
+    with pdfplumber.open(source) as pdf:
+        texts = []
+        for index in pages:
+            page = pdf.pages[index]
+            texts.append(page.extract_text() or "")
+            # Drop the parsed layout objects; they are large for dense pages
+            page.close()
+        return texts
+
+
+def _pypdf2_pages(source: PdfSource, pages: Sequence[int]) -> List[str]:
+    import PyPDF2
+
+    reader = PyPDF2.PdfReader(source)
+    return [reader.pages[index].extract_text() or "" for index in pages]
+
+
+BACKENDS: Dict[str, Callable[[PdfSource, Sequence[int]], List[str]]] = {
+    "pdfium": _pdfium_pages,
+    "pdfplumber": _pdfplumber_pages,
+    "pypdf2": _pypdf2_pages,
+}
+
+
+def _rewind(source: PdfSource) -> None:
+    if hasattr(source, "seek"):
+        source.seek(0)
+
+
+def page_count(source: PdfSource) -> int:
+    import pypdfium2 as pdfium
+
+    _rewind(source)
+    pdf = pdfium.PdfDocument(source)
+    try:
+        return len(pdf)
+    finally:
+        pdf.close()
+
+
+def extract_pages(source: PdfSource, backend: str, pages: Sequence[int]) -> List[str]:
+    """Text of the given pages (0-based) with one backend. Picklable for process pools."""
+    if backend not in BACKENDS:
+        raise ValueError(f"Unknown PDF backend '{backend}'. Choose from: {', '.join(BACKENDS)}")
+    _rewind(source)
+    return BACKENDS[backend](source, pages)
+
+
+# --- Quality heuristic ----------------------------------------------------
+
+def text_quality(text: str) -> float:
+    """
+    Score extracted text from 0 (garbage) to 1 (looks like prose).
+
+    Takes the lower of two ratios:
+    - characters: share that are not replacement characters, (cid:N)
+      placeholders, control, private-use or unassigned code points
+      (symptoms of fonts without a usable Unicode mapping); unusual
+      symbols count half
+    - tokens: whitespace-separated tokens that look like words, numbers,
+      emails or URLs and are not absurdly long (words glued together
+      when spacing is lost)
+
+    Text shorter than a couple of lines scores 1; there is too little
+    of it to judge.
+    """
+    stripped = text.strip()
+    if len(stripped) < _MIN_SCORED_CHARS:
+        return 1.0
+
+    cid_chars = sum(len(m) for m in _CID_RE.findall(stripped))
+    bad = float(cid_chars)
+    for ch in _CID_RE.sub("", stripped):
+        category = unicodedata.category(ch)
+        if ch == "\ufffd" or category in ("Co", "Cn") or (category == "Cc" and not ch.isspace()):
+            bad += 1
+        elif category[0] == "S" and ch not in _COMMON_SYMBOLS:
+            # Stray dingbats and math symbols are plausible, but not in bulk
+            bad += 0.5
+    char_score = 1.0 - bad / len(stripped)
+
+    tokens = _TOKEN_RE.findall(_CID_RE.sub(" ", stripped))
+    if not tokens:
+        return 0.0
+    wordlike = sum(
+        1 for token in tokens
+        if len(token) <= 25 and (_WORD_RE.match(token) or token.replace(".", "").replace(",", "").isdigit()
+                                 or "@" in token or "://" in token or not any(c.isalpha() for c in token))
+    )
+    token_score = wordlike / len(tokens)
+
+    return min(char_score, token_score)
+
+
+# --- Orchestration --------------------------------------------------------
+
+def page_chunks(total_pages: int, workers: int) -> List[List[int]]:
+    """Split page indices into at most `workers` contiguous, similar-sized chunks."""
+    if total_pages < PDF_PARALLEL_MIN_PAGES or workers <= 1:
+        return [list(range(total_pages))] if total_pages else []
+    workers = min(workers, total_pages)
+    size, extra = divmod(total_pages, workers)
+    chunks, start = [], 0
+    for i in range(workers):
+        end = start + size + (1 if i < extra else 0)
+        chunks.append(list(range(start, end)))
+        start = end
+    return chunks
+
+
+def _run_chunks(
+    source: PdfSource,
+    backend: str,
+    pages: List[int],
+    executor: Optional[Executor],
+    workers: int,
+) -> List[str]:
+    if executor is None or not isinstance(source, str):
+        # File objects cannot be shared with worker processes
+        return extract_pages(source, backend, pages)
+
+    chunks = [[pages[i] for i in chunk] for chunk in page_chunks(len(pages), workers)]
+    if len(chunks) <= 1:
+        return executor.submit(extract_pages, source, backend, pages).result()
+
+    futures = [executor.submit(extract_pages, source, backend, chunk) for chunk in chunks]
+    texts: List[str] = []
+    for future in futures:
+        texts.extend(future.result())
+    return texts
+
+
+def extract_pdf_text(
+    source: PdfSource,
+    backend: Optional[str] = None,
+    fallback: Optional[str] = None,
+    executor: Optional[Executor] = None,
+    workers: int = 1,
+) -> Optional[str]:
+    """
+    Extract the text of a PDF, falling back per page when it looks garbled.
+
+    Args:
+        source: Path to, or file-like object containing, the PDF
+        backend: Primary backend name (default PDF_BACKEND)
+        fallback: Backend for low-quality pages (default PDF_FALLBACK_BACKEND);
+            pass the same name as `backend` to disable the fallback
+        executor: Optional process pool to fan page chunks out to
+            (only used when `source` is a path)
+        workers: How many chunks to split the pages into for `executor`
+
+    Returns:
+        Extracted text or None if nothing could be extracted
+
+    Raises:
+        Exception: Whatever the backend raises for unreadable files
+    """
+    backend = backend or PDF_BACKEND
+    fallback = fallback or PDF_FALLBACK_BACKEND
+
+    if executor is not None and isinstance(source, str):
+        # Keep every PDFium call in the worker processes
+        total_pages = executor.submit(page_count, source).result()
+    else:
+        total_pages = page_count(source)
+
+    pages = list(range(total_pages))
+    texts = _run_chunks(source, backend, pages, executor, workers)
+    scores = [text_quality(text) for text in texts]
+
+    retry = [i for i, score in enumerate(scores) if score < PDF_MIN_QUALITY and texts[i].strip()]
+    if retry and fallback != backend:
+        logger.info(f"Re-extracting {len(retry)}/{len(pages)} low-quality PDF pages with {fallback}")
+        try:
+            retried = _run_chunks(source, fallback, retry, executor, workers)
+        except Exception as e:
+            logger.warning(f"PDF fallback backend {fallback} failed: {str(e)}")
+            retried = []
+        for index, text in zip(retry, retried):
+            score = text_quality(text)
+            if score > scores[index]:
+                texts[index], scores[index] = text, score
+
+    full_text = "\n".join(text.strip() for text in texts if text.strip())
+    return full_text or None
@@ -0,0 +1,153 @@
+# app/utils/portfolio_cache.py
+"""
+Pre-serialized public portfolio snapshots.
+
+Public portfolios are read far more often than they change, so the rendered
+JSON body is cached per username together with its ETag and the user's
+content_version. A snapshot is only served for the version the caller
+read from the database, so a worker whose copy predates an edit (made on
+another worker, or racing with the read that stored it) misses instead
+of serving stale data. Invalidation on write (see app.crud.portfolio)
+only frees the entry early.
+
+Backends:
+- in-process LRU with TTL (default)
+- Redis, shared between workers, when PORTFOLIO_CACHE_URL is set and the
+  `redis` package is installed
+"""
+import os
+import json
+import time
+import logging
+import threading
+from collections import OrderedDict
+from typing import NamedTuple, Optional
+
+try:
+    import redis
+except ImportError:  # optional dependency
+    redis = None
+
+logger = logging.getLogger(__name__)
+
+PORTFOLIO_CACHE_URL = os.getenv("PORTFOLIO_CACHE_URL")
+PORTFOLIO_CACHE_MAX_ENTRIES = int(os.getenv("PORTFOLIO_CACHE_MAX_ENTRIES", "1024"))
+PORTFOLIO_CACHE_TTL = int(os.getenv("PORTFOLIO_CACHE_TTL", "300"))  # seconds
+
+
+class PortfolioSnapshot(NamedTuple):
+    body: bytes
+    etag: str
+    content_version: int
+
+
+class LRUBackend:
+    """Thread-safe in-process LRU with per-entry TTL."""
+
+    def __init__(self, max_entries: int, ttl: int):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self._entries: "OrderedDict[str, tuple[float, PortfolioSnapshot]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> Optional[PortfolioSnapshot]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            expires_at, snapshot = entry
+            if expires_at < time.monotonic():
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return snapshot
+
+    def set(self, key: str, snapshot: PortfolioSnapshot) -> None:
+        with self._lock:
+            self._entries[key] = (time.monotonic() + self.ttl, snapshot)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def delete(self, key: str) -> None:
+        with self._lock:
+            self._entries.pop(key, None)
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+class RedisBackend:
+    """Shared backend storing `content_version\\netag\\nbody` under a prefixed key."""
+
+    prefix = "portfolio:snapshot:v2:"
+
+    def __init__(self, url: str, ttl: int):
+        self.client = redis.Redis.from_url(url)
+        self.ttl = ttl
+
+    def get(self, key: str) -> Optional[PortfolioSnapshot]:
+        try:
+            raw = self.client.get(self.prefix + key)
+        except redis.RedisError as e:
+            logger.warning(f"Portfolio cache read failed: {str(e)}")
+            return None
+        if raw is None:
+            return None
+        content_version, etag, body = raw.split(b"\n", 2)
+        return PortfolioSnapshot(body=body, etag=etag.decode(), content_version=int(content_version))
+
+    def set(self, key: str, snapshot: PortfolioSnapshot) -> None:
+        try:
+            header = f"{snapshot.content_version}\n{snapshot.etag}\n".encode()
+            self.client.set(self.prefix + key, header + snapshot.body, ex=self.ttl)
+        except redis.RedisError as e:
+            logger.warning(f"Portfolio cache write failed: {str(e)}")
+
+    def delete(self, key: str) -> None:
+        try:
+            self.client.delete(self.prefix + key)
+        except redis.RedisError as e:
+            logger.warning(f"Portfolio cache invalidation failed: {str(e)}")
+
+
+def _build_backend():
+    if PORTFOLIO_CACHE_URL:
+        if redis is None:
+            logger.warning("PORTFOLIO_CACHE_URL is set but redis is not installed; using in-process cache")
+        else:
+            return RedisBackend(PORTFOLIO_CACHE_URL, PORTFOLIO_CACHE_TTL)
+    return LRUBackend(PORTFOLIO_CACHE_MAX_ENTRIES, PORTFOLIO_CACHE_TTL)
+
+
+backend = _build_backend()
+
+
+def _key(username: str) -> str:
+    return username.lower()
+
+
+def get_snapshot(username: str, content_version: int) -> Optional[PortfolioSnapshot]:
+    """The cached snapshot if it is of `content_version`, the user's current one."""
+    snapshot = backend.get(_key(username))
+    if snapshot is None or snapshot.content_version != content_version:
+        return None
+    return snapshot
+
+
+def store_snapshot(username: str, content_version: int, portfolio_data: dict, etag: str) -> PortfolioSnapshot:
+    """
+    Serialize portfolio data once and cache the bytes with their ETag.
+    Never replaces a snapshot of a newer version, e.g. when a slow read
+    finishes after a later edit was already cached.
+    """
+    body = json.dumps(portfolio_data, separators=(",", ":"), default=str).encode()
+    snapshot = PortfolioSnapshot(body=body, etag=etag, content_version=content_version)
+    current = backend.get(_key(username))
+    if current is None or current.content_version <= content_version:
+        backend.set(_key(username), snapshot)
+    return snapshot
+
+
+def invalidate_portfolio(username: str) -> None:
+    backend.delete(_key(username))
@@ -0,0 +1,96 @@
+# app/utils/resume_cache.py
+"""
+Content-hash cache for resume parsing.
+
+Two levels, both in-process LRUs with TTL:
+- file level: SHA-256 of the uploaded bytes (hex, computed while the
+  upload streams in) -> extracted text, so a re-upload of the same file
+  skips extraction
+- parse level: SHA-256 of the normalized text + PROMPT_VERSION ->
+  validated ResumeExtractedData, so identical text (even from a
+  different file) skips the LLM call
+
+Both levels are needed for a duplicate upload to skip all work.
+"""
+import os
+import re
+import hashlib
+import threading
+from typing import Optional
+
+from app.schemas.resume import ResumeExtractedData
+from app.utils.groq_resume_parser import PROMPT_VERSION
+from app.utils.portfolio_cache import LRUBackend
+
+RESUME_CACHE_MAX_ENTRIES = int(os.getenv("RESUME_CACHE_MAX_ENTRIES", "256"))
+RESUME_CACHE_TTL = int(os.getenv("RESUME_CACHE_TTL", str(24 * 60 * 60)))  # seconds
+
+_WHITESPACE_RE = re.compile(r"\s+")
+
+_files = LRUBackend(RESUME_CACHE_MAX_ENTRIES, RESUME_CACHE_TTL)
+_parses = LRUBackend(RESUME_CACHE_MAX_ENTRIES, RESUME_CACHE_TTL)
+
+_counters = {"file_hits": 0, "file_misses": 0, "parse_hits": 0, "parse_misses": 0}
+_counters_lock = threading.Lock()
+
+
+def _count(name: str) -> None:
+    with _counters_lock:
+        _counters[name] += 1
+
+
+def text_key(resume_text: str) -> str:
+    """Hash of the text with whitespace collapsed, scoped to the current prompt."""
+    normalized = _WHITESPACE_RE.sub(" ", resume_text).strip()
+    return f"{PROMPT_VERSION}:{hashlib.sha256(normalized.encode()).hexdigest()}"
+
+
+def get_text(key: str) -> Optional[str]:
+    resume_text = _files.get(key)
+    _count("file_hits" if resume_text is not None else "file_misses")
+    return resume_text
+
+
+def store_text(key: str, resume_text: str) -> None:
+    _files.set(key, resume_text)
+
+
+def get_parse(key: str) -> Optional[ResumeExtractedData]:
+    data = _parses.get(key)
+    _count("parse_hits" if data is not None else "parse_misses")
+    # Callers get their own copy so the cached model is never mutated
+    return data.model_copy(deep=True) if data is not None else None
+
+
+def store_parse(key: str, data: ResumeExtractedData) -> None:
+    _parses.set(key, data.model_copy(deep=True))
+
+
+def lookup(file_key: str):
+    """
+    Fully cached result for an upload: (resume_text, extracted_data),
+    or None if either level misses. Only full hits are counted; on a miss
+    the parsing job does its own (counted) lookups.
+    """
+    resume_text = _files.get(file_key)
+    if resume_text is None:
+        return None
+    data = _parses.get(text_key(resume_text))
+    if data is None:
+        return None
+    _count("file_hits")
+    _count("parse_hits")
+    return resume_text, data.model_copy(deep=True)
+
+
+def stats() -> dict:
+    with _counters_lock:
+        counters = dict(_counters)
+    return {
+        **counters,
+        "file_entries": len(_files),
+        "parse_entries": len(_parses),
+        "max_entries": RESUME_CACHE_MAX_ENTRIES,
+        "ttl": RESUME_CACHE_TTL,
+        "prompt_version": PROMPT_VERSION,
+    }
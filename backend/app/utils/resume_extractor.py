@@ -2,35 +2,34 @@
 """
 Text extraction utilities for PDF and DOCX resume files.
 """
-import PyPDF2
+from concurrent.futures import Executor
 from docx import Document
-from typing import Optional
+from typing import BinaryIO, Optional, Union
 import logging
-from io import BytesIO
+
+from app.utils.pdf_text import extract_pdf_text
 
 logger = logging.getLogger(__name__)
 
 
-def extract_text_from_pdf(file_bytes: BytesIO) -> Optional[str]:
+def extract_text_from_pdf(
+    file_bytes: Union[str, BinaryIO],
+    executor: Optional[Executor] = None,
+    workers: int = 1,
+) -> Optional[str]:
     """
-    Extract text from PDF file bytes.
+    Extract text from PDF file bytes (see app.utils.pdf_text for backends).
     
     Args:
-        file_bytes: BytesIO object containing PDF file data
+        file_bytes: Path to, or file-like object containing, PDF file data
+        executor: Optional process pool to extract page chunks in parallel
+        workers: Number of page chunks to split across `executor`
         
     Returns:
         Extracted text string or None if extraction fails
     """
     try:
-        pdf_reader = PyPDF2.PdfReader(file_bytes)
-        text_parts = []
-        
-        for page in pdf_reader.pages:
-            page_text = page.extract_text()
-            if page_text:
-                text_parts.append(page_text)
-        
-        full_text = "\n".join(text_parts).strip()
+        full_text = extract_pdf_text(file_bytes, executor=executor, workers=workers)
         
         if not full_text:
             logger.warning("PDF text extraction returned empty string")
@@ -44,12 +43,12 @@ def extract_text_from_pdf(file_bytes: BytesIO) -> Optional[str]:
         return None
 
 
-def extract_text_from_docx(file_bytes: BytesIO) -> Optional[str]:
+def extract_text_from_docx(file_bytes: Union[str, BinaryIO]) -> Optional[str]:
     """
     Extract text from DOCX file bytes.
     
     Args:
-        file_bytes: BytesIO object containing DOCX file data
+        file_bytes: Path to, or file-like object containing, DOCX file data
         
     Returns:
         Extracted text string or None if extraction fails
@@ -84,12 +83,12 @@ def extract_text_from_docx(file_bytes: BytesIO) -> Optional[str]:
         return None
 
 
-def extract_text(file_bytes: BytesIO, file_type: str) -> Optional[str]:
+def extract_text(file_bytes: Union[str, BinaryIO], file_type: str) -> Optional[str]:
     """
     Extract text from resume file based on type.
     
     Args:
-        file_bytes: BytesIO object containing file data
+        file_bytes: Path to, or file-like object containing, the file data
         file_type: File extension ('pdf' or 'docx')
         
     Returns:
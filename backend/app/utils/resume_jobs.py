@@ -0,0 +1,213 @@
+# app/utils/resume_jobs.py
+"""
+Background resume parsing jobs.
+
+An upload is spooled to a temporary file (see app.utils.upload_stream),
+then a `Resume` row is created with status 'queued' and run_resume_job is
+scheduled. The job runs text extraction (CPU-bound PDFium /
+pdfplumber / python-docx) in a process pool, with the pages of a long
+PDF split across workers, and the Groq call on async I/O, then
+writes the result or a user-facing error back to the row. Clients poll
+GET /api/v1/resumes/jobs/{id}. Both steps are skipped for content seen
+before (see app.utils.resume_cache).
+
+Jobs live in the worker that accepted the upload, so a restart or crash
+loses them. Rows still 'queued' or 'processing' RESUME_JOB_STALE_AFTER
+seconds after their last update are marked 'failed' with a retry
+message, on startup and when such a job is polled.
+
+Concurrency limits:
+- RESUME_EXTRACT_WORKERS: extraction processes (default 2)
+- RESUME_PARSE_CONCURRENCY: simultaneous Groq requests per worker (default 8,
+  enforced in app.utils.groq_resume_parser; one resume makes one request
+  per section)
+"""
+import os
+import time
+import asyncio
+import logging
+import multiprocessing
+from datetime import datetime, timedelta
+from concurrent.futures import ProcessPoolExecutor
+from typing import Optional
+
+from sqlalchemy import update
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.database import AsyncSessionLocal
+from app.models.resume import Resume
+from app.utils.resume_extractor import extract_text, extract_text_from_pdf
+from app.utils.groq_resume_parser import parse_resume_with_groq
+from app.utils import resume_cache
+from app.utils.upload_stream import discard_upload
+
+logger = logging.getLogger(__name__)
+
+RESUME_EXTRACT_WORKERS = int(os.getenv("RESUME_EXTRACT_WORKERS", "2"))
+RESUME_JOB_STALE_AFTER = int(os.getenv("RESUME_JOB_STALE_AFTER", "600"))  # seconds
+
+PENDING_STATUSES = ("queued", "processing")
+STALE_JOB_ERROR = "Resume parsing was interrupted. Please upload the file again."
+
+_process_pool: Optional[ProcessPoolExecutor] = None
+
+
+class ResumeJobError(Exception):
+    """Job failure with a message that is safe to show to the user."""
+
+
+def _get_process_pool() -> ProcessPoolExecutor:
+    # Created lazily so importing this module never starts processes.
+    # Workers come from a forkserver, not a fork of the running server
+    # with its event loop, threads and open sockets.
+    global _process_pool
+    if _process_pool is None:
+        _process_pool = ProcessPoolExecutor(
+            max_workers=RESUME_EXTRACT_WORKERS,
+            mp_context=multiprocessing.get_context("forkserver"),
+        )
+    return _process_pool
+
+
+def shutdown_process_pool() -> None:
+    """Stop the extraction workers; called from the app lifespan on exit."""
+    global _process_pool
+    if _process_pool is not None:
+        _process_pool.shutdown(wait=True, cancel_futures=True)
+        _process_pool = None
+
+
+def _extract_text_worker(file_path: str, file_ext: str) -> Optional[str]:
+    """Runs in a worker process; reads the spooled upload from disk."""
+    return extract_text(file_path, file_ext)
+
+
+def _extract_text(file_path: str, file_ext: str) -> Optional[str]:
+    """
+    Runs in a thread that only waits on the process pool: PDF page chunks
+    (and the fallback pass) are submitted individually, DOCX goes whole.
+    """
+    pool = _get_process_pool()
+    if file_ext == ".pdf":
+        return extract_text_from_pdf(file_path, executor=pool, workers=RESUME_EXTRACT_WORKERS)
+    return pool.submit(_extract_text_worker, file_path, file_ext).result()
+
+
+def job_is_stale(resume: Resume) -> bool:
+    """A pending job nobody has touched for RESUME_JOB_STALE_AFTER seconds."""
+    return (
+        resume.status in PENDING_STATUSES
+        and resume.updated_at is not None
+        and resume.updated_at < datetime.utcnow() - timedelta(seconds=RESUME_JOB_STALE_AFTER)
+    )
+
+
+async def expire_stale_jobs(db: AsyncSession, resume_id: Optional[int] = None) -> int:
+    """
+    Mark stale pending jobs (all, or just `resume_id`) as failed; commits.
+    The conditions are rechecked in the UPDATE, so a job that finishes
+    meanwhile is left alone. Returns the number of jobs expired.
+    """
+    now = datetime.utcnow()
+    statement = (
+        update(Resume)
+        .where(
+            Resume.status.in_(PENDING_STATUSES),
+            Resume.updated_at < now - timedelta(seconds=RESUME_JOB_STALE_AFTER),
+        )
+        .values(status="failed", error=STALE_JOB_ERROR, updated_at=now)
+        .returning(Resume.id)
+    )
+    if resume_id is not None:
+        statement = statement.where(Resume.id == resume_id)
+    expired = (await db.execute(statement)).scalars().all()
+    await db.commit()
+    if expired:
+        logger.warning(f"Expired {len(expired)} interrupted resume job(s): {expired}")
+    return len(expired)
+
+
+async def expire_stale_jobs_on_startup() -> None:
+    """Fail the jobs a previous run of the server left behind."""
+    try:
+        async with AsyncSessionLocal() as db:
+            await expire_stale_jobs(db)
+    except Exception as e:
+        logger.error(f"Could not expire stale resume jobs: {str(e)}")
+
+
+async def _set_job_state(resume_id: int, **values) -> None:
+    async with AsyncSessionLocal() as db:
+        await db.execute(
+            update(Resume)
+            .where(Resume.id == resume_id)
+            .values(updated_at=datetime.utcnow(), **values)
+        )
+        await db.commit()
+
+
+async def _process(file_path: str, file_ext: str, file_key: str):
+    loop = asyncio.get_running_loop()
+
+    # Same bytes as an earlier upload: reuse the extracted text
+    resume_text = resume_cache.get_text(file_key)
+
+    if resume_text is None:
+        extraction_start = time.time()
+        resume_text = await loop.run_in_executor(None, _extract_text, file_path, file_ext)
+        logger.info(f"⏱️ TEXT EXTRACTION took {time.time() - extraction_start:.2f} seconds")
+
+        if not resume_text:
+            raise ResumeJobError(
+                "Failed to extract text from file. Please ensure the file is not corrupted or password-protected."
+            )
+        resume_cache.store_text(file_key, resume_text)
+
+    # Same text under the same prompt: reuse the validated parse
+    parse_key = resume_cache.text_key(resume_text)
+    extracted_data = resume_cache.get_parse(parse_key)
+
+    if extracted_data is None:
+        try:
+            llm_start = time.time()
+            extracted_data = await parse_resume_with_groq(resume_text)
+            logger.info(f"⏱️ GROQ PARSING took {time.time() - llm_start:.2f} seconds")
+        except ValueError as e:
+            # Validation or JSON parsing error
+            raise ResumeJobError(f"Resume parsing failed: {str(e)}")
+        resume_cache.store_parse(parse_key, extracted_data)
+
+    return resume_text, extracted_data
+
+
+async def run_resume_job(resume_id: int, file_path: str, file_ext: str, file_key: str) -> None:
+    """
+    Parse a spooled resume upload and record the outcome on its row.
+    `file_key` is the SHA-256 of the file; the file is deleted afterwards.
+    """
+    try:
+        await _set_job_state(resume_id, status="processing")
+        resume_text, extracted_data = await _process(file_path, file_ext, file_key)
+    except ResumeJobError as e:
+        logger.error(f"Resume job {resume_id} failed: {str(e)}")
+        await _set_job_state(resume_id, status="failed", error=str(e))
+        return
+    except Exception as e:
+        logger.error(f"Resume job {resume_id} failed: {str(e)}", exc_info=True)
+        await _set_job_state(
+            resume_id,
+            status="failed",
+            error="Resume parsing failed. Please try again or contact support.",
+        )
+        return
+    finally:
+        discard_upload(file_path)
+
+    await _set_job_state(
+        resume_id,
+        status="completed",
+        extracted_text=resume_text,
+        parsed_data=extracted_data.model_dump(),  # Pydantic v2
+        error=None,
+    )
+    logger.info(f"Resume job {resume_id} completed")
@@ -85,7 +85,7 @@ async def parse_resume_with_ai(resume_text: str) -> ResumeExtractedData:
         
         # Call LLM with optimized parameters for SPEED
         system_message = "Return ONLY valid JSON. No extra text."
-        llm_response = call_llm(
+        llm_response = await call_llm(
             prompt=prompt,
             max_tokens=2000,  # Reduced for faster response
             temperature=0.1,  # Very low for consistent JSON
@@ -115,51 +115,3 @@ async def parse_resume_with_ai(resume_text: str) -> ResumeExtractedData:
     except Exception as e:
         logger.error(f"Resume parsing failed: {str(e)}", exc_info=True)
         raise
-
-
-# For backwards compatibility, also export synchronous version
-def parse_resume_with_ai_sync(resume_text: str) -> ResumeExtractedData:
-    """
-    Synchronous version of parse_resume_with_ai.
-    
-    Note: This is a wrapper that doesn't actually use async,
-    since call_llm is synchronous (uses requests library).
-    """
-    try:
-        # Truncate resume text if too long
-        max_chars = 8000
-        if len(resume_text) > max_chars:
-            logger.warning(f"Resume text truncated from {len(resume_text)} to {max_chars} chars")
-            resume_text = resume_text[:max_chars]
-        
-        # Prepare prompt
-        prompt = RESUME_PARSING_PROMPT.format(resume_text=resume_text)
-        
-        # Call LLM
-        system_message = "You are a precise resume parser that returns only valid JSON."
-        llm_response = call_llm(
-            prompt=prompt,
-            max_tokens=4000,
-            temperature=0.1,
-            system_message=system_message
-        )
-        
-        if not llm_response:
-            raise ValueError("LLM returned empty response")
-        
-        # Parse JSON response
-        parsed_data = parse_json_response(llm_response)
-        
-        # Validate and convert to Pydantic model
-        extracted_data = ResumeExtractedData(**parsed_data)
-        
-        logger.info(
-            f"Successfully parsed resume: {len(extracted_data.projects)} projects, "
-            f"{len(extracted_data.skills)} skills, {len(extracted_data.achievements)} achievements"
-        )
-        
-        return extracted_data
-        
-    except Exception as e:
-        logger.error(f"Resume parsing failed: {str(e)}", exc_info=True)
-        raise
@@ -0,0 +1,170 @@
+# app/utils/resume_prefill.py
+"""
+Deterministic resume field extraction that runs before the LLM.
+
+- extract_contacts(): email, GitHub and LinkedIn handles and personal
+  website via regexes
+- match_skills(): skills from a taxonomy (app/data/skills_taxonomy.json)
+  via a token trie, longest match first, with the category taken from
+  the taxonomy
+
+Whatever is found here is left out of the LLM prompts (see
+app.utils.groq_resume_parser); match_skills() also returns the part of
+the text it could not resolve so only that is sent.
+"""
+import os
+import re
+import json
+import hashlib
+from typing import Dict, List, Optional, Tuple
+
+from app.schemas.resume import SkillCategory, SkillExtracted
+
+TAXONOMY_PATH = os.path.join(os.path.dirname(os.path.dirname(__file__)), "data", "skills_taxonomy.json")
+
+_EMAIL_RE = re.compile(r"[A-Za-z0-9._%+-]+@[A-Za-z0-9-]+(?:\.[A-Za-z0-9-]+)*\.[A-Za-z]{2,}")
+_GITHUB_URL_RE = re.compile(r"github\.com/([A-Za-z0-9](?:[A-Za-z0-9-]{0,38}))(?![A-Za-z0-9-])", re.I)
+_GITHUB_LABEL_RE = re.compile(r"\bgithub\s*[:|]\s*@?([A-Za-z0-9](?:[A-Za-z0-9-]{0,38}))\b", re.I)
+_LINKEDIN_RE = re.compile(r"linkedin\.com/in/([A-Za-z0-9_-]{3,100})", re.I)
+_URL_RE = re.compile(
+    r"\b(?:https?://)?(?:www\.)?[a-z0-9-]+(?:\.[a-z0-9-]+)*"
+    r"\.(?:com|dev|io|me|net|org|app|tech|site|xyz|co|ai|page|blog)\b(?:/[^\s,;|()]*)?",
+    re.I,
+)
+_NOT_WEBSITES = ("github.com", "linkedin.com", "gmail.com", "outlook.com", "yahoo.com", "hotmail.com")
+_GITHUB_RESERVED = {"orgs", "features", "topics", "about", "settings", "marketplace", "sponsors"}
+
+# Whole tokens: "c++", "c#", ".net", "node.js", "t-sql"; '/', ',', '&' etc. separate
+# Case-insensitive so offsets index the original text; lowercasing first
+# would shift them ("İ".lower() is two characters)
+_TOKEN_RE = re.compile(r"\.?[a-z0-9][a-z0-9+#.\-]*[a-z0-9+#]|\.?[a-z0-9][+#]*", re.IGNORECASE)
+_FRAGMENT_SPLIT_RE = re.compile(r"[,;|•·/()\[\]]+|\s-\s|:")
+
+# Labels and filler that are not skills on their own
+_FILLER = {
+    "languages", "language", "frameworks", "framework", "libraries", "library", "tools", "tool",
+    "technologies", "technology", "databases", "database", "cloud", "devops", "frontend", "backend",
+    "front-end", "back-end", "other", "others", "skills", "skill", "technical", "programming",
+    "and", "with", "in", "of", "familiar", "proficient", "experienced", "knowledge", "basic",
+    "basics", "advanced", "intermediate", "expert", "beginner", "etc", "platforms", "platform",
+    "concepts", "web", "development", "mobile", "testing", "core", "key", "ai", "ml", "data", "soft",
+}
+
+_END = "\0"
+
+
+def _tokens(text: str) -> List[Tuple[str, int, int]]:
+    return [(m.group().lower(), m.start(), m.end()) for m in _TOKEN_RE.finditer(text)]
+
+
+def _load_taxonomy(path: str):
+    with open(path, "rb") as f:
+        raw = f.read()
+    taxonomy = json.loads(raw)
+
+    trie: Dict = {}
+    categories: Dict[str, SkillCategory] = {}
+    for category_name, skills in taxonomy.items():
+        if category_name.startswith("_"):
+            continue
+        category = SkillCategory(category_name)
+        for name, aliases in skills.items():
+            for alias in [name, *aliases]:
+                words = [token for token, _, _ in _tokens(alias)]
+                if not words:
+                    continue
+                node = trie
+                for word in words:
+                    node = node.setdefault(word, {})
+                node[_END] = (name, category)
+                categories[" ".join(words)] = category
+    return trie, categories, hashlib.sha256(raw).hexdigest()[:16]
+
+
+_trie, _categories, TAXONOMY_VERSION = _load_taxonomy(TAXONOMY_PATH)
+
+
+def taxonomy_category(skill_name: str) -> Optional[SkillCategory]:
+    """Category of a known skill name or alias, else None."""
+    return _categories.get(" ".join(token for token, _, _ in _tokens(skill_name)))
+
+
+def match_skills(text: str) -> Tuple[List[SkillExtracted], str]:
+    """
+    Find taxonomy skills in text.
+
+    Returns:
+        (skills in order of first appearance, unresolved text) where the
+        unresolved text holds the comma-separated fragments left after
+        removing matches and filler labels, or "" if nothing is left
+    """
+    tokens = _tokens(text)
+    skills: List[SkillExtracted] = []
+    seen = set()
+    matched_spans: List[Tuple[int, int]] = []
+
+    i = 0
+    while i < len(tokens):
+        node = _trie
+        match = None
+        j = i
+        while j < len(tokens) and tokens[j][0] in node:
+            node = node[tokens[j][0]]
+            j += 1
+            if _END in node:
+                match = (j, node[_END])
+        if match is None:
+            i += 1
+            continue
+        end, (name, category) = match
+        matched_spans.append((tokens[i][1], tokens[end - 1][2]))
+        if name not in seen:
+            seen.add(name)
+            skills.append(SkillExtracted(name=name, category=category))
+        i = end
+
+    # Blank out matches and keep fragments that still contain something
+    chars = list(text)
+    for start, end in matched_spans:
+        chars[start:end] = " " * (end - start)
+    leftover = "".join(chars)
+
+    fragments = []
+    for line in leftover.splitlines():
+        for fragment in _FRAGMENT_SPLIT_RE.split(line):
+            words = [token for token, _, _ in _tokens(fragment)]
+            if any(word not in _FILLER and not word.isdigit() for word in words):
+                fragments.append(" ".join(fragment.split()))
+    return skills, ", ".join(fragments)
+
+
+def _website(text: str) -> str:
+    without_emails = _EMAIL_RE.sub(" ", text)
+    for match in _URL_RE.finditer(without_emails):
+        url = match.group().rstrip(".")
+        lowered = url.lower()
+        if any(domain in lowered for domain in _NOT_WEBSITES):
+            continue
+        return url if lowered.startswith(("http://", "https://")) else f"https://{url}"
+    return ""
+
+
+def _github(text: str) -> str:
+    for regex in (_GITHUB_URL_RE, _GITHUB_LABEL_RE):
+        for match in regex.finditer(text):
+            if match.group(1).lower() not in _GITHUB_RESERVED:
+                return match.group(1)
+    return ""
+
+
+def extract_contacts(text: str) -> Dict[str, str]:
+    """Contact fields found in text, keyed like ResumeExtractedData; missing ones are omitted."""
+    email = _EMAIL_RE.search(text)
+    linkedin = _LINKEDIN_RE.search(text)
+    contacts = {
+        "email": email.group() if email else "",
+        "github": _github(text),
+        "linkedin": linkedin.group(1).rstrip("/") if linkedin else "",
+        "website": _website(text),
+    }
+    return {field: value for field, value in contacts.items() if value}
@@ -0,0 +1,206 @@
+# app/utils/resume_sections.py
+"""
+Resume section segmentation and merging.
+
+segment_resume() splits extracted resume text at recognised section
+headings ("Work Experience", "SKILLS:", "Awards & Honors", ...) so each
+section can be parsed with its own small prompt (see
+app.utils.groq_resume_parser). merge_extracted() combines the partial
+results back into one ResumeExtractedData.
+
+Text before the first heading (name, contact line) goes to 'profile',
+together with summary, education and other sections that have no
+matching portfolio field.
+"""
+import re
+from typing import Dict, List, Optional, Tuple
+
+from app.schemas.resume import ResumeExtractedData
+
+# Section name -> headings that start it (compared after normalize_heading)
+SECTION_HEADINGS: Dict[str, Tuple[str, ...]] = {
+    "profile": (
+        "summary", "professional summary", "career summary", "profile", "professional profile",
+        "about", "about me", "objective", "career objective", "contact", "contact information",
+        "contact details", "personal details", "personal information", "education",
+        "academic background", "education & training", "languages", "interests", "hobbies",
+        "references",
+    ),
+    "experience": (
+        "experience", "work experience", "professional experience", "relevant experience",
+        "employment", "employment history", "work history", "career history", "internships",
+        "internship", "internship experience",
+    ),
+    "projects": (
+        "projects", "personal projects", "academic projects", "key projects", "selected projects",
+        "side projects", "project experience", "open source", "open source contributions",
+    ),
+    "skills": (
+        "skills", "technical skills", "core skills", "key skills", "skills & tools",
+        "skills & technologies", "technologies", "tech stack", "tools", "tools & technologies",
+        "competencies", "core competencies", "technical proficiencies", "programming languages",
+        "languages & frameworks",
+    ),
+    "certifications": (
+        "certifications", "certificates", "certification", "licenses & certifications",
+        "certifications & training", "courses", "training", "courses & certifications",
+    ),
+    "awards": (
+        "awards", "honors", "honours", "achievements", "accomplishments", "awards & honors",
+        "awards & achievements", "honors & awards", "hackathons", "competitions",
+        "extracurricular", "extracurricular activities", "activities", "leadership",
+        "volunteering", "volunteer experience", "publications",
+    ),
+}
+
+# Sections whose content becomes list fields of ResumeExtractedData
+LIST_SECTIONS = ("experience", "projects", "skills", "certifications", "awards")
+
+MAX_HEADING_CHARS = 40
+
+_HEADING_LOOKUP = {heading: section for section, headings in SECTION_HEADINGS.items() for heading in headings}
+_DECORATION_RE = re.compile(r"^[\W_]+|[\W_]+$")
+_INLINE_HEADING_RE = re.compile(r"^\s*([A-Za-z][A-Za-z &/]{1,38}?)\s*:\s*(\S.*)$")
+_PARAGRAPH_RE = re.compile(r"\n\s*\n")
+
+
+def normalize_heading(line: str) -> str:
+    """'WORK  EXPERIENCE:' -> 'work experience', 'Awards and Honors' -> 'awards & honors'."""
+    text = _DECORATION_RE.sub("", line.strip()).lower()
+    text = re.sub(r"\s+", " ", text)
+    return text.replace(" and ", " & ")
+
+
+def _heading_section(line: str) -> Tuple[Optional[str], str]:
+    """(section, rest of line) if the line is a heading, else (None, line)."""
+    stripped = line.strip()
+    if not stripped:
+        return None, line
+    if len(stripped) <= MAX_HEADING_CHARS:
+        section = _HEADING_LOOKUP.get(normalize_heading(stripped))
+        if section:
+            return section, ""
+    # "Skills: Python, Go, SQL" - heading and content on one line
+    match = _INLINE_HEADING_RE.match(stripped)
+    if match:
+        section = _HEADING_LOOKUP.get(normalize_heading(match.group(1)))
+        if section:
+            return section, match.group(2)
+    return None, line
+
+
+class ResumeSections:
+    """Result of segment_resume()."""
+
+    def __init__(self, sections: Dict[str, str], preamble_chars: int):
+        self.sections = sections
+        # Text before the first recognised heading; large values suggest
+        # headings the segmenter does not know
+        self.preamble_chars = preamble_chars
+
+    @property
+    def list_sections(self) -> List[str]:
+        return [name for name in LIST_SECTIONS if self.sections.get(name)]
+
+    def __repr__(self) -> str:
+        sizes = ", ".join(f"{name}={len(text)}" for name, text in self.sections.items())
+        return f"ResumeSections({sizes}, preamble={self.preamble_chars})"
+
+
+def segment_resume(resume_text: str) -> ResumeSections:
+    """
+    Split resume text into sections keyed by SECTION_HEADINGS names.
+    Repeated headings (e.g. two project lists) are concatenated in order.
+    """
+    parts: Dict[str, List[str]] = {}
+    current = "profile"
+    preamble_chars = 0
+    seen_heading = False
+
+    for line in resume_text.splitlines():
+        section, rest = _heading_section(line)
+        if section:
+            current = section
+            seen_heading = True
+            if rest:
+                parts.setdefault(current, []).append(rest)
+            continue
+        parts.setdefault(current, []).append(line)
+        if not seen_heading:
+            preamble_chars += len(line) + 1
+
+    sections = {name: "\n".join(lines).strip() for name, lines in parts.items()}
+    return ResumeSections({name: text for name, text in sections.items() if text}, preamble_chars)
+
+
+def split_text(text: str, max_chars: int) -> List[str]:
+    """
+    Split text into chunks of at most max_chars, preferring paragraph and
+    then line boundaries so entries are rarely cut in half.
+    """
+    if len(text) <= max_chars:
+        return [text]
+
+    pieces: List[str] = []
+    for paragraph in _PARAGRAPH_RE.split(text):
+        if len(paragraph) <= max_chars:
+            pieces.append(paragraph)
+            continue
+        for line in paragraph.splitlines():
+            while len(line) > max_chars:
+                pieces.append(line[:max_chars])
+                line = line[max_chars:]
+            pieces.append(line)
+
+    chunks: List[str] = []
+    current = ""
+    for piece in pieces:
+        candidate = f"{current}\n{piece}" if current else piece
+        if len(candidate) > max_chars and current:
+            chunks.append(current)
+            candidate = piece
+        current = candidate
+    if current.strip():
+        chunks.append(current)
+    return chunks
+
+
+def _key(*values: str) -> Tuple[str, ...]:
+    return tuple(re.sub(r"\W+", " ", (v or "")).strip().lower() for v in values)
+
+
+_LIST_FIELD_KEYS = {
+    "work_experience": lambda item: _key(item.title, item.company, item.duration),
+    "projects": lambda item: _key(item.title),
+    "skills": lambda item: _key(item.name),
+    "certifications": lambda item: _key(item.name, item.issuer),
+    "achievements": lambda item: _key(item.title, item.date),
+}
+
+_SCALAR_FIELDS = ("name", "title", "location", "email", "about", "github", "linkedin", "website")
+
+
+def merge_extracted(parts: List[ResumeExtractedData]) -> ResumeExtractedData:
+    """
+    Combine partial parses in order: the first non-empty value wins for
+    profile fields, list fields are concatenated with duplicates (same
+    normalized title/name) dropped.
+    """
+    merged = ResumeExtractedData()
+    for part in parts:
+        for field in _SCALAR_FIELDS:
+            if not getattr(merged, field) and getattr(part, field):
+                setattr(merged, field, getattr(part, field))
+
+    for field, key in _LIST_FIELD_KEYS.items():
+        seen = set()
+        items = []
+        for part in parts:
+            for item in getattr(part, field):
+                item_key = key(item)
+                if item_key in seen:
+                    continue
+                seen.add(item_key)
+                items.append(item)
+        setattr(merged, field, items)
+    return merged
@@ -1,7 +1,9 @@
 import bleach
+import hmac
 import os
+from typing import Optional
 from pydantic import BaseModel
-from fastapi import Depends, Request
+from fastapi import Depends, Header, HTTPException, Request
 from fastapi_csrf_protect import CsrfProtect
 
 class CSRFConfig(BaseModel):
@@ -22,6 +24,22 @@ def validate_csrf(request: Request, csrf_protect: CsrfProtect = Depends()):
     """
     csrf_protect.validate_csrf(request)
 
+# Shared secret the scheduler sends to the operational /cron endpoints;
+# when unset those endpoints refuse every request
+CRON_SECRET = os.getenv("CRON_SECRET")
+
+def has_cron_secret(secret: Optional[str]) -> bool:
+    # Bytes: compare_digest rejects non-ASCII str, and header values are latin-1
+    return bool(CRON_SECRET) and secret is not None and hmac.compare_digest(secret.encode(), CRON_SECRET.encode())
+
+def require_cron_secret(x_cron_secret: Optional[str] = Header(None)):
+    """
+    Dependency for operational endpoints: requires the X-Cron-Secret header
+    to match CRON_SECRET.
+    """
+    if not has_cron_secret(x_cron_secret):
+        raise HTTPException(status_code=403, detail="Forbidden")
+
 def sanitize_html(text: str) -> str:
     """
     Strips all HTML tags and dangerous characters from a string.
@@ -0,0 +1,250 @@
+# app/utils/upload_stream.py
+"""
+Streaming multipart upload for resume files.
+
+Starlette's UploadFile only becomes available after the whole request
+body has been parsed, and reading it back puts the whole file in memory.
+receive_upload() instead parses the raw request stream with
+python-multipart and:
+- rejects on Content-Length before reading anything when it is too large
+- checks the extension as soon as the part headers arrive
+- checks the magic bytes from the first bytes of the file
+- aborts as soon as the file exceeds the size limit
+- writes chunks straight to a temporary file, hashing as it goes
+
+The caller owns the returned temporary file and must delete it.
+"""
+import os
+import hashlib
+import logging
+import tempfile
+from typing import Dict, NamedTuple, Optional
+
+from fastapi import Request, status
+from multipart.multipart import MultipartParser, parse_options_header
+
+logger = logging.getLogger(__name__)
+
+UPLOAD_TMP_DIR = os.getenv("UPLOAD_TMP_DIR") or None  # None = system temp dir
+
+# Headers, boundaries and small form fields around the file itself
+MULTIPART_OVERHEAD = 64 * 1024
+
+# Leading bytes each accepted extension must start with (DOCX is a zip archive)
+MAGIC_BYTES: Dict[str, bytes] = {
+    ".pdf": b"%PDF-",
+    ".docx": b"PK\x03\x04",
+}
+
+
+class UploadRejected(Exception):
+    """The upload was refused; carries the HTTP status and a user-facing detail."""
+
+    def __init__(self, status_code: int, detail: str):
+        super().__init__(detail)
+        self.status_code = status_code
+        self.detail = detail
+
+
+class SpooledUpload(NamedTuple):
+    path: str
+    filename: str
+    file_ext: str
+    size: int
+    sha256: str
+
+
+def discard_upload(path: Optional[str]) -> None:
+    if path:
+        try:
+            os.unlink(path)
+        except FileNotFoundError:
+            pass
+
+
+class _FilePartReceiver:
+    """python-multipart callbacks that spool one named file field to disk."""
+
+    def __init__(self, field_name: str, max_bytes: int):
+        self.field_name = field_name
+        self.max_bytes = max_bytes
+        self.upload: Optional[SpooledUpload] = None
+
+        self._header_field = b""
+        self._header_value = b""
+        self._headers: Dict[bytes, bytes] = {}
+        self._in_file_part = False
+        self._filename = ""
+        self._file_ext = ""
+        self._file = None
+        self._path: Optional[str] = None
+        self._head = b""
+        self._size = 0
+        self._digest = hashlib.sha256()
+
+    @property
+    def callbacks(self) -> dict:
+        return {
+            "on_part_begin": self.on_part_begin,
+            "on_header_field": self.on_header_field,
+            "on_header_value": self.on_header_value,
+            "on_header_end": self.on_header_end,
+            "on_headers_finished": self.on_headers_finished,
+            "on_part_data": self.on_part_data,
+            "on_part_end": self.on_part_end,
+        }
+
+    def _reject(self, status_code: int, detail: str) -> None:
+        # Raising out of a callback stops the parser; receive_upload cleans up
+        raise UploadRejected(status_code, detail)
+
+    def on_part_begin(self) -> None:
+        self._headers = {}
+        self._in_file_part = False
+
+    def on_header_field(self, data: bytes, start: int, end: int) -> None:
+        self._header_field += data[start:end]
+
+    def on_header_value(self, data: bytes, start: int, end: int) -> None:
+        self._header_value += data[start:end]
+
+    def on_header_end(self) -> None:
+        self._headers[self._header_field.lower()] = self._header_value
+        self._header_field = b""
+        self._header_value = b""
+
+    def on_headers_finished(self) -> None:
+        _, options = parse_options_header(self._headers.get(b"content-disposition", b""))
+        if options.get(b"name", b"").decode("latin-1") != self.field_name:
+            return
+        if self.upload is not None or self._file is not None:
+            self._reject(status.HTTP_422_UNPROCESSABLE_ENTITY, "Please upload a single file.")
+
+        filename = os.path.basename(options.get(b"filename", b"").decode("utf-8", "replace"))
+        if not filename:
+            self._reject(
+                status.HTTP_422_UNPROCESSABLE_ENTITY,
+                "No file provided. Please upload a PDF or DOCX file.",
+            )
+
+        file_ext = os.path.splitext(filename)[1].lower()
+        if file_ext not in MAGIC_BYTES:
+            self._reject(
+                status.HTTP_415_UNSUPPORTED_MEDIA_TYPE,
+                f"File type '{file_ext}' not supported. Please upload PDF or DOCX files only.",
+            )
+
+        self._in_file_part = True
+        self._filename = filename
+        self._file_ext = file_ext
+        self._file = tempfile.NamedTemporaryFile(
+            prefix="resume-", suffix=file_ext, dir=UPLOAD_TMP_DIR, delete=False
+        )
+        self._path = self._file.name
+
+    def on_part_data(self, data: bytes, start: int, end: int) -> None:
+        if not self._in_file_part:
+            return
+        chunk = data[start:end]
+
+        self._size += len(chunk)
+        if self._size > self.max_bytes:
+            self._reject(
+                status.HTTP_422_UNPROCESSABLE_ENTITY,
+                f"File exceeds {self.max_bytes // (1024 * 1024)}MB limit",
+            )
+
+        magic = MAGIC_BYTES[self._file_ext]
+        if len(self._head) < len(magic):
+            self._head += chunk[:len(magic) - len(self._head)]
+            if len(self._head) == len(magic) and self._head != magic:
+                self._reject(
+                    status.HTTP_415_UNSUPPORTED_MEDIA_TYPE,
+                    f"File content does not match its '{self._file_ext}' extension.",
+                )
+
+        self._digest.update(chunk)
+        self._file.write(chunk)
+
+    def on_part_end(self) -> None:
+        if not self._in_file_part:
+            return
+        self._in_file_part = False
+        self._file.close()
+        self._file = None
+
+        if self._head != MAGIC_BYTES[self._file_ext]:
+            # Ended before enough bytes arrived to check the signature
+            self._reject(
+                status.HTTP_422_UNPROCESSABLE_ENTITY,
+                "Uploaded file is empty or truncated.",
+            )
+
+        self.upload = SpooledUpload(
+            path=self._path,
+            filename=self._filename,
+            file_ext=self._file_ext,
+            size=self._size,
+            sha256=self._digest.hexdigest(),
+        )
+
+    def cleanup(self) -> None:
+        if self._file is not None:
+            self._file.close()
+        discard_upload(self._path)
+
+
+async def receive_upload(request: Request, max_bytes: int, field_name: str = "file") -> SpooledUpload:
+    """
+    Stream a multipart/form-data body and spool `field_name` to a temp file.
+
+    Raises:
+        UploadRejected: If the body is too large, not a PDF/DOCX, or malformed
+    """
+    content_type, params = parse_options_header(request.headers.get("content-type", ""))
+    boundary = params.get(b"boundary")
+    if content_type != b"multipart/form-data" or not boundary:
+        raise UploadRejected(
+            status.HTTP_422_UNPROCESSABLE_ENTITY,
+            "No file provided. Please upload a PDF or DOCX file.",
+        )
+
+    content_length = request.headers.get("content-length")
+    if content_length and content_length.isdigit() and int(content_length) > max_bytes + MULTIPART_OVERHEAD:
+        raise UploadRejected(
+            status.HTTP_422_UNPROCESSABLE_ENTITY,
+            f"File exceeds {max_bytes // (1024 * 1024)}MB limit",
+        )
+
+    receiver = _FilePartReceiver(field_name, max_bytes)
+    parser = MultipartParser(boundary, receiver.callbacks)
+    body_limit = max_bytes + MULTIPART_OVERHEAD
+    received = 0
+
+    try:
+        async for chunk in request.stream():
+            # Also bounds bodies without Content-Length (chunked) or with large extra fields
+            received += len(chunk)
+            if received > body_limit:
+                raise UploadRejected(
+                    status.HTTP_422_UNPROCESSABLE_ENTITY,
+                    f"File exceeds {max_bytes // (1024 * 1024)}MB limit",
+                )
+            parser.write(chunk)
+        parser.finalize()
+    except UploadRejected:
+        receiver.cleanup()
+        raise
+    except Exception as e:
+        receiver.cleanup()
+        logger.error(f"Failed to read uploaded file: {str(e)}")
+        raise UploadRejected(status.HTTP_422_UNPROCESSABLE_ENTITY, "Failed to read uploaded file")
+
+    if receiver.upload is None:
+        receiver.cleanup()
+        raise UploadRejected(
+            status.HTTP_422_UNPROCESSABLE_ENTITY,
+            "No file provided. Please upload a PDF or DOCX file.",
+        )
+
+    return receiver.upload
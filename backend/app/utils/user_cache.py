@@ -0,0 +1,62 @@
+# app/utils/user_cache.py
+"""
+Short-lived in-process cache of user rows for routes that need the full
+User (not just the token claims).
+
+Entries are plain column dicts, never ORM instances, so nothing is shared
+between sessions or threads. A hit is attached to the request's session
+with `merge(load=False)`, which issues no SELECT. Anything that writes to
+the user row must call invalidate_user().
+
+user_exists() backs the token-only auth path: a token outlives a deleted
+account, so the principal is checked against a cached existence flag
+(one primary-key lookup per user per USER_CACHE_TTL).
+"""
+import os
+from typing import Optional
+
+from sqlalchemy import select
+from sqlalchemy.orm import Session, make_transient_to_detached
+
+from app.database import SessionLocal
+from app.models.user import User
+from app.utils.portfolio_cache import LRUBackend
+
+USER_CACHE_MAX_ENTRIES = int(os.getenv("USER_CACHE_MAX_ENTRIES", "4096"))
+USER_CACHE_TTL = int(os.getenv("USER_CACHE_TTL", "30"))  # seconds
+
+_columns = [column.key for column in User.__mapper__.column_attrs]
+_cache = LRUBackend(USER_CACHE_MAX_ENTRIES, USER_CACHE_TTL)
+_exists = LRUBackend(USER_CACHE_MAX_ENTRIES, USER_CACHE_TTL)
+
+
+def get_user(db: Session, user_id: int) -> Optional[User]:
+    """Return the user attached to `db`, from the cache when possible."""
+    values = _cache.get(str(user_id))
+    if values is not None:
+        user = User(**values)
+        make_transient_to_detached(user)
+        return db.merge(user, load=False)
+
+    user = db.get(User, user_id)
+    if user is not None:
+        _cache.set(str(user_id), {key: getattr(user, key) for key in _columns})
+    return user
+
+
+def user_exists(user_id: int) -> bool:
+    """Whether the user row still exists, from the cache when possible."""
+    key = str(user_id)
+    if _cache.get(key) is not None:
+        return True
+    exists = _exists.get(key)
+    if exists is None:
+        with SessionLocal() as db:
+            exists = db.execute(select(User.id).where(User.id == user_id)).first() is not None
+        _exists.set(key, exists)
+    return exists
+
+
+def invalidate_user(user_id: int) -> None:
+    _cache.delete(str(user_id))
+    _exists.delete(str(user_id))
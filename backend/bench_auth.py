@@ -0,0 +1,126 @@
+"""
+Measures the authenticated list endpoints under the two auth paths:
+
+- select: what every request used to do - decode the token, then
+  SELECT the user row by email
+- principal: get_current_principal - token claims plus the cached
+  existence check from app.utils.user_cache (one primary-key lookup
+  per user per USER_CACHE_TTL)
+
+Requests go through the full app in-process (TestClient) against
+DATABASE_URL, as a throwaway user with --rows rows per list that is
+deleted afterwards. Reports median and p95 latency per request and the
+number of SQL statements each one issued on either engine.
+
+    python bench_auth.py [--iterations 300] [--rows 20]
+"""
+import time
+import uuid
+import argparse
+import statistics
+
+from fastapi import Depends, HTTPException
+from fastapi.testclient import TestClient
+from jose import jwt
+from sqlalchemy import event, delete
+from sqlalchemy.orm import Session
+
+from app.main import app
+from app.database import SessionLocal, engine, async_engine, get_db
+from app import models
+from app.dependencies.auth_user import CurrentPrincipal, get_current_principal, oauth2_scheme
+from app.utils.auth import SECRET_KEY, ALGORITHM, create_access_token
+
+ENDPOINTS = [
+    "/skills/",
+    "/projects/",
+    "/achievements/work-experience",
+    "/achievements/certificates",
+    "/achievements/awards",
+]
+
+ROWS = (
+    (models.Skill, "user_id", lambda n: {"name": f"Skill {n}", "category": "Backend", "level": "Advanced", "experience": "1y"}),
+    (models.Project, "owner_id", lambda n: {"title": f"Project {n}", "description": "d", "type": "others", "stack": ["py"], "features": ["f"]}),
+    (models.WorkExperience, "user_id", lambda n: {"title": f"Role {n}", "organization": "Company"}),
+    (models.Certificate, "user_id", lambda n: {"title": f"Certificate {n}", "issuer": "Issuer"}),
+    (models.Award, "user_id", lambda n: {"title": f"Award {n}"}),
+)
+
+statements = 0
+
+
+def _count(conn, cursor, statement, parameters, context, executemany):
+    global statements
+    statements += 1
+
+
+def _select_principal(token: str = Depends(oauth2_scheme), db: Session = Depends(get_db)) -> CurrentPrincipal:
+    """The old path: token, then the user row on every request."""
+    payload = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
+    user = db.query(models.User).filter(models.User.email == payload.get("sub")).first()
+    if not user:
+        raise HTTPException(status_code=401, detail="User not found")
+    return CurrentPrincipal(id=user.id, email=user.email, username=user.username)
+
+
+def _measure(client, path, headers, iterations):
+    global statements
+    timings, counts = [], []
+    for _ in range(iterations):
+        before = statements
+        start = time.perf_counter()
+        response = client.get(path, headers=headers)
+        timings.append((time.perf_counter() - start) * 1000)
+        counts.append(statements - before)
+        assert response.status_code == 200, response.text
+    timings.sort()
+    return statistics.median(timings), timings[int(len(timings) * 0.95) - 1], statistics.mode(counts)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--iterations", type=int, default=300)
+    parser.add_argument("--rows", type=int, default=20)
+    args = parser.parse_args()
+
+    event.listen(engine, "before_cursor_execute", _count)
+    event.listen(async_engine.sync_engine, "before_cursor_execute", _count)
+
+    db = SessionLocal()
+    name = f"bench-auth-{uuid.uuid4().hex[:8]}"
+    user = models.User(username=name, full_name=name, email=f"{name}@example.invalid", hashed_password="x")
+    db.add(user)
+    db.commit()
+    user_id = user.id
+    for model, owner_key, values in ROWS:
+        db.add_all([model(**values(n), **{owner_key: user_id}) for n in range(args.rows)])
+    db.commit()
+
+    token = create_access_token({"sub": user.email, "username": name, "uid": user_id})
+    headers = {"Authorization": f"Bearer {token}"}
+
+    print(f"{'endpoint':<32} {'auth':<10} {'median ms':>10} {'p95 ms':>8} {'statements':>11}")
+    try:
+        with TestClient(app, base_url="http://localhost") as client:
+            for path in ENDPOINTS:
+                for auth in ("select", "principal"):
+                    if auth == "select":
+                        app.dependency_overrides[get_current_principal] = _select_principal
+                    else:
+                        app.dependency_overrides.pop(get_current_principal, None)
+                    client.get(path, headers=headers)  # Warm up
+                    median, p95, count = _measure(client, path, headers, args.iterations)
+                    print(f"{path:<32} {auth:<10} {median:>10.3f} {p95:>8.3f} {count:>11}")
+    finally:
+        app.dependency_overrides.pop(get_current_principal, None)
+        db.rollback()
+        for model, owner_key, _ in ROWS:
+            db.execute(delete(model).where(getattr(model, owner_key) == user_id))
+        db.execute(delete(models.User).where(models.User.id == user_id))
+        db.commit()
+        db.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,153 @@
+"""
+Measures create/update latency per entity for the two write patterns:
+
+- orm: what the routes used to do - db.add() + commit + db.refresh() for
+  creates, SELECT + setattr + commit + db.refresh() for updates
+- returning: app.crud.writes - one INSERT/UPDATE ... RETURNING + commit
+
+Runs against DATABASE_URL under a throwaway user that is deleted
+afterwards. Reports median and p95 per operation and the number of SQL
+statements each one issued (the commit itself is not a statement).
+The gap grows with database round-trip time, so run it against the
+real database host rather than a local one for representative numbers.
+
+    python bench_writes.py [--iterations 200]
+"""
+import time
+import uuid
+import itertools
+import argparse
+import statistics
+
+from sqlalchemy import event, delete
+
+from app.database import SessionLocal, engine
+from app import models
+from app.crud.writes import insert_returning, update_returning
+
+ENTITIES = {
+    "project": (
+        models.Project, "owner_id",
+        {"title": "Bench", "description": "d", "type": "others", "stack": ["py"], "features": ["f"]},
+        {"description": "updated"},
+    ),
+    "skill": (
+        models.Skill, "user_id",
+        {"name": "Bench", "category": "Backend", "level": "Advanced", "experience": "1y"},
+        {"level": "Expert"},
+    ),
+    "work_experience": (
+        models.WorkExperience, "user_id",
+        {"title": "Dev", "organization": "Acme", "duration": "2024"},
+        {"description": "updated"},
+    ),
+    "certificate": (
+        models.Certificate, "user_id",
+        {"title": "Cert", "issuer": "Org", "year": "2024"},
+        {"year": "2025"},
+    ),
+    "award": (
+        models.Award, "user_id",
+        {"title": "Award", "organization": "Org", "year": "2024"},
+        {"year": "2025"},
+    ),
+}
+
+statements = 0
+
+
+@event.listens_for(engine, "before_cursor_execute")
+def _count(conn, cursor, statement, parameters, context, executemany):
+    global statements
+    statements += 1
+
+
+def _orm_create(db, model, values):
+    obj = model(**values)
+    db.add(obj)
+    db.commit()
+    db.refresh(obj)
+    return obj.id
+
+
+_sequence = itertools.count()
+
+
+def _changed(values):
+    """A different value every call, so the ORM cannot skip the UPDATE."""
+    n = next(_sequence)
+    return {key: f"{value}-{n}" for key, value in values.items()}
+
+
+def _orm_update(db, model, owner_key, row_id, user_id, values):
+    values = _changed(values)
+    obj = db.query(model).filter(model.id == row_id, getattr(model, owner_key) == user_id).first()
+    for key, value in values.items():
+        setattr(obj, key, value)
+    db.commit()
+    db.refresh(obj)
+
+
+def _returning_create(db, model, values):
+    row = insert_returning(db, model, values)
+    db.commit()
+    return row["id"]
+
+
+def _returning_update(db, model, owner_key, row_id, user_id, values):
+    values = _changed(values)
+    update_returning(db, model, (model.id == row_id, getattr(model, owner_key) == user_id), values)
+    db.commit()
+
+
+def _measure(fn, iterations):
+    global statements
+    timings, counts = [], []
+    for _ in range(iterations):
+        before = statements
+        start = time.perf_counter()
+        fn()
+        timings.append((time.perf_counter() - start) * 1000)
+        counts.append(statements - before)
+    timings.sort()
+    return statistics.median(timings), timings[int(len(timings) * 0.95) - 1], statistics.mode(counts)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--iterations", type=int, default=200)
+    args = parser.parse_args()
+
+    db = SessionLocal()
+    name = f"bench-writes-{uuid.uuid4().hex[:8]}"
+    user = models.User(username=name, full_name=name, email=f"{name}@example.invalid", hashed_password="x")
+    db.add(user)
+    db.commit()
+    user_id = user.id
+
+    print(f"{'entity':<16} {'operation':<8} {'pattern':<10} {'median ms':>10} {'p95 ms':>8} {'statements':>11}")
+    try:
+        for entity, (model, owner_key, create_values, update_values) in ENTITIES.items():
+            values = {**create_values, owner_key: user_id}
+            row_id = _orm_create(db, model, values)
+            cases = [
+                ("create", "orm", lambda: _orm_create(db, model, values)),
+                ("create", "returning", lambda: _returning_create(db, model, values)),
+                ("update", "orm", lambda: _orm_update(db, model, owner_key, row_id, user_id, update_values)),
+                ("update", "returning", lambda: _returning_update(db, model, owner_key, row_id, user_id, update_values)),
+            ]
+            for operation, pattern, fn in cases:
+                fn()  # Warm up
+                median, p95, count = _measure(fn, args.iterations)
+                print(f"{entity:<16} {operation:<8} {pattern:<10} {median:>10.3f} {p95:>8.3f} {count:>11}")
+    finally:
+        db.rollback()
+        for model, owner_key, _, _ in ENTITIES.values():
+            db.execute(delete(model).where(getattr(model, owner_key) == user_id))
+        db.execute(delete(models.User).where(models.User.id == user_id))
+        db.commit()
+        db.close()
+
+
+if __name__ == "__main__":
+    main()
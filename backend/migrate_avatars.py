@@ -0,0 +1,74 @@
+from sqlalchemy import select, update
+from app.database import SessionLocal
+from app.models.profile import Profile
+from app.models.user import User
+from app.utils.portfolio_cache import invalidate_portfolio
+from app.utils.user_cache import invalidate_user
+from app.utils.avatar_store import is_data_url, decode_data_url, save_avatar, avatar_url, InvalidAvatarError, PUBLIC_API_URL
+
+BATCH_SIZE = 50
+
+
+def migrate_avatars():
+    """
+    Moves base64 avatars stored in profiles.avatar into the avatar store
+    and replaces them with their URL. Safe to re-run.
+    Set PUBLIC_API_URL so the stored URLs are absolute.
+
+    Bumps content_version of every affected user in the same transaction
+    as their profile, so portfolio ETags and cached snapshots change.
+    """
+    if not PUBLIC_API_URL:
+        print("Warning: PUBLIC_API_URL is not set, avatar URLs will be relative.")
+
+    db = SessionLocal()
+    migrated, failed, last_id = 0, 0, 0
+    try:
+        while True:
+            # Only fetch ids first so we never hold more than one batch of images in memory
+            ids = db.scalars(
+                select(Profile.id)
+                .where(Profile.id > last_id, Profile.avatar.like("data:%"))
+                .order_by(Profile.id)
+                .limit(BATCH_SIZE)
+            ).all()
+            if not ids:
+                break
+            last_id = ids[-1]
+
+            changed_user_ids = []
+            for profile in db.query(Profile).filter(Profile.id.in_(ids)):
+                if not is_data_url(profile.avatar):
+                    continue
+                try:
+                    digest = save_avatar(decode_data_url(profile.avatar))
+                except InvalidAvatarError as e:
+                    print(f"Skipping profile {profile.id}: {e}")
+                    failed += 1
+                    continue
+                profile.avatar = avatar_url(digest)
+                changed_user_ids.append(profile.user_id)
+                migrated += 1
+
+            changed_users = []
+            if changed_user_ids:
+                changed_users = db.execute(
+                    update(User)
+                    .where(User.id.in_(changed_user_ids))
+                    .values(content_version=User.content_version + 1)
+                    .returning(User.id, User.username)
+                ).all()
+            db.commit()
+            db.expunge_all()
+            for user_id, username in changed_users:
+                invalidate_portfolio(username)
+                invalidate_user(user_id)
+            print(f"Migrated {migrated} avatars so far...")
+    finally:
+        db.close()
+
+    print(f"Done. Migrated {migrated} avatars, {failed} could not be decoded.")
+
+
+if __name__ == "__main__":
+    migrate_avatars()
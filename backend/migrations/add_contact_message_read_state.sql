@@ -0,0 +1,67 @@
+-- Migration: Paginated contact inbox and read state
+-- Reason: GET /api/contact/messages returned every message in one list.
+-- It is now keyset-paginated on (created_at, id), newest first, which
+-- needs id in the inbox index as a tie-breaker and created_at to be
+-- non-null. Messages also get an is_read flag, and the unread count is
+-- served by a partial index on the unread rows only.
+--   contact_messages (user_id, created_at DESC, id DESC)  inbox pages
+--   contact_messages (user_id) WHERE NOT is_read          unread count
+--
+-- Run after add_owner_indexes.sql. CONCURRENTLY cannot run inside a
+-- transaction block, so do not wrap the index statements in
+-- BEGIN/COMMIT. Safe to re-run.
+-- Verify afterwards with: python -m pytest tests/test_query_plans.py
+
+-- ============================================
+-- PRE-MIGRATION CHECK
+-- ============================================
+-- Messages without a timestamp; they are backfilled below so that
+-- created_at can become NOT NULL
+
+SELECT COUNT(*) AS missing_created_at
+FROM contact_messages
+WHERE created_at IS NULL;
+
+-- ============================================
+-- MAIN MIGRATION
+-- ============================================
+
+-- Constant default: no table rewrite on PostgreSQL 11+
+ALTER TABLE contact_messages ADD COLUMN IF NOT EXISTS is_read BOOLEAN NOT NULL DEFAULT false;
+
+UPDATE contact_messages SET created_at = now() WHERE created_at IS NULL;
+ALTER TABLE contact_messages ALTER COLUMN created_at SET NOT NULL;
+
+CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_contact_messages_user_id_created_at_id
+ON contact_messages (user_id, created_at DESC, id DESC);
+
+CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_contact_messages_user_id_unread
+ON contact_messages (user_id) WHERE NOT is_read;
+
+-- Superseded by ix_contact_messages_user_id_created_at_id
+DROP INDEX CONCURRENTLY IF EXISTS ix_contact_messages_user_id_created_at;
+
+-- Index-only scans for the unread count need an up-to-date visibility map
+VACUUM ANALYZE contact_messages;
+
+-- ============================================
+-- POST-MIGRATION VERIFICATION
+-- ============================================
+-- Should show "Index Scan" / "Index Only Scan" using the new indexes
+
+EXPLAIN ANALYZE
+SELECT id, name, email, message, created_at, is_read FROM contact_messages
+WHERE user_id = 1 AND (created_at, id) < (now(), 2147483647)
+ORDER BY created_at DESC, id DESC LIMIT 51;
+
+EXPLAIN ANALYZE
+SELECT COUNT(*) FROM contact_messages WHERE user_id = 1 AND NOT is_read;
+
+-- ============================================
+-- ROLLBACK SCRIPT (if needed)
+-- ============================================
+-- CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_contact_messages_user_id_created_at ON contact_messages (user_id, created_at DESC);
+-- DROP INDEX CONCURRENTLY IF EXISTS ix_contact_messages_user_id_created_at_id;
+-- DROP INDEX CONCURRENTLY IF EXISTS ix_contact_messages_user_id_unread;
+-- ALTER TABLE contact_messages ALTER COLUMN created_at DROP NOT NULL;
+-- ALTER TABLE contact_messages DROP COLUMN IF EXISTS is_read;
@@ -0,0 +1,18 @@
+-- Migration: Add content_version to user table
+-- Reason: Public portfolio endpoints derive strong ETags from a per-user content
+-- version that is bumped by every portfolio mutation, so conditional requests
+-- (If-None-Match) can be answered with a single indexed lookup.
+
+BEGIN;
+
+ALTER TABLE "user"
+ADD COLUMN IF NOT EXISTS content_version INTEGER DEFAULT 1 NOT NULL;
+
+COMMENT ON COLUMN "user".content_version IS 'Incremented on every portfolio change; used for public portfolio ETags';
+
+COMMIT;
+
+-- ============================================
+-- ROLLBACK SCRIPT (if needed)
+-- ============================================
+-- ALTER TABLE "user" DROP COLUMN IF EXISTS content_version;
@@ -0,0 +1,87 @@
+-- Migration: Index the owner columns of portfolio child tables
+-- Reason: Every portfolio read, dashboard list and resume-import dedup
+-- filters child tables by their owner column, and none of those columns
+-- was indexed, so each filter was a sequential scan of the whole table.
+-- The indexes lead with the owner column and add the column the hot
+-- queries sort or match on:
+--   project (owner_id, title)               list, import/resume dedup by title
+--   skills (user_id, name)                  list, resume dedup by name
+--   certificates / awards / work_experience
+--     (user_id, title)                      list, resume dedup by title
+--   resumes (owner_id, created_at DESC)     history and current draft, newest first
+--   contact_messages (user_id, created_at DESC)  inbox, newest first
+--
+-- Also fixes contact_messages.user_id, which referenced a non-existent
+-- "users" table (the table is "user").
+--
+-- CONCURRENTLY cannot run inside a transaction block, so do not wrap the
+-- index statements in BEGIN/COMMIT. Safe to re-run.
+-- Verify afterwards with: python -m pytest tests/test_query_plans.py
+
+-- ============================================
+-- PRE-MIGRATION CHECK
+-- ============================================
+-- Messages whose user no longer exists; must return no rows before the
+-- foreign key can be validated (delete them or fix their user_id)
+
+SELECT m.id, m.user_id
+FROM contact_messages m
+LEFT JOIN "user" u ON u.id = m.user_id
+WHERE u.id IS NULL;
+
+-- ============================================
+-- MAIN MIGRATION
+-- ============================================
+
+CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_project_owner_id_title ON project (owner_id, title);
+CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_skills_user_id_name ON skills (user_id, name);
+CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_certificates_user_id_title ON certificates (user_id, title);
+CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_awards_user_id_title ON awards (user_id, title);
+CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_work_experience_user_id_title ON work_experience (user_id, title);
+CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_resumes_owner_id_created_at ON resumes (owner_id, created_at DESC);
+CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_contact_messages_user_id_created_at ON contact_messages (user_id, created_at DESC);
+
+-- Foreign key: added NOT VALID so it does not block writes while existing
+-- rows are checked, then validated separately
+ALTER TABLE contact_messages DROP CONSTRAINT IF EXISTS contact_messages_user_id_fkey;
+ALTER TABLE contact_messages
+ADD CONSTRAINT contact_messages_user_id_fkey
+FOREIGN KEY (user_id) REFERENCES "user" (id) ON DELETE CASCADE NOT VALID;
+ALTER TABLE contact_messages VALIDATE CONSTRAINT contact_messages_user_id_fkey;
+
+ANALYZE project;
+ANALYZE skills;
+ANALYZE certificates;
+ANALYZE awards;
+ANALYZE work_experience;
+ANALYZE resumes;
+ANALYZE contact_messages;
+
+-- ============================================
+-- POST-MIGRATION VERIFICATION
+-- ============================================
+-- Should show "Index Scan" / "Bitmap Index Scan" using the new indexes
+
+EXPLAIN ANALYZE
+SELECT id FROM project WHERE owner_id = 1;
+
+EXPLAIN ANALYZE
+SELECT id, name, email, message, created_at FROM contact_messages
+WHERE user_id = 1 ORDER BY created_at DESC;
+
+EXPLAIN ANALYZE
+SELECT id FROM resumes
+WHERE owner_id = 1 AND is_saved = false AND status = 'completed'
+ORDER BY created_at DESC LIMIT 1;
+
+-- ============================================
+-- ROLLBACK SCRIPT (if needed)
+-- ============================================
+-- DROP INDEX CONCURRENTLY IF EXISTS ix_project_owner_id_title;
+-- DROP INDEX CONCURRENTLY IF EXISTS ix_skills_user_id_name;
+-- DROP INDEX CONCURRENTLY IF EXISTS ix_certificates_user_id_title;
+-- DROP INDEX CONCURRENTLY IF EXISTS ix_awards_user_id_title;
+-- DROP INDEX CONCURRENTLY IF EXISTS ix_work_experience_user_id_title;
+-- DROP INDEX CONCURRENTLY IF EXISTS ix_resumes_owner_id_created_at;
+-- DROP INDEX CONCURRENTLY IF EXISTS ix_contact_messages_user_id_created_at;
+-- ALTER TABLE contact_messages DROP CONSTRAINT IF EXISTS contact_messages_user_id_fkey;
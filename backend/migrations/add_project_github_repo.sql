@@ -0,0 +1,57 @@
+-- Migration: Record the source repository of GitHub projects
+-- Reason: The stars/forks refresher (app/utils/github_refresh.py) needs the
+-- "owner/name" of each type 'github' project. Bulk imports set it; older
+-- rows are backfilled from links that point at github.com, the rest are
+-- resolved from the link at refresh time when possible.
+-- The partial index serves the refresher's "stale github projects" query
+-- (app.utils.github_refresh.stale_projects_statement). That query takes
+-- never-refreshed rows first (ORDER BY last_updated ASC NULLS FIRST), so
+-- the index is declared in the same order; a plain ascending index sorts
+-- NULLs last and would force a sort of every stale row.
+-- CONCURRENTLY cannot run inside a transaction block, so the index is
+-- created after COMMIT.
+
+BEGIN;
+
+ALTER TABLE project
+ADD COLUMN IF NOT EXISTS github_repo VARCHAR;
+
+COMMENT ON COLUMN project.github_repo IS 'owner/name of the source GitHub repository';
+
+UPDATE project
+SET github_repo = substring(link from 'github\.com/([A-Za-z0-9-]+/[A-Za-z0-9._-]+?)(?:\.git)?/?(?:[?#].*)?$')
+WHERE type = 'github'
+  AND github_repo IS NULL
+  AND link ~ 'github\.com/[A-Za-z0-9-]+/[A-Za-z0-9._-]+';
+
+COMMIT;
+
+-- Replaces ix_project_github_last_updated (NULLS LAST) from an earlier
+-- version of this migration
+DROP INDEX CONCURRENTLY IF EXISTS ix_project_github_last_updated;
+
+CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_project_github_stale
+ON project (last_updated ASC NULLS FIRST)
+WHERE type = 'github';
+
+ANALYZE project;
+
+-- ============================================
+-- POST-MIGRATION VERIFICATION
+-- ============================================
+-- The refresher's query (GITHUB_REFRESH_MAX_AGE_HOURS = 24,
+-- GITHUB_REFRESH_MAX_PROJECTS = 1000). Should be an Index Scan using
+-- ix_project_github_stale with no Sort node above it
+
+EXPLAIN ANALYZE
+SELECT id, owner_id, github_repo, link, stars, forks FROM project
+WHERE type = 'github'
+  AND (last_updated IS NULL OR last_updated < now() - interval '24 hours')
+ORDER BY last_updated ASC NULLS FIRST
+LIMIT 1000;
+
+-- ============================================
+-- ROLLBACK SCRIPT (if needed)
+-- ============================================
+-- DROP INDEX CONCURRENTLY IF EXISTS ix_project_github_stale;
+-- ALTER TABLE project DROP COLUMN IF EXISTS github_repo;
@@ -0,0 +1,23 @@
+-- Migration: Add background job state to resumes
+-- Reason: Resume uploads are parsed by a background job. The resume row is
+-- created as 'queued' and polled through GET /api/v1/resumes/jobs/{id}.
+-- Existing rows were parsed synchronously, so they default to 'completed'.
+
+BEGIN;
+
+ALTER TABLE resumes
+ADD COLUMN IF NOT EXISTS status VARCHAR DEFAULT 'completed' NOT NULL;
+
+ALTER TABLE resumes
+ADD COLUMN IF NOT EXISTS error TEXT;
+
+COMMENT ON COLUMN resumes.status IS 'Parsing job state: queued, processing, completed or failed';
+COMMENT ON COLUMN resumes.error IS 'User-facing failure reason when status is failed';
+
+COMMIT;
+
+-- ============================================
+-- ROLLBACK SCRIPT (if needed)
+-- ============================================
+-- ALTER TABLE resumes DROP COLUMN IF EXISTS error;
+-- ALTER TABLE resumes DROP COLUMN IF EXISTS status;
@@ -0,0 +1,36 @@
+"""
+Shared fixtures for the database tests.
+
+They need the PostgreSQL database in DATABASE_URL (read from .env too).
+Modules that import app.database skip themselves when it is unset, since
+the engines are built at import time; the fixtures below skip when the
+database is unreachable.
+"""
+import pytest
+from dotenv import load_dotenv
+from sqlalchemy import text
+from sqlalchemy.exc import OperationalError
+
+load_dotenv()
+
+
+@pytest.fixture(scope="session")
+def engine():
+    # Imported here so collecting the tests never needs a URL
+    from app.database import engine
+
+    try:
+        with engine.connect() as conn:
+            conn.execute(text("SELECT 1"))
+    except OperationalError:
+        pytest.skip("database not reachable")
+    return engine
+
+
+@pytest.fixture(scope="module")
+def db(engine):
+    from app.database import SessionLocal
+
+    session = SessionLocal()
+    yield session
+    session.close()
@@ -0,0 +1,101 @@
+"""
+Query-count regression test for the public portfolio load.
+
+load_portfolio_by_username must fetch a user and every portfolio section
+in a single round trip, however many child rows the user has. Needs the
+PostgreSQL database in DATABASE_URL; skipped when it is unset or
+unreachable.
+
+    cd backend && pip install -r requirements-dev.txt && python -m pytest tests
+"""
+import os
+import uuid
+import asyncio
+
+import pytest
+from sqlalchemy import delete, event
+
+# app.database builds its engines at import time and needs a URL (see conftest.py)
+if not os.getenv("DATABASE_URL"):
+    pytest.skip("DATABASE_URL is not set", allow_module_level=True)
+
+from app.database import async_engine, AsyncSessionLocal
+from app import models
+from app.crud.portfolio import load_portfolio_by_username
+
+CHILD_MODELS = (
+    (models.Project, "owner_id", lambda n: {"title": f"Project {n}", "stack": ["python"], "features": ["f"]}),
+    (models.Skill, "user_id", lambda n: {"name": f"Skill {n}", "category": "Backend", "level": "Advanced", "experience": "1y"}),
+    (models.Certificate, "user_id", lambda n: {"title": f"Certificate {n}", "issuer": "Issuer"}),
+    (models.WorkExperience, "user_id", lambda n: {"title": f"Role {n}", "organization": "Company"}),
+    (models.Award, "user_id", lambda n: {"title": f"Award {n}"}),
+)
+
+
+@pytest.fixture
+def make_user(db):
+    created = []
+
+    def _make_user(rows: int) -> str:
+        username = f"querycount-{uuid.uuid4().hex[:8]}"
+        user = models.User(username=username, full_name=username, email=f"{username}@example.invalid", hashed_password="x")
+        db.add(user)
+        db.flush()
+        db.add(models.Profile(user_id=user.id, name=username, email=user.email))
+        for model, owner_key, values in CHILD_MODELS:
+            db.add_all([model(**values(n), **{owner_key: user.id}) for n in range(rows)])
+        db.commit()
+        created.append(user.id)
+        return username
+
+    yield _make_user
+
+    for user_id in created:
+        db.execute(delete(models.Profile).where(models.Profile.user_id == user_id))
+        for model, owner_key, _ in CHILD_MODELS:
+            db.execute(delete(model).where(getattr(model, owner_key) == user_id))
+        db.execute(delete(models.User).where(models.User.id == user_id))
+    db.commit()
+
+
+def _load_counting_statements(username: str):
+    statements = []
+
+    def count(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+
+    async def load():
+        try:
+            async with AsyncSessionLocal() as session:
+                # Connect first so only the portfolio query itself is counted
+                await session.connection()
+                event.listen(async_engine.sync_engine, "before_cursor_execute", count)
+                try:
+                    return await load_portfolio_by_username(session, username.upper())
+                finally:
+                    event.remove(async_engine.sync_engine, "before_cursor_execute", count)
+        finally:
+            # Pooled asyncpg connections are bound to this event loop
+            await async_engine.dispose()
+
+    return asyncio.run(load()), statements
+
+
+@pytest.mark.parametrize("rows", [0, 1, 25])
+def test_portfolio_loads_in_one_round_trip(make_user, rows):
+    username = make_user(rows)
+
+    portfolio, statements = _load_counting_statements(username)
+
+    assert len(statements) == 1, statements
+    assert portfolio.User.username == username
+    assert portfolio.profile["name"] == username
+    for section in ("projects", "skills", "certificates", "work_experience", "awards"):
+        assert len(getattr(portfolio, section)) == rows
+
+
+def test_missing_user_is_one_round_trip(db):
+    portfolio, statements = _load_counting_statements(f"missing-{uuid.uuid4().hex[:8]}")
+
+    assert portfolio is None
+    assert len(statements) == 1, statements
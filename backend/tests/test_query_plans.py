@@ -0,0 +1,178 @@
+"""
+Query-plan regression test for the hot per-user queries.
+
+Seeds PLAN_CHECK_USERS throwaway users owning PLAN_CHECK_ROWS rows in
+every portfolio child table, ANALYZEs, and runs EXPLAIN on each query
+the app issues per request (portfolio load, dashboard lists, resume
+draft/history, contact inbox pages and unread count, resume-import
+dedup, the GitHub stats refresh). A sequential scan of a seeded table
+fails the query's test: it means the query stopped matching the owner
+indexes (see migrations/add_owner_indexes.sql and
+migrations/add_contact_message_read_state.sql).
+
+Everything runs in one transaction that is rolled back, so the seeded
+rows and statistics never persist. Needs the PostgreSQL database in
+DATABASE_URL; skipped when it is unset or unreachable.
+
+    cd backend && python -m pytest tests/test_query_plans.py
+"""
+import os
+import json
+import uuid
+from datetime import datetime, timedelta
+
+import pytest
+from sqlalchemy import func, select, text
+
+# app.database builds its engines at import time and needs a URL (see conftest.py)
+if not os.getenv("DATABASE_URL"):
+    pytest.skip("DATABASE_URL is not set", allow_module_level=True)
+
+from app import models
+from app.models.user import username_key
+from app.models.resume import Resume
+from app.crud.contact import inbox_statement, unread_count_statement
+from app.crud.portfolio import _portfolio_statement
+from app.crud.resume_merge import existing_keys_statement
+from app.utils.github_refresh import stale_projects_statement
+
+PLAN_CHECK_USERS = int(os.getenv("PLAN_CHECK_USERS", "2000"))
+PLAN_CHECK_ROWS = int(os.getenv("PLAN_CHECK_ROWS", "20"))  # per user in each child table
+
+SEEDED_TABLES = (
+    "user", "profiles", "project", "skills", "certificates",
+    "work_experience", "awards", "resumes", "contact_messages",
+)
+
+# {prefix} is a per-run username prefix, {users} and {rows} the sizes
+SEED_SQL = """
+INSERT INTO "user" (username, full_name, email, is_verified, is_public, analytics_enabled, content_version)
+SELECT '{prefix}' || u, 'Plan Check ' || u, '{prefix}' || u || '@example.invalid', true, true, false, 1
+FROM generate_series(1, {users}) AS u;
+
+CREATE TEMPORARY TABLE plan_check_users ON COMMIT DROP AS
+SELECT id FROM "user" WHERE username LIKE '{prefix}%';
+
+INSERT INTO profiles (user_id, name, email)
+SELECT id, 'Plan Check', 'profile@example.invalid' FROM plan_check_users;
+
+INSERT INTO project (owner_id, title, description, type, stack, features, stars, forks, github_repo, last_updated)
+SELECT id, 'Project ' || n, 'Seeded', CASE WHEN n % 10 = 0 THEN 'github' ELSE 'others' END,
+       ARRAY['python'], ARRAY['feature'], n, 0,
+       CASE WHEN n % 10 = 0 THEN 'owner/repo-' || id || '-' || n END,
+       now() - (n || ' hours')::interval
+FROM plan_check_users, generate_series(1, {rows}) AS n;
+
+INSERT INTO skills (user_id, name, category, level, experience)
+SELECT id, 'Skill ' || n, 'Backend', 'Advanced', '1y'
+FROM plan_check_users, generate_series(1, {rows}) AS n;
+
+INSERT INTO certificates (user_id, title, issuer, year)
+SELECT id, 'Certificate ' || n, 'Issuer', '2024'
+FROM plan_check_users, generate_series(1, {rows}) AS n;
+
+INSERT INTO work_experience (user_id, title, organization, duration)
+SELECT id, 'Role ' || n, 'Company', '2024'
+FROM plan_check_users, generate_series(1, {rows}) AS n;
+
+INSERT INTO awards (user_id, title, organization, year)
+SELECT id, 'Award ' || n, 'Organization', '2024'
+FROM plan_check_users, generate_series(1, {rows}) AS n;
+
+INSERT INTO resumes (owner_id, filename, file_type, status, is_saved, created_at)
+SELECT id, 'resume-' || n || '.pdf', 'pdf', 'completed', n > 1, now() - (n || ' days')::interval
+FROM plan_check_users, generate_series(1, {rows}) AS n;
+
+INSERT INTO contact_messages (user_id, name, email, message, created_at, is_read)
+SELECT id, 'Visitor', 'visitor@example.invalid', 'Hello', now() - (n || ' hours')::interval, n > 3
+FROM plan_check_users, generate_series(1, {rows}) AS n;
+"""
+
+
+def _list(model, owner):
+    return lambda username, user_id, rows: select(model).where(owner == user_id)
+
+
+# Every per-request query worth guarding: name -> (username, user_id, rows) -> statement
+HOT_QUERIES = {
+    "portfolio by username": lambda username, user_id, rows: _portfolio_statement().where(username_key(username)),
+    "portfolio by user id": lambda username, user_id, rows: _portfolio_statement().where(models.User.id == user_id),
+    "list project": _list(models.Project, models.Project.owner_id),
+    "list skills": _list(models.Skill, models.Skill.user_id),
+    "list certificates": _list(models.Certificate, models.Certificate.user_id),
+    "list work_experience": _list(models.WorkExperience, models.WorkExperience.user_id),
+    "list awards": _list(models.Award, models.Award.user_id),
+    "resume draft": lambda username, user_id, rows: select(Resume).where(
+        Resume.owner_id == user_id, Resume.is_saved == False, Resume.status == "completed"  # noqa: E712
+    ).order_by(Resume.created_at.desc()).limit(1),
+    "resume history": lambda username, user_id, rows: (
+        select(Resume).where(Resume.owner_id == user_id).order_by(Resume.created_at.desc())
+    ),
+    "contact inbox": lambda username, user_id, rows: inbox_statement(user_id, 50),
+    "contact inbox next page": lambda username, user_id, rows: inbox_statement(
+        user_id, 50, after=(datetime.utcnow() - timedelta(hours=rows // 2), 2**31 - 1)
+    ),
+    "contact inbox date range": lambda username, user_id, rows: inbox_statement(
+        user_id, 50, since=datetime.utcnow() - timedelta(hours=rows), until=datetime.utcnow()
+    ),
+    "contact unread count": lambda username, user_id, rows: unread_count_statement(user_id),
+    "resume merge keys": lambda username, user_id, rows: existing_keys_statement(user_id),
+    "github import dedup": lambda username, user_id, rows: (
+        select(func.lower(models.Project.title)).where(models.Project.owner_id == user_id)
+    ),
+    "github stale projects": lambda username, user_id, rows: stale_projects_statement(
+        datetime.utcnow() - timedelta(hours=24)
+    ),
+}
+
+
+@pytest.fixture(scope="module")
+def seeded(engine):
+    """(connection, username, user_id) inside the seeded, rolled-back transaction."""
+    prefix = f"plancheck-{uuid.uuid4().hex[:8]}-"
+    with engine.connect() as conn:
+        transaction = conn.begin()
+        try:
+            for statement in SEED_SQL.format(prefix=prefix, users=PLAN_CHECK_USERS, rows=PLAN_CHECK_ROWS).split(";\n"):
+                if statement.strip():
+                    conn.execute(text(statement))
+            for table in SEEDED_TABLES:
+                conn.exec_driver_sql(f'ANALYZE "{table}"')
+
+            username = f"{prefix}{PLAN_CHECK_USERS // 2}"
+            user_id = conn.execute(select(models.User.id).where(models.User.username == username)).scalar_one()
+            yield conn, username, user_id
+        finally:
+            transaction.rollback()
+
+
+def _plan_nodes(node):
+    yield node
+    for child in node.get("Plans", []):
+        yield from _plan_nodes(child)
+
+
+def explain(conn, statement) -> dict:
+    compiled = statement.compile(dialect=conn.dialect)
+    result = conn.exec_driver_sql(f"EXPLAIN (FORMAT JSON) {compiled}", compiled.params)
+    plan = result.scalar()
+    if isinstance(plan, str):
+        plan = json.loads(plan)
+    return plan[0]["Plan"]
+
+
+@pytest.mark.parametrize("name", list(HOT_QUERIES))
+def test_hot_query_uses_indexes(seeded, name):
+    conn, username, user_id = seeded
+
+    scans = [
+        node for node in _plan_nodes(explain(conn, HOT_QUERIES[name](username, user_id, PLAN_CHECK_ROWS)))
+        if "Relation Name" in node or "Index Name" in node
+    ]
+    seq_scans = sorted({node["Relation Name"] for node in scans
+                        if node["Node Type"] == "Seq Scan" and node.get("Relation Name") in SEEDED_TABLES})
+
+    assert not seq_scans, [
+        f"{node['Node Type']} {node.get('Relation Name', '')} {node.get('Index Name', '')}".strip()
+        for node in scans
+    ]
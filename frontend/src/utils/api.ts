@@ -390,6 +390,9 @@ export async function enhanceProjectDescription(
 
 // ---------------- RESUME UPLOAD ----------------
 
+const RESUME_JOB_POLL_MS = 1000;
+const RESUME_JOB_TIMEOUT_MS = 2 * 60 * 1000;
+
 export async function uploadResume(file: File) {
   const token = localStorage.getItem("token");
   if (!token) throw new Error("No token found");
@@ -411,6 +414,50 @@ export async function uploadResume(file: File) {
     throw error;
   }
 
+  // Parsing runs as a background job; poll until it finishes
+  let job = await res.json();
+  const deadline = Date.now() + RESUME_JOB_TIMEOUT_MS;
+
+  while (job.status === "queued" || job.status === "processing") {
+    if (Date.now() > deadline) {
+      const error: any = new Error("Resume parsing timed out");
+      error.response = { status: 504, data: { detail: "Resume parsing is taking too long. Please try again." } };
+      throw error;
+    }
+    await new Promise((resolve) => setTimeout(resolve, RESUME_JOB_POLL_MS));
+    job = await getResumeJob(job.job_id);
+  }
+
+  if (job.status === "failed") {
+    const error: any = new Error("Failed to parse resume");
+    error.response = { status: 422, data: { detail: job.error } };
+    throw error;
+  }
+
+  return {
+    resume_id: job.resume_id,
+    extracted_data: job.extracted_data,
+    message: job.message,
+  };
+}
+
+export async function getResumeJob(jobId: number) {
+  const token = localStorage.getItem("token");
+  if (!token) throw new Error("No token found");
+
+  const res = await fetch(`${BASE_URL}/api/v1/resumes/jobs/${jobId}`, {
+    method: "GET",
+    headers: {
+      Authorization: `Bearer ${token}`,
+    },
+  });
+
+  if (!res.ok) {
+    const error: any = new Error("Failed to fetch resume job");
+    error.response = { status: res.status, data: await res.json().catch(() => ({})) };
+    throw error;
+  }
+
   return await res.json();
 }
 